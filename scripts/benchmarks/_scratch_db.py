@@ -0,0 +1,28 @@
+"""
+Scratch copy of app.db for the benchmarks.
+
+Importing this module puts src on the path, copies the database to a temporary directory and points DATABASE_URL at
+the copy. Import it before anything from guessing_game: importing any guessing_game.config module creates the engine,
+so the real app.db would be opened otherwise.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DATABASE_PATH = PROJECT_ROOT / "src" / "guessing_game" / "data" / "app.db"
+
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+SCRATCH_DIR = Path(tempfile.mkdtemp())
+SCRATCH_DB = SCRATCH_DIR / "app.db"
+shutil.copy(DATABASE_PATH, SCRATCH_DB)
+os.environ["DATABASE_URL"] = f"sqlite:///{SCRATCH_DB}"
+
+
+def remove():
+    """Delete the copy, after the engines using it were disposed"""
+    shutil.rmtree(SCRATCH_DIR, ignore_errors=True)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Redis memory per active game, full game records vs compact ones.
+
+Stores the game:{id} hash of the same sampled characters in both layouts and reports, per game:
+    - full:    the target's FullCharacter dump and the rendered system prompt (template plus character profile), the
+               way games were stored before their prompt was rebuilt per question
+    - compact: the target's ID, the arc limit and the settings
+    - field bytes: the hash's field names and values as sent to Redis
+    - MEMORY USAGE: what Redis reports for the key, overhead included
+and the projected total for a number of active games. The compact layout moves the profile into each worker's
+profile cache instead, which costs once per character and worker, not per game - its size is reported too.
+
+Needs Redis at REDIS_URL and the vector database for the profiles. Runs on a temporary copy of app.db, the keys are
+created under a benchmark prefix and deleted afterwards.
+
+USAGE:
+    python scripts/benchmarks/game_record_size.py
+    python scripts/benchmarks/game_record_size.py --arc-limit="Wano Country" --games=5000
+"""
+
+import argparse
+import json
+import random
+import sys
+from datetime import datetime
+
+# Before anything from guessing_game, so the app only ever sees the scratch copy of app.db
+import _scratch_db
+
+from guessing_game.config import get_redis
+from guessing_game.config.database import engine
+from guessing_game.config.migrations import run_migrations
+from guessing_game.config.redis_client import test_redis_connection
+from guessing_game.config.settings import CHARACTER_PROFILE_CACHE_SIZE
+from guessing_game.schemas.character_schemas import FullCharacter
+from guessing_game.services.arc_service import ALL_ARCS
+from guessing_game.services.character_service import CharacterService, sync_excluded_characters
+from guessing_game.services.game_manager import new_game_data
+from guessing_game.services.prompt_service import PromptService
+
+KEY_PREFIX = "benchmark_record"
+GAME_SETTINGS = {
+    "arc_selection": "All",
+    "filler_percentage": 0,
+    "include_non_tv_fillers": False,
+    "difficulty_level": "medium",
+    "include_unrated": False,
+}
+
+
+def full_game_data(character: FullCharacter, prompt: str) -> dict:
+    """A game:{id} hash as stored with the whole target and its rendered prompt"""
+    return {
+        "target_character": json.dumps(character.model_dump()),
+        "system_prompt": prompt,
+        "game_settings": json.dumps(GAME_SETTINGS),
+        "questions_asked": 0,
+        "guesses_count": 0,
+        "created_at": datetime.now().isoformat()
+    }
+
+
+def field_bytes(game_data: dict) -> int:
+    return sum(len(str(name).encode()) + len(str(value).encode()) for name, value in game_data.items())
+
+
+def measure(redis_client, label: str, records: list[dict]) -> dict:
+    """Average field bytes and MEMORY USAGE of the records stored as game hashes"""
+    keys = [f"{KEY_PREFIX}:{label}:{i}" for i in range(len(records))]
+    try:
+        pipe = redis_client.pipeline()
+        for key, game_data in zip(keys, records):
+            pipe.hset(key, mapping=game_data)
+        pipe.execute()
+
+        usage = [redis_client.memory_usage(key, samples=0) for key in keys]
+    finally:
+        redis_client.delete(*keys)
+
+    return {
+        "field_bytes": sum(field_bytes(game_data) for game_data in records) / len(records),
+        "memory_usage": sum(usage) / len(usage),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Redis bytes per active game, full vs compact game records")
+    parser.add_argument("--characters", type=int, default=50, help="Sampled target characters")
+    parser.add_argument("--arc-limit", default="All", help="Arc limit the prompts are rendered for")
+    parser.add_argument("--games", type=int, default=1000, help="Active games to project the totals for")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    connected, message = test_redis_connection()
+    if not connected:
+        print(message)
+        return 1
+
+    run_migrations()
+    sync_excluded_characters()
+    character_service = CharacterService()
+    arc_service = character_service.arc_service
+    prompt_service = PromptService()
+
+    arc_limit = arc_service.get_arc_by_name(args.arc_limit)
+    spoiler_arc_names = arc_service.get_spoiler_arc_names(arc_limit)
+
+    characters = character_service.get_characters_until(ALL_ARCS, include_ignored=True)
+    sample = random.Random(args.seed).sample(characters, min(args.characters, len(characters)))
+    targets = [character_service.get_full_character_by_id(character.id) for character in sample]
+
+    full_records = [full_game_data(target, prompt_service.create_game_prompt(target, spoiler_arc_names))
+                    for target in targets]
+    compact_records = [new_game_data(target.id, arc_limit.name, GAME_SETTINGS) for target in targets]
+    profile_bytes = sum(len(prompt_service._build_character_profile(target).encode())
+                        for target in targets) / len(targets)
+
+    redis_client = get_redis()
+    results = {"full": measure(redis_client, "full", full_records),
+               "compact": measure(redis_client, "compact", compact_records)}
+
+    print(f"{len(targets)} characters, arc limit {arc_limit.name}, {args.games} active games\n")
+    print(f"  {'layout':8} {'field bytes':>12} {'MEMORY USAGE':>13} {'total MiB':>10}")
+    for label, result in results.items():
+        total_mib = result["memory_usage"] * args.games / 1024 / 1024
+        print(f"  {label:8} {result['field_bytes']:>12.0f} {result['memory_usage']:>13.0f} {total_mib:>10.2f}")
+
+    saved = 1 - results["compact"]["memory_usage"] / results["full"]["memory_usage"]
+    print(f"\n  compact records use {saved:.0%} less Redis memory per game")
+    print(f"  profile cache: {profile_bytes:.0f} bytes per character, at most {CHARACTER_PROFILE_CACHE_SIZE} "
+          f"characters per worker")
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    finally:
+        engine.dispose()
+        _scratch_db.remove()
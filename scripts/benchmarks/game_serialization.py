@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Game value serialization, JSON vs msgpack, at different game lengths.
+
+Builds the values a game of N question turns keeps in Redis - the message log (messages:{id}), the LLM context
+(chat:{id}) and the settings of its game:{id} hash - in both formats of services/game_serializer.py and reports:
+    - bytes: the encoded values of the whole game, the part of its Redis memory the format decides
+    - write: encoding the four values a question turn appends (two log entries, two context records)
+    - read: decoding what a question turn loads (settings and the whole context) and what /validate loads (the log)
+With --redis the values are also stored and MEMORY USAGE is reported for the game's keys.
+
+Needs Redis at REDIS_URL only with --redis, keys are created under a benchmark prefix and deleted afterwards.
+
+USAGE:
+    python scripts/benchmarks/game_serialization.py
+    python scripts/benchmarks/game_serialization.py --turns 10 40 100 --redis
+"""
+
+import argparse
+import sys
+import time
+
+# Before anything from guessing_game, so the app only ever sees the scratch copy of app.db
+import _scratch_db
+
+from guessing_game.config import get_redis
+from guessing_game.config.redis_client import test_redis_connection
+from guessing_game.services.game_manager import WELCOME_MESSAGE
+from guessing_game.services.game_serializer import SERIALIZERS
+
+KEY_PREFIX = "benchmark_serialization"
+GAME_SETTINGS = {
+    "arc_selection": "All",
+    "filler_percentage": 20,
+    "include_non_tv_fillers": False,
+    "difficulty_level": "medium",
+    "include_unrated": False,
+}
+QUESTIONS = [
+    "Is your character a member of a pirate crew?",
+    "Has your character eaten a devil fruit?",
+    "Is your character taller than Luffy?",
+    "Does your character appear before the Alabasta arc?",
+    "Is your character a marine or connected to the World Government?",
+]
+ANSWERS = [
+    "Yes, they sail with one of the well known crews of the story.",
+    "No, they have never eaten a devil fruit and fight with their own strength.",
+    "Yes, they are noticeably taller than Luffy.",
+    "No, they first show up later in the story.",
+    "No, they have no ties to the Marines or the World Government.",
+]
+
+
+def game_values(turns: int, start: float) -> dict[str, list]:
+    """The values of a game after a number of turns, shaped like AsyncGameManager writes them"""
+    log = [[WELCOME_MESSAGE, False, False, start]]
+    context = []
+    for turn in range(turns):
+        question, answer = QUESTIONS[turn % len(QUESTIONS)], ANSWERS[turn % len(ANSWERS)]
+        timestamp = start + turn * 30.5
+        log += [[question, True, True, timestamp], [answer, False, True, timestamp]]
+        context += [["h", question], ["a", answer]]
+    return {"log": log, "context": context, "settings": [GAME_SETTINGS]}
+
+
+def time_us(function, runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        function()
+    return (time.perf_counter() - start) * 1_000_000 / runs
+
+
+def measure(serializer, turns: int, runs: int) -> dict:
+    values = game_values(turns, time.time())
+    encoded = {name: [serializer.dumps(value) for value in entries] for name, entries in values.items()}
+    turn_values = values["log"][-2:] + values["context"][-2:]
+    settings, context, log = encoded["settings"][0], encoded["context"], encoded["log"]
+
+    def read_turn():
+        serializer.loads(settings)
+        for entry in context:
+            serializer.loads(entry)
+
+    return {
+        "encoded": encoded,
+        "bytes": sum(len(entry) for entries in encoded.values() for entry in entries),
+        "write_us": time_us(lambda: [serializer.dumps(value) for value in turn_values], runs),
+        "read_us": time_us(read_turn, runs),
+        "validate_us": time_us(lambda: [serializer.loads(entry) for entry in log], runs),
+    }
+
+
+def memory_usage(redis_client, label: str, encoded: dict[str, list[bytes]]) -> int:
+    """MEMORY USAGE of the game's keys with the values stored"""
+    keys = {name: f"{KEY_PREFIX}:{label}:{name}" for name in encoded}
+    try:
+        pipe = redis_client.pipeline()
+        pipe.rpush(keys["log"], *encoded["log"])
+        if encoded["context"]:
+            pipe.rpush(keys["context"], *encoded["context"])
+        pipe.hset(keys["settings"], "game_settings", encoded["settings"][0])
+        pipe.execute()
+        return sum(redis_client.memory_usage(key, samples=0) or 0 for key in keys.values())
+    finally:
+        redis_client.delete(*keys.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON vs msgpack encoding of game values at different game lengths")
+    parser.add_argument("--turns", type=int, nargs="+", default=[5, 20, 50], help="Question turns per game")
+    parser.add_argument("--runs", type=int, default=2000, help="Repetitions per timing")
+    parser.add_argument("--redis", action="store_true", help="Also store the values and report MEMORY USAGE")
+    args = parser.parse_args()
+
+    redis_client = None
+    if args.redis:
+        connected, message = test_redis_connection()
+        if not connected:
+            print(message)
+            return 1
+        redis_client = get_redis()
+
+    header = f"  {'format':8} {'bytes':>8} {'write us':>9} {'read us':>9} {'validate us':>12}"
+    if redis_client:
+        header += f" {'MEMORY USAGE':>13}"
+
+    for turns in args.turns:
+        print(f"[{turns} turns]")
+        print(header)
+        results = {}
+        for name in ("json", "msgpack"):
+            result = results[name] = measure(SERIALIZERS[name], turns, args.runs)
+            line = (f"  {name:8} {result['bytes']:>8} {result['write_us']:>9.2f} {result['read_us']:>9.2f} "
+                    f"{result['validate_us']:>12.2f}")
+            if redis_client:
+                line += f" {memory_usage(redis_client, f'{name}:{turns}', result['encoded']):>13}"
+            print(line)
+
+        saved = 1 - results["msgpack"]["bytes"] / results["json"]["bytes"]
+        speedup = results["json"]["read_us"] / results["msgpack"]["read_us"]
+        print(f"  msgpack: {saved:.0%} fewer bytes, turn reads {speedup:.1f}x faster\n")
+
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    finally:
+        _scratch_db.remove()
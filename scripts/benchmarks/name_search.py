@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Name search benchmark.
+
+Times a set of typed guesses against the name lookups: the substring scan (name ILIKE '%x%') and the FTS5
+character_search index over name, alias and epithet, and prints the top matches of each.
+
+The database is copied to a temporary file first, so the migration never touches the real app.db.
+
+USAGE:
+    python scripts/benchmarks/name_search.py
+    python scripts/benchmarks/name_search.py --runs=2000 luf "straw hat" zor
+"""
+
+import argparse
+import sys
+import time
+
+# Before anything from guessing_game, so the app only ever sees the scratch copy of app.db
+import _scratch_db
+
+from sqlalchemy import select
+
+from guessing_game.config.database import engine
+from guessing_game.config.migrations import run_migrations
+from guessing_game.models.character_search import match_expression, search_statement
+from guessing_game.models.db_character import DBCharacter
+
+DEFAULT_QUERIES = ["lu", "luf", "monkey d", "zor", "straw hat", "nami", "big mom"]
+SUGGESTIONS = 10
+
+
+def scan_search(connection, query: str) -> list[str]:
+    statement = select(DBCharacter.id).where(DBCharacter.name.ilike(f"%{query}%")).limit(SUGGESTIONS)
+    return list(connection.execute(statement).scalars())
+
+
+def index_search(connection, query: str) -> list[str]:
+    match = match_expression(query)
+    if match is None:
+        return []
+    return list(connection.execute(search_statement, {"match": match}).scalars().fetchmany(SUGGESTIONS))
+
+
+def time_search(search, connection, query: str, runs: int) -> tuple[float, list[str]]:
+    start = time.perf_counter()
+    for _ in range(runs):
+        ids = search(connection, query)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / runs
+    return elapsed_ms, ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time substring scan vs FTS5 name search")
+    parser.add_argument("queries", nargs="*", default=DEFAULT_QUERIES, help="Typed guesses to search for")
+    parser.add_argument("--runs", type=int, default=1000, help="Executions per query when timing")
+    args = parser.parse_args()
+
+    run_migrations()
+
+    with engine.connect() as connection:
+        for query in args.queries:
+            print(f"[{query}]")
+            for label, search in (("scan", scan_search), ("index", index_search)):
+                elapsed_ms, ids = time_search(search, connection, query, args.runs)
+                print(f"  {label:5} {elapsed_ms:.3f} ms/query, {len(ids)} results: {', '.join(ids[:5])}")
+            print()
+
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    finally:
+        engine.dispose()
+        _scratch_db.remove()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Query plan benchmark for the characters table.
+
+Runs the character pool filters in both their legacy form (CASE/MAX effective episode, ILIKE filler status,
+LOWER(id) NOT IN exclusions) and their indexed form (materialized columns, is_excluded flag), prints
+EXPLAIN QUERY PLAN for each and times them.
+
+The database is copied to a temporary file first, so the migration never touches the real app.db.
+
+USAGE:
+    python scripts/benchmarks/query_plan.py
+    python scripts/benchmarks/query_plan.py --runs=500
+"""
+
+import argparse
+import sys
+import time
+
+# Before anything from guessing_game, so the app only ever sees the scratch copy of app.db
+import _scratch_db
+
+from sqlalchemy import case, func, or_, select, text
+
+from guessing_game.config.database import engine
+from guessing_game.config.migrations import run_migrations
+from guessing_game.config.exclusions import load_excluded_character_ids
+from guessing_game.models.db_arc import DBArc
+from guessing_game.models.db_character import DBCharacter
+
+POOL_INDEX = "ix_characters_pool"
+DIFFICULTY_RANGE = ["easy", "medium", "hard"]
+
+
+def legacy_pool_query(arc, filler_status: str, excluded_ids: list[str]):
+    """The pool filter as it was written before the materialized columns existed"""
+    effective_episode = case(
+        ((DBCharacter.episode.is_(None)) & (DBCharacter.number.is_(None)), None),
+        (DBCharacter.episode.is_(None), DBCharacter.number),
+        (DBCharacter.number.is_(None), DBCharacter.episode),
+        else_=func.max(DBCharacter.episode, DBCharacter.number)
+    )
+    return (
+        select(DBCharacter.id)
+        .where(DBCharacter.is_ignored == False)
+        .where(or_(DBCharacter.difficulty.in_(DIFFICULTY_RANGE), DBCharacter.difficulty == "unrated"))
+        .where(DBCharacter.chapter.is_(None) | (DBCharacter.chapter <= arc.last_chapter))
+        .where(effective_episode.is_(None) | (effective_episode <= arc.last_episode))
+        .where(~func.lower(DBCharacter.id).in_([char_id.lower() for char_id in excluded_ids]))
+        .where(DBCharacter.filler_status.ilike(filler_status))
+    )
+
+
+def indexed_pool_query(arc, filler_status: str, excluded_ids: list[str]):
+    """The same filter written against the materialized, indexed columns"""
+    return (
+        select(DBCharacter.id)
+        .where(DBCharacter.normalized_filler_status == filler_status.lower())
+        .where(DBCharacter.difficulty.in_(DIFFICULTY_RANGE + ["unrated"]))
+        .where(DBCharacter.is_ignored == False)
+        .where(DBCharacter.chapter.is_(None) | (DBCharacter.chapter <= arc.last_chapter))
+        .where(DBCharacter.effective_episode.is_(None) | (DBCharacter.effective_episode <= arc.last_episode))
+        .where(DBCharacter.is_excluded == False)
+    )
+
+
+def explain(connection, query) -> list[str]:
+    compiled = query.compile(engine, compile_kwargs={"literal_binds": True})
+    return [row[-1] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))]
+
+
+def time_query(connection, query, runs: int) -> tuple[float, int]:
+    start = time.perf_counter()
+    for _ in range(runs):
+        rows = connection.execute(query).all()
+    elapsed_ms = (time.perf_counter() - start) * 1000 / runs
+    return elapsed_ms, len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN and time the character pool queries")
+    parser.add_argument("--runs", type=int, default=200, help="Executions per query when timing")
+    parser.add_argument("--arc", default="Enies Lobby", help="Arc used for the arc filter")
+    args = parser.parse_args()
+
+    run_migrations()
+    excluded_ids = load_excluded_character_ids()
+    with engine.begin() as connection:
+        connection.execute(DBCharacter.exclusion_update(excluded_ids))
+
+    with engine.connect() as connection:
+        arc = connection.execute(
+            select(DBArc.name, DBArc.last_chapter, DBArc.last_episode).where(DBArc.name == args.arc)
+        ).first()
+        if arc is None:
+            print(f"Arc '{args.arc}' not found")
+            return 1
+
+        all_indexed = True
+        for filler_status in ("canon", "filler"):
+            print("=" * 60)
+            print(f"Pool: {filler_status}, arc: {arc.name}, difficulty: {DIFFICULTY_RANGE} + unrated")
+            print("=" * 60)
+
+            for label, build in (("legacy", legacy_pool_query), ("indexed", indexed_pool_query)):
+                query = build(arc, filler_status, excluded_ids)
+                plan = explain(connection, query)
+                elapsed_ms, row_count = time_query(connection, query, args.runs)
+
+                print(f"\n[{label}] {elapsed_ms:.3f} ms/query, {row_count} rows")
+                for step in plan:
+                    print(f"  {step}")
+
+                if label == "indexed" and not any(POOL_INDEX in step for step in plan):
+                    all_indexed = False
+            print()
+
+    if not all_indexed:
+        print(f"FAIL: at least one indexed query does not use {POOL_INDEX}")
+        return 1
+
+    print(f"OK: every indexed query is served by {POOL_INDEX}")
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    finally:
+        engine.dispose()
+        _scratch_db.remove()
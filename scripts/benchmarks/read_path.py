@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Read path benchmark.
+
+Runs the per-request character reads (full character by ID, as done on every game start) on the writer engine and on
+the read engine, from several threads at once, and reports the average latency of each.
+
+The read engine uses the file unless SQLITE_MEMORY_REPLICA is set, so run it twice to compare the two profiles:
+    python scripts/benchmarks/read_path.py
+    SQLITE_MEMORY_REPLICA=true python scripts/benchmarks/read_path.py
+
+The database is copied to a temporary file first, so the migration never touches the real app.db.
+
+USAGE:
+    python scripts/benchmarks/read_path.py --threads=8 --reads=2000
+"""
+
+import argparse
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Before anything from guessing_game, so the app only ever sees the scratch copy of app.db
+import _scratch_db
+
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from guessing_game.config.database import engine, read_engine
+from guessing_game.config.migrations import run_migrations
+from guessing_game.config.settings import SQLITE_MEMORY_REPLICA
+from guessing_game.models.db_character import DBCharacter
+
+
+def run_reads(session_factory, character_ids: list[str]) -> float:
+    """Read every character by ID in its own session, returns the time per read in ms"""
+    start = time.perf_counter()
+    for character_id in character_ids:
+        with session_factory() as session:
+            session.get(DBCharacter, character_id).to_pydantic()
+    return (time.perf_counter() - start) * 1000 / len(character_ids)
+
+
+def time_engine(target_engine, character_ids: list[str], threads: int, reads: int) -> float:
+    session_factory = sessionmaker(bind=target_engine)
+    batches = [random.choices(character_ids, k=reads) for _ in range(threads)]
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        per_thread = list(executor.map(lambda batch: run_reads(session_factory, batch), batches))
+    return sum(per_thread) / len(per_thread)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time character reads on the writer vs the read engine")
+    parser.add_argument("--threads", type=int, default=4, help="Concurrent readers")
+    parser.add_argument("--reads", type=int, default=1000, help="Reads per thread")
+    args = parser.parse_args()
+
+    run_migrations()
+    with engine.connect() as connection:
+        character_ids = list(connection.execute(select(DBCharacter.id)).scalars())
+
+    print(f"Read engine: {'in-memory replicas' if SQLITE_MEMORY_REPLICA else 'read-only file'}, "
+          f"{args.threads} threads x {args.reads} reads\n")
+
+    # Warm up both pools so connection setup (and the replica copies) are not timed
+    for target_engine in (engine, read_engine):
+        time_engine(target_engine, character_ids, args.threads, 10)
+
+    for label, target_engine in (("writer", engine), ("read", read_engine)):
+        elapsed_ms = time_engine(target_engine, character_ids, args.threads, args.reads)
+        print(f"  {label:6} {elapsed_ms:.3f} ms/read")
+
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    finally:
+        engine.dispose()
+        read_engine.dispose()
+        _scratch_db.remove()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Redis round trips per question turn.
+
+Plays the same question turns against Redis twice on the async client the game routes use - once with the per-call
+sequence a turn used to make (target, arc limit and chat history read one by one, then each message appended on its
+own), once the way the routes do it, through a GameSnapshot (AsyncGameManager.load_snapshot, record_turn,
+save_snapshot) - and reports, per turn:
+    - round trips: requests written to a Redis socket (a pipeline counts once)
+    - clients: redis.asyncio.Redis instances created, each one a new connection pool
+    - latency of the Redis work of the turn (the LLM and vector lookups are not part of it)
+
+Needs Redis at REDIS_URL. Games are created under a benchmark prefix and deleted afterwards.
+
+USAGE:
+    python scripts/benchmarks/redis_round_trips.py
+    python scripts/benchmarks/redis_round_trips.py --turns=50
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+# Before anything from guessing_game, so the app only ever sees the scratch copy of app.db
+import _scratch_db
+
+import redis.asyncio
+from langchain_core.messages import AIMessage, HumanMessage
+from redis.asyncio.connection import AbstractConnection
+
+from guessing_game.config import GAME_TTL
+from guessing_game.config.redis_client import test_redis_connection
+from guessing_game.services.async_game_manager import AsyncGameManager
+from guessing_game.services.chat_history import chat_key, decode_message, encode_message
+from guessing_game.services.game_manager import encode_log_entry
+
+QUESTION = "Is your character a member of a pirate crew?"
+ANSWER = "Yes, they sail with a well known crew."
+
+
+class Counters:
+    """Counts socket writes and client creations while enabled"""
+
+    def __init__(self):
+        self.round_trips = 0
+        self.clients = 0
+        self.enabled = False
+
+    def install(self):
+        send_packed_command = AbstractConnection.send_packed_command
+        redis_init = redis.asyncio.Redis.__init__
+        counters = self
+
+        async def counting_send(connection, *args, **kwargs):
+            if counters.enabled:
+                counters.round_trips += 1
+            return await send_packed_command(connection, *args, **kwargs)
+
+        def counting_init(client, *args, **kwargs):
+            if counters.enabled:
+                counters.clients += 1
+            return redis_init(client, *args, **kwargs)
+
+        AbstractConnection.send_packed_command = counting_send
+        redis.asyncio.Redis.__init__ = counting_init
+
+
+async def append(redis_client: redis.asyncio.Redis, key: str, entry: bytes):
+    pipe = redis_client.pipeline()
+    pipe.rpush(key, entry)
+    pipe.expire(key, GAME_TTL)
+    await pipe.execute()
+
+
+async def per_call_turn(game_mgr: AsyncGameManager, game_id: str):
+    """
+    The Redis work of a question turn before game snapshots: target, arc limit and chat history read one by one,
+    then every message appended on its own and the question counter bumped after checking the game still exists
+    """
+    redis_client, game_key = game_mgr.redis, f"game:{game_id}"
+    await redis_client.hget(game_key, "character_id")
+    await redis_client.hget(game_key, "arc_limit")
+    [decode_message(entry) for entry in await redis_client.lrange(chat_key(game_id), 0, -1)]
+
+    for text, is_user, message in ((QUESTION, True, HumanMessage(content=QUESTION)),
+                                   (ANSWER, False, AIMessage(content=ANSWER))):
+        await append(redis_client, f"messages:{game_id}", encode_log_entry(text, is_user, True, time.time()))
+        await append(redis_client, chat_key(game_id), encode_message(message))
+        if is_user and await redis_client.hexists(game_key, "game_settings"):
+            pipe = redis_client.pipeline()
+            pipe.hincrby(game_key, "questions_asked", 1)
+            pipe.expire(game_key, GAME_TTL)
+            await pipe.execute()
+
+
+async def snapshot_turn(game_mgr: AsyncGameManager, game_id: str):
+    """The Redis work of a question turn in the game routes"""
+    game = await game_mgr.load_snapshot(game_id, with_chat=True)
+    game.chat_history
+    game.record_turn(QUESTION, ANSWER)
+    await game_mgr.save_snapshot(game)
+
+
+async def run(label: str, turn, game_mgr: AsyncGameManager, counters: Counters, turns: int):
+    game_id = f"benchmark_{label}_{time.time()}"
+    await game_mgr.create_game(game_id, "benchmark", "All", {})
+    try:
+        counters.round_trips = counters.clients = 0
+        counters.enabled = True
+        start = time.perf_counter()
+        for _ in range(turns):
+            await turn(game_mgr, game_id)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        counters.enabled = False
+
+        print(f"  {label:10} {counters.round_trips / turns:>12.1f} {counters.clients / turns:>8.1f} "
+              f"{elapsed_ms / turns:>10.2f}")
+    finally:
+        counters.enabled = False
+        game = await game_mgr.load_snapshot(game_id)
+        if game:
+            game.end()
+            await game_mgr.save_snapshot(game)
+
+
+async def main_async(turns: int) -> int:
+    connected, message = test_redis_connection()
+    if not connected:
+        print(message)
+        return 1
+
+    counters = Counters()
+    counters.install()
+    game_mgr = AsyncGameManager()
+
+    print(f"{turns} turns per game\n")
+    print(f"  {'path':10} {'round trips':>12} {'clients':>8} {'ms/turn':>10}")
+    try:
+        await run("per-call", per_call_turn, game_mgr, counters, turns)
+        await run("snapshot", snapshot_turn, game_mgr, counters, turns)
+    finally:
+        await game_mgr.redis.aclose()
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Redis round trips of a question turn, per call vs game snapshot")
+    parser.add_argument("--turns", type=int, default=20, help="Question turns per game (the chat history grows)")
+    args = parser.parse_args()
+    return asyncio.run(main_async(args.turns))
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    finally:
+        _scratch_db.remove()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark for the full character list.
+
+Encodes every character (the /api/characters/until response for arc "All", and the /api/game/start character pool)
+two ways and times both:
+  - model: BasicCharacter models validated into the response model, dumped by alias and rendered with json.dumps,
+    the way FastAPI serializes a response_model
+  - fast:  rows read straight from the catalog columns and encoded to bytes with orjson
+
+Both outputs are decoded and compared, so the fast path is checked to produce the same wire schema.
+
+The database is copied to a temporary file first, so the migration never touches the real app.db.
+
+USAGE:
+    python scripts/benchmarks/serialization.py
+    python scripts/benchmarks/serialization.py --runs=200
+"""
+
+import argparse
+import json
+import sys
+import time
+
+# Before anything from guessing_game, so the app only ever sees the scratch copy of app.db
+import _scratch_db
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from guessing_game.config.database import engine
+from guessing_game.config.migrations import run_migrations
+from guessing_game.schemas.arc_schemas import Arc
+from guessing_game.schemas.character_schemas import CharactersResponse
+from guessing_game.services.character_catalog import CATALOG_FIELDS
+from guessing_game.services.character_service import CharacterService, sync_excluded_characters
+from guessing_game.services.serialization import dumps, encode_characters
+
+ALL_ARCS = Arc(name="All", chapter=None, episode=None)
+
+
+def model_list_response(character_service: CharacterService) -> bytes:
+    characters = character_service.get_characters_until(ALL_ARCS, include_ignored=True)
+    response = CharactersResponse(characters=characters, count=len(characters), arc=ALL_ARCS.name,
+                                  catalogVersion=character_service.get_catalog_version(ALL_ARCS))
+    validated = CharactersResponse.model_validate(response.model_dump())
+    return JSONResponse(jsonable_encoder(validated.model_dump(by_alias=True))).body
+
+
+def fast_list_response(character_service: CharacterService) -> bytes:
+    rows, _ = character_service.get_character_rows(ALL_ARCS, list(CATALOG_FIELDS), include_ignored=True)
+    characters = list(rows)
+    return dumps({
+        "characters": characters,
+        "count": len(characters),
+        "arc": ALL_ARCS.name,
+        "catalogVersion": character_service.get_catalog_version(ALL_ARCS),
+        "nextCursor": None,
+    })
+
+
+def model_pool_payload(character_service: CharacterService) -> bytes:
+    characters = character_service.get_characters_until(ALL_ARCS, include_ignored=True)
+    return json.dumps([char.model_dump(by_alias=True) for char in characters],
+                      ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def fast_pool_payload(character_service: CharacterService) -> bytes:
+    return encode_characters(character_service.get_characters_until(ALL_ARCS, include_ignored=True))
+
+
+def time_encoder(encode, character_service: CharacterService, runs: int) -> tuple[float, bytes]:
+    start = time.perf_counter()
+    for _ in range(runs):
+        body = encode(character_service)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / runs
+    return elapsed_ms, body
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the model vs fast serialization of the full character list")
+    parser.add_argument("--runs", type=int, default=50, help="Encodings per path when timing")
+    args = parser.parse_args()
+
+    run_migrations()
+    sync_excluded_characters()
+    character_service = CharacterService()
+    print(f"Catalog: {character_service.catalog.size} characters\n")
+
+    all_equal = True
+    for label, model_path, fast_path in (
+            ("characters/until", model_list_response, fast_list_response),
+            ("game/start pool", model_pool_payload, fast_pool_payload)):
+        model_ms, model_body = time_encoder(model_path, character_service, args.runs)
+        fast_ms, fast_body = time_encoder(fast_path, character_service, args.runs)
+        equal = json.loads(model_body) == json.loads(fast_body)
+        all_equal &= equal
+
+        print(f"[{label}]")
+        print(f"  model: {model_ms:8.3f} ms, {len(model_body)} bytes")
+        print(f"  fast:  {fast_ms:8.3f} ms, {len(fast_body)} bytes")
+        print(f"  speedup: {model_ms / fast_ms:.1f}x, same payload: {equal}\n")
+
+    if not all_equal:
+        print("FAIL: the fast path does not produce the same payload")
+        return 1
+
+    print("OK: both paths produce the same payload")
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    finally:
+        engine.dispose()
+        _scratch_db.remove()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Worker throughput benchmark.
+
+Starts the production entry point (guessing_game.app:main) once per worker count, drives it with concurrent
+keep-alive clients for a fixed time and prints requests per second and latency for each run, so 1 vs N workers can
+be compared on the same machine. Every client opens a session first and sends its cookie with every request, so
+with several workers a cookie signed by one worker has to be accepted by the others.
+
+Needs Redis and the same environment as the server (the embedding model is loaded at startup). The server runs on
+a temporary copy of app.db, so the real data is never modified.
+
+USAGE:
+    python scripts/benchmarks/throughput.py
+    python scripts/benchmarks/throughput.py --workers 1 2 4 --clients=32 --duration=20
+"""
+
+import argparse
+import http.client
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from multiprocessing import Pool
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DATABASE_PATH = PROJECT_ROOT / "src" / "guessing_game" / "data" / "app.db"
+
+HOST = "127.0.0.1"
+# Read endpoints a player hits while browsing and typing guesses
+REQUESTS = [
+    ("GET", "/api/characters/until?fields=id,name"),
+    ("GET", "/api/characters/search?q=lu"),
+    ("POST", "/api/session/"),
+]
+
+
+def start_server(workers: int, port: int, database_path: Path) -> subprocess.Popen:
+    env = dict(os.environ,
+               WEB_WORKERS=str(workers),
+               PORT=str(port),
+               HOST=HOST,
+               DATABASE_URL=f"sqlite:///{database_path}",
+               SESSION_SECRET_KEY="throughput-benchmark",
+               PYTHONPATH=os.pathsep.join(filter(None, [str(PROJECT_ROOT / "src"), os.getenv("PYTHONPATH")])))
+    return subprocess.Popen([sys.executable, "-c", "from guessing_game.app import main; main()"], env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_until_ready(port: int, timeout: float):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection(HOST, port, timeout=2)
+            connection.request("GET", "/api/characters/search?q=a")
+            connection.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.5)
+    raise TimeoutError(f"Server on port {port} did not start within {timeout}s")
+
+
+def run_client(args: tuple[int, float]) -> tuple[int, int, list[float]]:
+    """One keep-alive client cycling through REQUESTS until the deadline, returns (ok, failed, latencies)"""
+    port, deadline = args
+    connection = http.client.HTTPConnection(HOST, port, timeout=30)
+    connection.request("POST", "/api/session/", body=json.dumps({"arcLimit": "All"}),
+                       headers={"Content-Type": "application/json"})
+    response = connection.getresponse()
+    response.read()
+    cookie = response.getheader("set-cookie", "").split(";", 1)[0]
+
+    ok, failed, latencies = 0, 0, []
+    i = 0
+    while time.monotonic() < deadline:
+        method, path = REQUESTS[i % len(REQUESTS)]
+        i += 1
+        body = json.dumps({}) if method == "POST" else None
+        start = time.perf_counter()
+        connection.request(method, path, body=body, headers={"Cookie": cookie, "Content-Type": "application/json"})
+        response = connection.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        if response.status == 200:
+            ok += 1
+        else:
+            failed += 1
+    connection.close()
+    return ok, failed, latencies
+
+
+def measure(port: int, clients: int, duration: float) -> dict:
+    deadline = time.monotonic() + duration
+    with Pool(clients) as pool:
+        results = pool.map(run_client, [(port, deadline)] * clients)
+
+    ok = sum(result[0] for result in results)
+    failed = sum(result[1] for result in results)
+    latencies = sorted(latency for result in results for latency in result[2])
+    return {
+        "rps": ok / duration,
+        "failed": failed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000 if latencies else 0.0,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare request throughput across worker counts")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1],
+                        help="Worker counts to run, one server start each")
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent client processes")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load per run")
+    parser.add_argument("--port", type=int, default=3100)
+    parser.add_argument("--startup-timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    scratch_dir = tempfile.mkdtemp()
+    try:
+        database_path = Path(scratch_dir) / "app.db"
+        shutil.copy(DATABASE_PATH, database_path)
+
+        print(f"{args.clients} clients, {args.duration:.0f}s per run, cpu count {os.cpu_count()}\n")
+        print(f"{'workers':>8} {'req/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'failed':>7}")
+        for workers in args.workers:
+            server = start_server(workers, args.port, database_path)
+            try:
+                wait_until_ready(args.port, args.startup_timeout)
+                result = measure(args.port, args.clients, args.duration)
+            finally:
+                server.terminate()
+                server.wait()
+            print(f"{workers:>8} {result['rps']:>10.1f} {result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f} "
+                  f"{result['failed']:>7}")
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
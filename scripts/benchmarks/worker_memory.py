@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Worker memory and cold start benchmark.
+
+Starts the gunicorn deployment (guessing_game/gunicorn_conf.py) twice - with PREFORK_PRELOAD off, where every worker
+loads the embedding model, arcs and catalog itself, and on, where the master loads them and forks - and reports:
+    - boot: time from launch until every worker finished its startup
+    - respawn: time for a killed worker to be replaced and ready again
+    - per-process memory: RSS, PSS (shared pages split between the processes sharing them) and USS (private pages).
+      RSS counts shared pages in full for every worker, PSS/USS are the numbers that show the sharing.
+
+Linux only (reads /proc/<pid>/smaps_rollup). Needs Redis and the server's environment, and runs on a temporary copy
+of app.db, so the real data is never modified.
+
+USAGE:
+    python scripts/benchmarks/worker_memory.py
+    python scripts/benchmarks/worker_memory.py --workers=4
+"""
+
+import argparse
+import os
+import queue
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DATABASE_PATH = PROJECT_ROOT / "src" / "guessing_game" / "data" / "app.db"
+
+STARTUP_LINE = "Application startup complete"
+
+
+def start_server(workers: int, port: int, database_path: Path, preload: bool) -> subprocess.Popen:
+    env = dict(os.environ,
+               WEB_WORKERS=str(workers),
+               PORT=str(port),
+               HOST="127.0.0.1",
+               PREFORK_PRELOAD=str(preload),
+               DATABASE_URL=f"sqlite:///{database_path}",
+               SESSION_SECRET_KEY="worker-memory-benchmark",
+               PYTHONPATH=os.pathsep.join(filter(None, [str(PROJECT_ROOT / "src"), os.getenv("PYTHONPATH")])))
+    command = [sys.executable, "-m", "gunicorn", "-c", "python:guessing_game.gunicorn_conf", "guessing_game.app:app"]
+    return subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+
+
+def follow_startups(server: subprocess.Popen) -> queue.Queue:
+    """Queue that receives the time of every worker startup line the server logs"""
+    startups = queue.Queue()
+
+    def read():
+        for line in server.stderr:
+            if STARTUP_LINE in line:
+                startups.put(time.perf_counter())
+
+    threading.Thread(target=read, daemon=True).start()
+    return startups
+
+
+def wait_for_startups(startups: queue.Queue, count: int, timeout: float) -> float:
+    """Time of the last of count startups"""
+    last = None
+    for _ in range(count):
+        last = startups.get(timeout=timeout)
+    return last
+
+
+def worker_pids(master_pid: int) -> list[int]:
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The process name is in parentheses and may contain spaces, the parent PID follows it
+                parent_pid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if parent_pid == master_pid:
+            pids.append(int(entry))
+    return sorted(pids)
+
+
+def memory_mb(pid: int) -> dict[str, float]:
+    """RSS, PSS and USS of a process in MiB"""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                values[parts[0][:-1]] = int(parts[1]) / 1024
+    return {
+        "rss": values.get("Rss", 0.0),
+        "pss": values.get("Pss", 0.0),
+        "uss": values.get("Private_Clean", 0.0) + values.get("Private_Dirty", 0.0),
+    }
+
+
+def run(workers: int, port: int, database_path: Path, preload: bool, timeout: float) -> dict:
+    launched = time.perf_counter()
+    server = start_server(workers, port, database_path, preload)
+    try:
+        startups = follow_startups(server)
+        boot_s = wait_for_startups(startups, workers, timeout) - launched
+        # Let the workers settle (lazy imports, first collections) before sampling memory
+        time.sleep(2)
+
+        master = memory_mb(server.pid)
+        per_worker = [memory_mb(pid) for pid in worker_pids(server.pid)]
+
+        killed = time.perf_counter()
+        os.kill(worker_pids(server.pid)[0], signal.SIGKILL)
+        respawn_s = wait_for_startups(startups, 1, timeout) - killed
+    finally:
+        server.terminate()
+        server.wait()
+
+    return {"boot_s": boot_s, "respawn_s": respawn_s, "master": master, "workers": per_worker}
+
+
+def print_result(label: str, result: dict):
+    workers = result["workers"]
+    total_pss = result["master"]["pss"] + sum(worker["pss"] for worker in workers)
+    print(f"[{label}] boot {result['boot_s']:.2f}s, worker respawn {result['respawn_s']:.2f}s, "
+          f"total PSS {total_pss:.0f} MiB")
+    print(f"  {'process':>8} {'RSS MiB':>9} {'PSS MiB':>9} {'USS MiB':>9}")
+    for name, memory in [("master", result["master"])] + [(f"worker{i}", worker) for i, worker in enumerate(workers)]:
+        print(f"  {name:>8} {memory['rss']:>9.1f} {memory['pss']:>9.1f} {memory['uss']:>9.1f}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-worker memory and cold start, with and without prefork preload")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--port", type=int, default=3100)
+    parser.add_argument("--timeout", type=float, default=180.0, help="Seconds to wait for a worker to start")
+    args = parser.parse_args()
+
+    scratch_dir = tempfile.mkdtemp()
+    try:
+        database_path = Path(scratch_dir) / "app.db"
+        shutil.copy(DATABASE_PATH, database_path)
+
+        for label, preload in (("per-worker loading", False), ("prefork preload", True)):
+            print_result(label, run(args.workers, args.port, database_path, preload, args.timeout))
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
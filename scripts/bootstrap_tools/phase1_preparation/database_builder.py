@@ -13,6 +13,7 @@ from guessing_game.config.vector_db import initialize_collection
 from guessing_game.models.base import Base
 from guessing_game.models.db_arc import DBArc
 from guessing_game.models.db_character import DBCharacter
+from guessing_game.config.exclusions import load_excluded_character_ids
 
 
 class DatabaseBuilder:
@@ -115,6 +116,7 @@ class DatabaseBuilder:
         with get_db_session() as session:
             if session.query(DBCharacter).count() == 0:
                 self.load_characters_from_csv()
+                self.apply_exclusions()
 
             if session.query(DBArc).count() == 0:
                 self.load_arcs_from_json()
@@ -156,7 +158,10 @@ class DatabaseBuilder:
 
                 character_data[model_key] = value
 
-        return DBCharacter(**character_data)
+        character = DBCharacter(**character_data)
+        # Materialized columns used by the pool index
+        character.refresh_derived_columns()
+        return character
 
     def load_characters_from_csv(self):
         """Load characters from CSV file"""
@@ -174,6 +179,13 @@ class DatabaseBuilder:
                 print(f"Error: {e}")
                 raise
 
+    def apply_exclusions(self):
+        """Flag the characters listed in excluded_characters.txt"""
+        with get_db_session() as session:
+            excluded_ids = load_excluded_character_ids()
+            session.execute(DBCharacter.exclusion_update(excluded_ids))
+            print(f"Flagged {len(excluded_ids)} excluded characters")
+
     def load_arcs_from_json(self):
         """Load arcs from JSON file"""
         with get_db_session() as session:
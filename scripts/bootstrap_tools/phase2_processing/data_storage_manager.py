@@ -114,6 +114,11 @@ class DataStorageManager:
             #  Update affiliations as they were scraped regardless
             character.affiliations = character_data.get('affiliations')
 
+            # Same for the name variants used by name search
+            structured_data = character_data.get('structured_data', {})
+            character.alias = structured_data.get('alias')
+            character.epithet = structured_data.get('epithet')
+
             if updated_fields:
                 print(f"Updated character {character_id}: {', '.join(updated_fields)}")
                 return {'success': True, 'skipped': False}
@@ -1,7 +1,8 @@
 # guessing_game/app.py
+import asyncio
 import os
 import secrets
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 import uvicorn
 from dotenv import load_dotenv
 from fastapi import FastAPI
@@ -13,13 +14,22 @@ from starlette.middleware.sessions import SessionMiddleware
 
 load_dotenv()
 
-from guessing_game.config import get_redis, test_redis_connection, get_embedding_model, LLM_PROVIDER, LLM_MODEL
-from guessing_game.services.character_service import CharacterService
+from guessing_game.config import get_redis, get_async_redis, get_pubsub_redis, test_redis_connection, \
+    get_embedding_model, LLM_PROVIDER, LLM_MODEL, HOST, PORT, WEB_WORKERS, SESSION_SECRET_KEY
+from guessing_game.config.database import async_engine, async_read_engine
+from guessing_game.config.migrations import run_migrations
+from guessing_game.services.arc_service import ArcService
+from guessing_game.services.async_character_service import AsyncCharacterService
+from guessing_game.services.catalog_sync import CatalogSync
+from guessing_game.services.character_service import CharacterService, sync_excluded_characters
 from guessing_game.services.llm_service import LLMService
+from guessing_game.services.pool_cache import PoolCache
 from guessing_game.routes import session
 from guessing_game.routes.game import router as game_router
 from guessing_game.routes.characters import router as characters_router
 
+# Set by main() and the gunicorn master once they prepared the database, so the workers they start don't repeat it
+DATABASE_PREPARED_ENV = "GUESSING_GAME_DATABASE_PREPARED"
 
 
 @asynccontextmanager
@@ -31,26 +41,53 @@ async def lifespan(app: FastAPI):
     service.set_model(provider=LLM_PROVIDER, model=LLM_MODEL)
     app.state.llm = service
 
-    # Initialize repository
-    app.state.repository = CharacterService()
-
     # Test Redis connection with clearer error handling
     success, message = test_redis_connection()
+    catalog_sync = None
     if success:
         app.state.redis_client = get_redis()
         print(message)
+        # Shares catalog versions with the other workers
+        catalog_sync = CatalogSync(app.state.redis_client, get_pubsub_redis())
     else:
         print(f"WARNING: {message}")
         print("Game functionality will not work. Please start Redis server to enable game features.")
 
+    # Arc timeline and character catalog are loaded once and shared by every request, unless the prefork master
+    # already loaded them (see preload_shared_state)
+    if not hasattr(app.state, 'repository'):
+        # Bring the database up to date before loading the catalog, unless the launcher already did for every worker
+        if not os.getenv(DATABASE_PREPARED_ENV):
+            prepare_database()
+        app.state.arc_service = await ArcService.load_async()
+        app.state.repository = CharacterService(app.state.arc_service, catalog_sync)
+    # Same catalog, database work through the async engine - used by the async routes
+    app.state.async_repository = AsyncCharacterService(app.state.repository)
+    app.state.pool_cache = PoolCache()
+
+    if catalog_sync:
+        # Reload when another worker changes characters
+        app.state.repository.catalog_sync = catalog_sync
+        app.state.catalog_listener = asyncio.create_task(
+            catalog_sync.listen(app.state.repository, app.state.pool_cache)
+        )
+
     print("Preloading embedding model...")
     get_embedding_model()
     print("Embedding model loaded")
     yield
 
     print("Application shutting down...")
+    if hasattr(app.state, 'catalog_listener'):
+        app.state.catalog_listener.cancel()
+        with suppress(asyncio.CancelledError):
+            await app.state.catalog_listener
+    await async_engine.dispose()
+    await async_read_engine.dispose()
     if hasattr(app.state, 'redis_client'):
         app.state.redis_client.close()
+        await get_async_redis().aclose()
+        await get_pubsub_redis().aclose()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -61,8 +98,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Game-Id"],
 )
-app.add_middleware(SessionMiddleware, secret_key=secrets.token_urlsafe(32))
+# A random key only works with a single process, main() and the gunicorn config pin one for multiple workers
+app.add_middleware(SessionMiddleware, secret_key=SESSION_SECRET_KEY or secrets.token_urlsafe(32))
 
 # Include API routes
 app.include_router(session.router)
@@ -115,5 +154,43 @@ def catch_all_delete(path: str):
     raise HTTPException(status_code=404, detail=f"DELETE endpoint /{path} not found")
 
 
+def prepare_database():
+    """Bring the schema up to date and write the exclusion list into it, before any catalog is loaded"""
+    run_migrations()
+    sync_excluded_characters()
+
+
+def preload_shared_state():
+    """
+    Load the large read-mostly state once, in the gunicorn master before it forks: the schema migrations, the
+    embedding model, the arc timeline and the catalog. Workers inherit them copy-on-write and their lifespan skips
+    loading them again
+    """
+    prepare_database()
+    print("Preloading embedding model...")
+    get_embedding_model()
+    app.state.arc_service = ArcService()
+    # At the shared catalog version, otherwise every worker's listener would replace the inherited catalog on start
+    catalog_sync = CatalogSync(get_redis(), get_pubsub_redis()) if test_redis_connection()[0] else None
+    app.state.repository = CharacterService(app.state.arc_service, catalog_sync)
+    # The workers open their own Redis connections
+    get_redis().connection_pool.disconnect()
+    print("Embedding model, arc timeline and catalog loaded in the master")
+
+
+def main():
+    """
+    Production entry point (the guessing-game script): WEB_WORKERS uvicorn processes on one port.
+    The database is prepared once here, before any worker starts, and every worker signs sessions with the same key
+    """
+    if WEB_WORKERS > 1 and not SESSION_SECRET_KEY:
+        print("WARNING: SESSION_SECRET_KEY is not set, using a key generated for this run - sessions end on restart")
+        os.environ["SESSION_SECRET_KEY"] = secrets.token_urlsafe(32)
+
+    prepare_database()
+    os.environ[DATABASE_PREPARED_ENV] = "1"
+    uvicorn.run("guessing_game.app:app", host=HOST, port=PORT, workers=WEB_WORKERS)
+
+
 if __name__ == '__main__':
     uvicorn.run("guessing_game.app:app", host="0.0.0.0", port=3000, reload=True)
\ No newline at end of file
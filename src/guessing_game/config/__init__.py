@@ -1,15 +1,20 @@
 # server/config/__init__.py
 from .settings import *
-from .database import engine, SessionLocal, get_db, get_db_session
+from .database import engine, SessionLocal, get_db, get_db_session, async_engine, get_async_db_session, \
+    get_read_session, get_async_read_session
 from .vector_db import get_vector_client, get_embedding_model, initialize_collection
-from .redis_client import get_redis, test_redis_connection
+from .redis_client import get_redis, get_async_redis, get_pubsub_redis, test_redis_connection
+from .exclusions import load_excluded_character_ids
 
 __all__ = [
-    "engine", "SessionLocal", "get_db", "get_db_session",
+    "engine", "SessionLocal", "get_db", "get_db_session", "async_engine", "get_async_db_session",
+    "get_read_session", "get_async_read_session",
     "get_vector_client", "get_embedding_model", "initialize_collection",
-    "get_redis", "test_redis_connection",
+    "get_redis", "get_async_redis", "get_pubsub_redis", "test_redis_connection",
+    "load_excluded_character_ids",
     "DATA_DIR", "DATABASE_PATH", "VECTOR_DB_PATH", "STATIC_DATA_DIR",
     "ARCS_JSON_PATH", "GAME_PROMPT_PATH",
     "EMBEDDING_MODEL", "CHUNK_SIZE", "COLLECTION_NAME", "COLLECTION_METADATA", "GAME_TTL",
-    "REDIS_URL", "DATABASE_URL", "LLM_PROVIDER", "LLM_MODEL"
+    "REDIS_URL", "DATABASE_URL", "LLM_PROVIDER", "LLM_MODEL",
+    "HOST", "PORT", "WEB_WORKERS", "SESSION_SECRET_KEY"
 ]
@@ -1,10 +1,18 @@
 # server/config/database.py
-from sqlalchemy import create_engine, event
+import sqlite3
+import threading
+
+import aiosqlite
+from sqlalchemy import create_engine, event, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from contextlib import contextmanager
-from .settings import DATABASE_URL, DEBUG
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from contextlib import asynccontextmanager, closing, contextmanager
+from pathlib import Path
+from .settings import DATABASE_URL, ASYNC_DATABASE_URL, DEBUG, SQLITE_READ_CACHE_KB, SQLITE_MMAP_SIZE, \
+    SQLITE_MEMORY_REPLICA
 
-# Create engine
+# Create engine - the writer, reads go through read_engine below
 engine = create_engine(
     DATABASE_URL,
     echo=DEBUG,  # Log SQL queries in debug mode
@@ -13,8 +21,13 @@ engine = create_engine(
     }
 )
 
+# Async engine for the routes' writes and queries. The sync engine stays for the migrations and the exclusion sync at
+# startup, the catalog loads (at startup and on every reload) and the bootstrap tools
+async_engine = create_async_engine(ASYNC_DATABASE_URL, echo=DEBUG)
+
 # Set up SQLite pragmas using event listeners
 @event.listens_for(engine, "connect")
+@event.listens_for(async_engine.sync_engine, "connect")
 def set_sqlite_pragma(dbapi_connection, connection_record):
     cursor = dbapi_connection.cursor()
     cursor.execute("PRAGMA journal_mode=WAL")
@@ -24,6 +37,8 @@ def set_sqlite_pragma(dbapi_connection, connection_record):
     cursor.close()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Objects stay readable after commit, async sessions can't lazy-load expired attributes
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 @contextmanager
 def get_db_session():
@@ -44,4 +59,122 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+@asynccontextmanager
+async def get_async_db_session():
+    """Async counterpart of get_db_session"""
+    session: AsyncSession = AsyncSessionLocal()
+    try:
+        yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+
+
+# ===== READ PATH =====
+# Read-only connections to the same file. With SQLITE_MEMORY_REPLICA (off by default) every pooled connection instead
+# holds a private in-memory copy of the whole database - private rather than one shared-cache database, so readers
+# never wait on each other's table locks. The file is read once into a source copy and each new connection, overflow
+# ones included, is copied from that in memory. Every connection still costs the database's size in memory, and
+# refresh_read_replica_async, called after every write, drops the source and both pools
+# as_uri percent-encodes the path, so a "#" or "%" in it is not read as part of the URI syntax
+_READ_URI = Path(make_url(DATABASE_URL).database).resolve().as_uri() + "?mode=ro"
+
+_replica_source: sqlite3.Connection | None = None
+# Guards the source, backups from it run one at a time
+_replica_source_lock = threading.Lock()
+
+
+def _copy_replica() -> sqlite3.Connection:
+    """A new in-memory replica, copied from the source copy (read from the file first if there is none)"""
+    global _replica_source
+    with _replica_source_lock:
+        if _replica_source is None:
+            source = sqlite3.connect(":memory:", check_same_thread=False)
+            with closing(sqlite3.connect(_READ_URI, uri=True)) as database_file:
+                database_file.backup(source)
+            _replica_source = source
+        replica = sqlite3.connect(":memory:", check_same_thread=False)
+        _replica_source.backup(replica)
+    return replica
+
+
+def _drop_replica_source():
+    global _replica_source
+    with _replica_source_lock:
+        if _replica_source is not None:
+            _replica_source.close()
+            _replica_source = None
+
+
+def _connect_read() -> sqlite3.Connection:
+    if not SQLITE_MEMORY_REPLICA:
+        return sqlite3.connect(_READ_URI, uri=True, check_same_thread=False)
+    return _copy_replica()
+
+
+async def _connect_read_async() -> aiosqlite.Connection:
+    if not SQLITE_MEMORY_REPLICA:
+        return await aiosqlite.connect(_READ_URI, uri=True)
+    # The connector runs in the connection's own thread, so the copy is made off the event loop
+    return await aiosqlite.Connection(_copy_replica, iter_chunk_size=64)
+
+
+read_engine = create_engine("sqlite://", creator=_connect_read, poolclass=QueuePool, echo=DEBUG)
+async_read_engine = create_async_engine("sqlite+aiosqlite://", async_creator=_connect_read_async,
+                                        poolclass=AsyncAdaptedQueuePool, echo=DEBUG)
+
+
+@event.listens_for(read_engine, "connect")
+@event.listens_for(async_read_engine.sync_engine, "connect")
+def set_read_pragma(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only=ON")
+    cursor.execute(f"PRAGMA cache_size=-{SQLITE_READ_CACHE_KB}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.execute("PRAGMA temp_store=memory")
+    cursor.close()
+
+ReadSessionLocal = sessionmaker(autoflush=False, bind=read_engine)
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+
+
+@contextmanager
+def get_read_session():
+    """Session for queries only, on the read-only connections"""
+    session = ReadSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@asynccontextmanager
+async def get_async_read_session():
+    """Async counterpart of get_read_session"""
+    session: AsyncSession = AsyncReadSessionLocal()
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+def dispose_read_engine():
+    """Close the sync read connections and the replica source, e.g. before forking"""
+    read_engine.dispose()
+    _drop_replica_source()
+
+
+async def refresh_read_replica_async():
+    """
+    Make committed writes visible to both read paths. The file-backed read connections already see them,
+    in-memory replicas are dropped so the next checkout copies the database again
+    """
+    if SQLITE_MEMORY_REPLICA:
+        _drop_replica_source()
+        read_engine.dispose()
+        await async_read_engine.dispose()
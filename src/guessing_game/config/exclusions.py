@@ -0,0 +1,8 @@
+# server/config/exclusions.py
+from guessing_game.config.settings import EXCLUDED_CHARACTERS_PATH
+
+
+def load_excluded_character_ids() -> list[str]:
+    """Load excluded character IDs from the text file"""
+    with open(EXCLUDED_CHARACTERS_PATH, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
@@ -0,0 +1,71 @@
+# server/config/migrations.py
+from sqlalchemy import inspect, text
+
+from .database import engine
+from guessing_game.models.character_search import character_search_is_current, create_character_search_table, \
+    rebuild_character_search
+
+
+def _add_column(connection, table: str, column: str, ddl: str) -> bool:
+    """Add a column if it is missing, returns True when the column was created"""
+    existing = {col["name"] for col in inspect(connection).get_columns(table)}
+    if column in existing:
+        return False
+    connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+    return True
+
+
+def _create_index(connection, table: str, index: str, columns: str) -> bool:
+    """Create an index if it is missing, returns True when the index was created"""
+    existing = {ix["name"] for ix in inspect(connection).get_indexes(table)}
+    if index in existing:
+        return False
+    connection.execute(text(f"CREATE INDEX {index} ON {table} ({columns})"))
+    return True
+
+
+def migrate_characters_table(connection) -> bool:
+    """
+    Materialize effective_episode / normalized_filler_status, add is_excluded and the filter indexes.
+    Returns True when anything was changed
+    """
+    changed = False
+    if _add_column(connection, "characters", "effective_episode", "INTEGER"):
+        connection.execute(text("""
+            UPDATE characters SET effective_episode = CASE
+                WHEN episode IS NULL THEN number
+                WHEN number IS NULL THEN episode
+                ELSE MAX(episode, number)
+            END
+        """))
+        changed = True
+
+    if _add_column(connection, "characters", "normalized_filler_status", "VARCHAR(20) NOT NULL DEFAULT ''"):
+        connection.execute(text("UPDATE characters SET normalized_filler_status = LOWER(TRIM(filler_status))"))
+        changed = True
+
+    changed |= _add_column(connection, "characters", "is_excluded", "BOOLEAN NOT NULL DEFAULT 0")
+    changed |= _create_index(connection, "characters", "ix_characters_is_excluded", "is_excluded")
+    changed |= _create_index(connection, "characters", "ix_characters_pool",
+                             "normalized_filler_status, difficulty, is_ignored, chapter, effective_episode")
+
+    changed |= _add_column(connection, "characters", "alias", "TEXT")
+    changed |= _add_column(connection, "characters", "epithet", "TEXT")
+    return changed
+
+
+def run_migrations():
+    """
+    Bring an existing database up to the current schema (safe to run on every startup).
+    An up to date database is only read, the search index and the planner statistics are rebuilt when the schema
+    or the character names changed
+    """
+    with engine.begin() as connection:
+        if not inspect(connection).has_table("characters"):
+            return
+        changed = migrate_characters_table(connection)
+        if create_character_search_table(connection) or not character_search_is_current(connection):
+            rebuild_character_search(connection)
+            changed = True
+        if changed:
+            connection.execute(text("ANALYZE characters"))
@@ -2,17 +2,43 @@
 from pathlib import Path
 import sys
 import redis
+import redis.asyncio
 from redis.exceptions import ConnectionError, TimeoutError
 
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
-from guessing_game.config.settings import REDIS_URL
+from guessing_game.config.settings import REDIS_URL, REDIS_MAX_CONNECTIONS, REDIS_POOL_TIMEOUT, REDIS_SOCKET_TIMEOUT, \
+    REDIS_SOCKET_CONNECT_TIMEOUT, REDIS_HEALTH_CHECK_INTERVAL, REDIS_RETRY_ON_TIMEOUT
 
-redis_client = redis.from_url(REDIS_URL, decode_responses=True)
+POOL_OPTIONS = {
+    # Game values are binary (see services/game_serializer.py), callers decode the text they read themselves
+    "decode_responses": False,
+    "max_connections": REDIS_MAX_CONNECTIONS,
+    "timeout": REDIS_POOL_TIMEOUT,
+    "socket_timeout": REDIS_SOCKET_TIMEOUT,
+    "socket_connect_timeout": REDIS_SOCKET_CONNECT_TIMEOUT,
+    "health_check_interval": REDIS_HEALTH_CHECK_INTERVAL,
+    "retry_on_timeout": REDIS_RETRY_ON_TIMEOUT,
+}
+
+redis_client = redis.Redis.from_pool(redis.BlockingConnectionPool.from_url(REDIS_URL, **POOL_OPTIONS))
+# For the async routes and other work that runs on the event loop
+async_redis_client = redis.asyncio.Redis.from_pool(
+    redis.asyncio.BlockingConnectionPool.from_url(REDIS_URL, **POOL_OPTIONS)
+)
+# The catalog invalidation listener sits on its connection waiting for messages, so no socket timeout there
+pubsub_redis_client = redis.asyncio.from_url(REDIS_URL, decode_responses=True,
+                                             socket_connect_timeout=REDIS_SOCKET_CONNECT_TIMEOUT)
 
 def get_redis() -> redis.Redis:
     return redis_client
 
+def get_async_redis() -> redis.asyncio.Redis:
+    return async_redis_client
+
+def get_pubsub_redis() -> redis.asyncio.Redis:
+    return pubsub_redis_client
+
 def test_redis_connection() -> tuple[bool, str]:
     """Test Redis connection and return status with clear error message"""
     try:
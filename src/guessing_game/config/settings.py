@@ -15,6 +15,14 @@ VECTOR_DB_PATH = DATA_DIR / "character_vector_db"
 
 # Database URL
 DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{DATABASE_PATH}")
+# Same database through the aiosqlite driver, for the async routes
+ASYNC_DATABASE_URL = DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+
+# Read path: read-only connections with a large page cache and memory-mapped I/O
+SQLITE_READ_CACHE_KB = 65536  # 64 MiB page cache per read connection
+SQLITE_MMAP_SIZE = 268435456  # 256 MiB
+# Serve reads from in-memory copies of app.db instead of the file
+SQLITE_MEMORY_REPLICA = os.getenv("SQLITE_MEMORY_REPLICA", "False").lower() == "true"
 
 # Data files
 ARCS_JSON_PATH = STATIC_DATA_DIR / "arcs.json"
@@ -31,14 +39,39 @@ COLLECTION_METADATA = {"hnsw:space": "cosine"}
 
 # Redis settings
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+# Connection pool of each Redis client (sync and async, per process) - requests wait for a free connection at the limit
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", "5"))  # Seconds to wait for a free connection
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "5"))  # Seconds a command may wait for its reply
+REDIS_SOCKET_CONNECT_TIMEOUT = float(os.getenv("REDIS_SOCKET_CONNECT_TIMEOUT", "5"))
+REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30"))  # PING connections idle this long
+REDIS_RETRY_ON_TIMEOUT = os.getenv("REDIS_RETRY_ON_TIMEOUT", "True").lower() == "true"
+CATALOG_SYNC_RETRY_SECONDS = 5  # Wait before the catalog invalidation listener reconnects to Redis
 
 # Game settings
 GAME_TTL = 3600  # 1 hour TTL for games
+POOL_CACHE_SIZE = 256  # Number of distinct character pools kept pre-serialized
+CHARACTER_PAGE_SIZE_LIMIT = 1000  # Largest page /api/characters/until serves when paginating
+NAME_SEARCH_LIMIT = 10  # Default number of suggestions /api/characters/search returns
+NAME_SEARCH_MAX_LIMIT = 50
+BULK_UPDATE_LIMIT = 2000  # Most characters a single bulk rate/ignore request may change
+CHARACTER_PROFILE_CACHE_SIZE = 2048  # Character profiles kept rendered for the game prompt, per process
+# Format new game values are written in, "msgpack" or "json" - values in either format are always read
+GAME_SERIALIZER = os.getenv("GAME_SERIALIZER", "msgpack")
 
 # LLM settings
 LLM_PROVIDER = os.getenv("LLM_PROVIDER", "gemini")
 LLM_MODEL = os.getenv("LLM_MODEL", "gemini-2.5-flash")
 
+# Server settings
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "3000"))
+WEB_WORKERS = int(os.getenv("WEB_WORKERS", "1"))  # Worker processes of the production entry point
+# gunicorn only: load the embedding model, arcs and catalog in the master and fork the workers from it
+PREFORK_PRELOAD = os.getenv("PREFORK_PRELOAD", "True").lower() == "true"
+# Signs the session cookie, every worker and replica must use the same one
+SESSION_SECRET_KEY = os.getenv("SESSION_SECRET_KEY")
+
 # Environment
 DEBUG = os.getenv("DEBUG", "False").lower() == "true"
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
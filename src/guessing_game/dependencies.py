@@ -1,31 +1,35 @@
 # guessing_game/dependencies.py
-import redis
 from fastapi import Request
 
 from guessing_game.services.arc_service import ArcService
-from guessing_game.services.game_manager import GameManager
+from guessing_game.services.async_character_service import AsyncCharacterService
+from guessing_game.services.async_game_manager import AsyncGameManager
 from guessing_game.services.session_manager import SessionManager
 from guessing_game.services.character_service import CharacterService
 from guessing_game.services.llm_service import LLMService
+from guessing_game.services.pool_cache import PoolCache
 from guessing_game.services.prompt_service import PromptService
 
-def get_session_manager(request: Request) -> SessionManager:
-    return SessionManager(request)
+async def get_session_manager(request: Request) -> SessionManager:
+    return SessionManager(request, request.app.state.arc_service)
 
-def get_character_service(request: Request) -> CharacterService:
+async def get_character_service(request: Request) -> CharacterService:
     return request.app.state.repository
 
-def get_arc_service():
-    return ArcService()
+async def get_async_character_service(request: Request) -> AsyncCharacterService:
+    return request.app.state.async_repository
 
-def get_redis_client(request: Request) -> redis.Redis:
-    return request.app.state.redis_client
+async def get_arc_service(request: Request) -> ArcService:
+    return request.app.state.arc_service
 
-def get_game_manager() -> GameManager:
-    return GameManager()
+async def get_async_game_manager() -> AsyncGameManager:
+    return AsyncGameManager()
 
-def get_llm_service(request: Request) -> LLMService:
+async def get_llm_service(request: Request) -> LLMService:
     return request.app.state.llm
 
-def get_prompt_service() -> PromptService:
-    return PromptService()
\ No newline at end of file
+async def get_prompt_service() -> PromptService:
+    return PromptService()
+
+async def get_pool_cache(request: Request) -> PoolCache:
+    return request.app.state.pool_cache
\ No newline at end of file
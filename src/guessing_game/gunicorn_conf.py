@@ -0,0 +1,48 @@
+# guessing_game/gunicorn_conf.py
+"""
+Gunicorn settings for running the app on several uvicorn workers:
+    gunicorn -c python:guessing_game.gunicorn_conf guessing_game.app:app
+
+The app is imported once in the master and the workers are forked from it, so they share its already imported
+libraries copy-on-write instead of each importing them again. With PREFORK_PRELOAD the master also loads the embedding
+model, the arc timeline and the character catalog, which the workers then share the same way.
+"""
+import gc
+import os
+import secrets
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Every worker must accept the others' session cookies, so pin one key before the app is imported
+if not os.getenv("SESSION_SECRET_KEY"):
+    print("WARNING: SESSION_SECRET_KEY is not set, using a key generated for this run - sessions end on restart")
+    os.environ["SESSION_SECRET_KEY"] = secrets.token_urlsafe(32)
+
+from guessing_game.app import DATABASE_PREPARED_ENV, prepare_database, preload_shared_state
+from guessing_game.config.database import engine, dispose_read_engine
+from guessing_game.config.settings import HOST, PORT, WEB_WORKERS, PREFORK_PRELOAD
+
+bind = f"{HOST}:{PORT}"
+workers = WEB_WORKERS
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+timeout = 120  # A guess waits on the LLM
+
+
+def on_starting(server):
+    """Runs once in the master, after the app is imported and before the first worker is forked"""
+    if PREFORK_PRELOAD:
+        preload_shared_state()
+    else:
+        prepare_database()
+    # Inherited by every worker, their lifespan then skips the migrations and the exclusion update
+    os.environ[DATABASE_PREPARED_ENV] = "1"
+
+    # No worker may inherit an open SQLite handle
+    engine.dispose()
+    dispose_read_engine()
+    # Park everything loaded so far in the permanent generation, so garbage collections in the workers don't write to
+    # (and so un-share) these pages
+    gc.freeze()
@@ -0,0 +1,69 @@
+import re
+
+from sqlalchemy import inspect, text
+
+# FTS5 index over every name a character goes by. It is derived from the characters table and rebuilt on startup
+# when it no longer matches it
+CHARACTER_SEARCH_TABLE = "character_search"
+
+# bm25 column weights: character_id (not indexed), name, alias, epithet
+SEARCH_RANKING = "bm25(character_search, 0.0, 10.0, 4.0, 2.0)"
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def create_character_search_table(connection) -> bool:
+    """Create the index table if it is missing, returns True when it was created"""
+    if inspect(connection).has_table(CHARACTER_SEARCH_TABLE):
+        return False
+    # prefix= keeps separate indexes for short prefixes, which are what autocomplete queries while typing
+    connection.execute(text(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {CHARACTER_SEARCH_TABLE} USING fts5(
+            character_id UNINDEXED, name, alias, epithet,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3 4'
+        )
+    """))
+    return True
+
+
+def character_search_is_current(connection) -> bool:
+    """Whether the index holds exactly the names of the characters table, checked without writing anything"""
+    indexed = connection.execute(text(f"SELECT COUNT(*) FROM {CHARACTER_SEARCH_TABLE}")).scalar()
+    if indexed != connection.execute(text("SELECT COUNT(*) FROM characters")).scalar():
+        return False
+    changed = connection.execute(text(f"""
+        SELECT 1 FROM (
+            SELECT id, name, COALESCE(alias, ''), COALESCE(epithet, '') FROM characters
+            EXCEPT
+            SELECT character_id, name, alias, epithet FROM {CHARACTER_SEARCH_TABLE}
+        ) LIMIT 1
+    """)).first()
+    return changed is None
+
+
+def rebuild_character_search(connection):
+    """Re-index every character from the characters table"""
+    connection.execute(text(f"DELETE FROM {CHARACTER_SEARCH_TABLE}"))
+    connection.execute(text(f"""
+        INSERT INTO {CHARACTER_SEARCH_TABLE} (character_id, name, alias, epithet)
+        SELECT id, name, COALESCE(alias, ''), COALESCE(epithet, '') FROM characters
+    """))
+
+
+def match_expression(query: str) -> str | None:
+    """
+    FTS5 MATCH expression where every typed word must prefix a word of the name, alias or epithet.
+    None when the query has no words
+    """
+    words = _WORD_PATTERN.findall(query.lower())
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+search_statement = text(f"""
+    SELECT character_id FROM {CHARACTER_SEARCH_TABLE}
+    WHERE {CHARACTER_SEARCH_TABLE} MATCH :match
+    ORDER BY {SEARCH_RANKING}
+""")
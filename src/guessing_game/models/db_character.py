@@ -1,6 +1,5 @@
-from sqlalchemy import String, Integer, Boolean, Text, Enum, func, case
+from sqlalchemy import String, Integer, Boolean, Text, Enum, Index, Update, func, update
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy.ext.hybrid import hybrid_property
 import enum
 
 from guessing_game.models.base import Base
@@ -18,17 +17,27 @@ class DifficultyEnum(enum.Enum):
 
 class DBCharacter(Base):
     __tablename__ = 'characters'
+    __table_args__ = (
+        # Serves the pool filters: equality on status/difficulty/ignored, then the arc range columns
+        Index('ix_characters_pool', 'normalized_filler_status', 'difficulty', 'is_ignored', 'chapter',
+              'effective_episode'),
+    )
 
     id: Mapped[str] = mapped_column(String(50), primary_key=True)
     name: Mapped[str] = mapped_column(String(200))
     filler_status: Mapped[str] = mapped_column(String(20))
+    normalized_filler_status: Mapped[str] = mapped_column(String(20), default="", nullable=False)
     wiki_link: Mapped[str] = mapped_column(String(200))
     chapter: Mapped[int | None] = mapped_column(Integer)
     episode: Mapped[int | None] = mapped_column(Integer)
     number: Mapped[int | None] = mapped_column(Integer)
+    effective_episode: Mapped[int | None] = mapped_column(Integer, nullable=True)
     description: Mapped[str] = mapped_column(Text, default="", nullable=False)
     fun_fact: Mapped[str] = mapped_column(Text, default="", nullable=False)
     affiliations: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Other names from the wiki infobox, indexed together with the name for name search
+    alias: Mapped[str | None] = mapped_column(Text, nullable=True)
+    epithet: Mapped[str | None] = mapped_column(Text, nullable=True)
     year: Mapped[int] = mapped_column(Integer)
     note: Mapped[str | None] = mapped_column(String(200))
     appears_in: Mapped[str | None] = mapped_column(String(50))
@@ -40,31 +49,34 @@ class DBCharacter(Base):
         nullable=False
     )
     is_ignored: Mapped[bool] = mapped_column(Boolean, default=False)
+    # Anti-spoiler exclusions, synced from static_data/excluded_characters.txt
+    is_excluded: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False, index=True)
 
-    @hybrid_property
-    def effective_episode(self):
-        """Get the effective episode number (higher of episode or number) - Python version"""
-        if self.episode is None and self.number is None:
+    @staticmethod
+    def compute_effective_episode(episode: int | None, number: int | None) -> int | None:
+        """Get the effective episode number (higher of episode or number)"""
+        if episode is None and number is None:
             return None
-        if self.episode is None:
-            return self.number
-        if self.number is None:
-            return self.episode
-        return max(self.episode, self.number)
+        if episode is None:
+            return number
+        if number is None:
+            return episode
+        return max(episode, number)
 
-    @effective_episode.expression
-    def effective_episode(cls):
-        """SQL expression for effective episode - Using func.max"""
-        return case(
-            # Both null
-            ((cls.episode.is_(None)) & (cls.number.is_(None)), None),
-            # Episode is null, use number
-            (cls.episode.is_(None), cls.number),
-            # Number is null, use episode
-            (cls.number.is_(None), cls.episode),
-            # Both exist - use MAX function
-            else_=func.max(cls.episode, cls.number)
-        )
+    @staticmethod
+    def normalize_filler_status(filler_status: str | None) -> str:
+        return (filler_status or "").strip().lower()
+
+    @staticmethod
+    def exclusion_update(excluded_ids: list[str]) -> Update:
+        """UPDATE statement that sets is_excluded on exactly the given IDs (case-insensitive)"""
+        excluded_ids_lower = [char_id.lower() for char_id in excluded_ids]
+        return update(DBCharacter).values(is_excluded=func.lower(DBCharacter.id).in_(excluded_ids_lower))
+
+    def refresh_derived_columns(self):
+        """Recompute the materialized columns from their source fields"""
+        self.effective_episode = self.compute_effective_episode(self.episode, self.number)
+        self.normalized_filler_status = self.normalize_filler_status(self.filler_status)
 
     def __repr__(self):
         return f"<Character(id='{self.id}', name='{self.name}', type='{self.filler_status}')>"
@@ -117,5 +129,5 @@ class DBCharacter(Base):
         )
 
     def get_character_episode(self) -> int | None:
-        """Get the effective episode number - now just delegates to effective_episode property"""
+        """Get the effective episode number - now just delegates to the effective_episode column"""
         return self.effective_episode
@@ -1,32 +1,122 @@
 # server/routes/characters.py
-from fastapi import APIRouter, Depends, HTTPException
+import base64
+import binascii
+from typing import Iterator, Literal
 
-from guessing_game.services.character_service import CharacterService
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from guessing_game.config.settings import CHARACTER_PAGE_SIZE_LIMIT, NAME_SEARCH_LIMIT, NAME_SEARCH_MAX_LIMIT
+from guessing_game.services.character_catalog import CATALOG_FIELDS
+from guessing_game.services.async_character_service import AsyncCharacterService
+from guessing_game.services.serialization import dumps
 from guessing_game.services.session_manager import SessionManager
-from guessing_game.dependencies import get_session_manager, get_character_service
+from guessing_game.dependencies import get_session_manager, get_async_character_service
 from guessing_game.schemas.character_schemas import CharactersResponse, ToggleIgnoreRequest, ToggleIgnoreResponse, \
-    RateCharacterRequest, RateCharacterResponse
+    RateCharacterRequest, RateCharacterResponse, ReloadExclusionsResponse, CharacterSearchResponse, BulkIgnoreRequest, \
+    BulkIgnoreResponse, BulkRateRequest, BulkRateResponse
 
 router = APIRouter(prefix="/api/characters", tags=["characters"])
 
+NDJSON_CHUNK_ROWS = 200
+
+
+def _parse_fields(fields: str | None) -> list[str]:
+    if fields is None:
+        return list(CATALOG_FIELDS)
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in CATALOG_FIELDS]
+    if unknown or not requested:
+        raise HTTPException(status_code=400,
+                            detail=f"Invalid fields {unknown}, choose from: {', '.join(CATALOG_FIELDS)}")
+    return requested
+
+
+def _encode_cursor(character_id: str) -> str:
+    return base64.urlsafe_b64encode(character_id.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> str:
+    try:
+        return base64.urlsafe_b64decode(cursor.encode()).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _ndjson_lines(rows: Iterator[dict]) -> Iterator[bytes]:
+    """Encode rows as NDJSON, flushing a chunk every NDJSON_CHUNK_ROWS rows"""
+    chunk = []
+    for row in rows:
+        chunk.append(dumps(row))
+        if len(chunk) >= NDJSON_CHUNK_ROWS:
+            yield b"\n".join(chunk) + b"\n"
+            chunk = []
+    if chunk:
+        yield b"\n".join(chunk) + b"\n"
+
+
+def _encode_page(rows: Iterator[dict], arc_name: str, catalog_version: str, next_cursor: str | None) -> bytes:
+    characters = list(rows)
+    return dumps({
+        "characters": characters,
+        "count": len(characters),
+        "arc": arc_name,
+        "catalogVersion": catalog_version,
+        "nextCursor": next_cursor,
+    })
+
+
 @router.get("/until", response_model=CharactersResponse)
-def get_characters_until(session_mgr: SessionManager = Depends(get_session_manager),
-                         character_service: CharacterService = Depends(get_character_service)):
+async def get_characters_until(fields: str | None = Query(None, description="Comma separated fields, e.g. id,name,difficulty"),
+                               cursor: str | None = Query(None, description="nextCursor of the previous page"),
+                               limit: int | None = Query(None, ge=1, le=CHARACTER_PAGE_SIZE_LIMIT),
+                               response_format: Literal["json", "ndjson"] = Query("json", alias="format"),
+                               session_mgr: SessionManager = Depends(get_session_manager),
+                               character_service: AsyncCharacterService = Depends(get_async_character_service)):
     arc = session_mgr.get_global_arc_limit()
     try:
-        characters = character_service.get_characters_until(arc, include_ignored=True)
-        return CharactersResponse(
-            characters=characters,
-            count=len(characters),
-            arc=arc.name
+        catalog_version = character_service.get_catalog_version(arc)
+
+        # Rows are built straight from the catalog columns and encoded in bulk, the CharactersResponse
+        # model is only used for documentation. Masking a whole arc is CPU work, so it stays off the event loop
+        rows, next_after_id = await run_in_threadpool(
+            character_service.get_character_rows,
+            arc, _parse_fields(fields),
+            after_id=_decode_cursor(cursor) if cursor is not None else None,
+            limit=limit,
+            include_ignored=True
         )
+        next_cursor = _encode_cursor(next_after_id) if next_after_id is not None else None
+
+        if response_format == "ndjson":
+            headers = {"X-Arc": arc.name, "X-Catalog-Version": catalog_version}
+            if next_cursor is not None:
+                headers["X-Next-Cursor"] = next_cursor
+            # A sync iterator, so the rows are produced and encoded in the threadpool as well
+            return StreamingResponse(_ndjson_lines(rows), media_type="application/x-ndjson", headers=headers)
+
+        content = await run_in_threadpool(_encode_page, rows, arc.name, catalog_version, next_cursor)
+        return Response(content=content, media_type="application/json")
+
     except ValueError as e:
-        raise HTTPException(status_code=404, detail="Characters not found")
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/search", response_model=CharacterSearchResponse)
+async def search_characters(q: str = Query(..., min_length=1, description="Beginning of a name, alias or epithet"),
+                            limit: int = Query(NAME_SEARCH_LIMIT, ge=1, le=NAME_SEARCH_MAX_LIMIT),
+                            session_mgr: SessionManager = Depends(get_session_manager),
+                            character_service: AsyncCharacterService = Depends(get_async_character_service)):
+    """Autocomplete for the guess box, limited to the characters the session may see"""
+    arc = session_mgr.get_global_arc_limit()
+    characters = await character_service.search_characters(q, arc, limit)
+    return CharacterSearchResponse(query=q, characters=characters, count=len(characters))
+
 
 @router.post("/toggle-ignore")
-def toggle_ignore_character(request: ToggleIgnoreRequest, character_service: CharacterService = Depends(get_character_service)):
+async def toggle_ignore_character(request: ToggleIgnoreRequest, character_service: AsyncCharacterService = Depends(get_async_character_service)):
     try:
-        character = character_service.toggle_character_ignore(request.character_id)
+        character = await character_service.toggle_character_ignore(request.character_id)
         return ToggleIgnoreResponse(
             success=True,
             characterId=character.id,
@@ -36,9 +126,9 @@ def toggle_ignore_character(request: ToggleIgnoreRequest, character_service: Cha
         raise HTTPException(status_code=404, detail=str(e))
 
 @router.post("/rate-character")
-def rate_character(request: RateCharacterRequest, character_service: CharacterService = Depends(get_character_service)):
+async def rate_character(request: RateCharacterRequest, character_service: AsyncCharacterService = Depends(get_async_character_service)):
     try:
-        character = character_service.update_character_difficulty(request.character_id, request.difficulty)
+        character = await character_service.update_character_difficulty(request.character_id, request.difficulty)
 
         return RateCharacterResponse(
             success=True,
@@ -47,4 +137,47 @@ def rate_character(request: RateCharacterRequest, character_service: CharacterSe
         )
 
     except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/bulk-ignore", response_model=BulkIgnoreResponse)
+async def bulk_ignore_characters(request: BulkIgnoreRequest, character_service: AsyncCharacterService = Depends(get_async_character_service)):
+    """Set the ignore flag of many characters at once. Nothing is written unless every entry is valid"""
+    try:
+        characters = await character_service.set_characters_ignored(
+            [(flag.character_id, flag.is_ignored) for flag in request.characters]
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return BulkIgnoreResponse(
+        success=True,
+        updatedCount=len(characters),
+        characters=[ToggleIgnoreResponse(success=True, characterId=character.id, isIgnored=character.is_ignored)
+                    for character in characters]
+    )
+
+@router.post("/bulk-rate", response_model=BulkRateResponse)
+async def bulk_rate_characters(request: BulkRateRequest, character_service: AsyncCharacterService = Depends(get_async_character_service)):
+    """Rate many characters at once. Nothing is written unless every entry is valid"""
+    try:
+        characters = await character_service.update_character_difficulties(
+            [(rating.character_id, rating.difficulty) for rating in request.characters]
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return BulkRateResponse(
+        success=True,
+        updatedCount=len(characters),
+        characters=[RateCharacterResponse(success=True, characterId=character.id, difficulty=character.difficulty)
+                    for character in characters]
+    )
+
+@router.post("/reload-exclusions", response_model=ReloadExclusionsResponse)
+async def reload_exclusions(character_service: AsyncCharacterService = Depends(get_async_character_service)):
+    """Re-apply static_data/excluded_characters.txt without restarting the server"""
+    try:
+        excluded_ids = await character_service.reload_excluded_characters()
+        return ReloadExclusionsResponse(success=True, excludedCount=len(excluded_ids))
+    except OSError as e:
+        raise HTTPException(status_code=500, detail=f"Could not read exclusion list: {e}")
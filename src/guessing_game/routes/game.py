@@ -1,15 +1,19 @@
 # server/routes/game.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Header, Response
+from fastapi.concurrency import run_in_threadpool
 
 from guessing_game.services import game_service
 from guessing_game.services.arc_service import ArcService
+from guessing_game.services.async_character_service import AsyncCharacterService
 from guessing_game.services.character_service import CharacterService
 from guessing_game.services.session_manager import SessionManager
-from guessing_game.services.game_manager import GameManager
+from guessing_game.services.async_game_manager import AsyncGameManager
+from guessing_game.services.game_manager import GameSnapshot
 from guessing_game.services.llm_service import LLMService
 from guessing_game.services.prompt_service import PromptService
-from guessing_game.dependencies import get_session_manager, get_character_service, get_llm_service, get_game_manager, \
-    get_arc_service, get_prompt_service
+from guessing_game.services.pool_cache import PoolCache, etag_matches
+from guessing_game.dependencies import get_session_manager, get_character_service, get_llm_service, \
+    get_async_game_manager, get_arc_service, get_prompt_service, get_pool_cache, get_async_character_service
 from guessing_game.schemas.game_schemas import (
     GameStartResponse, GameStartRequest,
     GameQuestionResponse, GameQuestionRequest,
@@ -20,31 +24,59 @@ from guessing_game.schemas.game_schemas import (
 
 router = APIRouter(prefix="/api/game", tags=["game"])
 
-def validate_game_session(session_mgr: SessionManager, game_mgr: GameManager, game_id: str):
-    """Helper function to validate game session across both managers"""
+async def validate_game_session(session_mgr: SessionManager, game_mgr: AsyncGameManager, game_id: str,
+                                with_chat: bool = False) -> GameSnapshot:
+    """
+    Helper function to validate game session across both managers.
+    Returns the game, loaded once for the whole request (with its LLM chat history if with_chat)
+    """
     if not session_mgr.has_active_game():
         raise HTTPException(status_code=400, detail="No active game session")
 
     if not session_mgr.is_valid_game_session(game_id):
         raise HTTPException(status_code=400, detail="Game ID mismatch with session")
 
-    if not game_mgr.game_exists(game_id):
+    game = await game_mgr.load_snapshot(game_id, with_chat)
+    if game is None:
         raise HTTPException(status_code=400, detail="Game data not found")
+    return game
 
-@router.post("/start", response_model=GameStartResponse)
-def start_game_route(request: GameStartRequest,
-                     session_mgr: SessionManager = Depends(get_session_manager),
-                     game_mgr: GameManager = Depends(get_game_manager),
-                     character_service: CharacterService = Depends(get_character_service),
-                     arc_service: ArcService = Depends(get_arc_service),
-                     prompt_service: PromptService = Depends(get_prompt_service)):
+@router.post("/start", response_model=GameStartResponse,
+             responses={304: {"description": "Character pool unchanged, game ID is in the X-Game-Id header"}})
+async def start_game_route(request: GameStartRequest,
+                           if_none_match: str | None = Header(None),
+                           session_mgr: SessionManager = Depends(get_session_manager),
+                           game_mgr: AsyncGameManager = Depends(get_async_game_manager),
+                           character_service: CharacterService = Depends(get_character_service),
+                           arc_service: ArcService = Depends(get_arc_service),
+                           prompt_service: PromptService = Depends(get_prompt_service),
+                           pool_cache: PoolCache = Depends(get_pool_cache)):
     try:
-        character_pool = game_service.start_game(request, session_mgr, game_mgr, character_service, arc_service, prompt_service)
+        pool = await game_service.start_game(request, session_mgr, game_mgr, character_service, arc_service,
+                                             prompt_service, pool_cache)
+        game_id = session_mgr.get_current_game_id()
+
+        fragment, etag = None, pool.etag
+        if request.pool_format != "full":
+            arc_limit = session_mgr.get_global_arc_limit()
+            # Masks the whole arc and encodes the IDs on a cache miss, so not on the event loop
+            fragment, etag = await run_in_threadpool(
+                pool.compact_payload,
+                request.pool_format,
+                character_service.get_catalog_version(arc_limit),
+                lambda: [char.id for char in character_service.get_characters_until(arc_limit, include_ignored=True)]
+            )
+
+        headers = {"ETag": etag, "X-Game-Id": game_id}
 
-        return GameStartResponse(
-            message="Game started successfully",
-            gameId=session_mgr.get_current_game_id(),
-            characterPool=character_pool
+        # The game is started either way, the client just keeps its cached pool
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+
+        return Response(
+            content=pool.render_start_response("Game started successfully", game_id, fragment),
+            media_type="application/json",
+            headers=headers
         )
 
     except ValueError as e:
@@ -53,13 +85,13 @@ def start_game_route(request: GameStartRequest,
         raise HTTPException(status_code=500, detail="Service temporarily unavailable")
 
 @router.post("/validate", response_model=GameStatusResponse)
-def validate_game_session_route(request: GameStatusRequest,
-                                session_mgr: SessionManager = Depends(get_session_manager),
-                                game_mgr: GameManager = Depends(get_game_manager)):
+async def validate_game_session_route(request: GameStatusRequest,
+                                      session_mgr: SessionManager = Depends(get_session_manager),
+                                      game_mgr: AsyncGameManager = Depends(get_async_game_manager)):
     """Validate if game session is still active and return messages"""
     try:
-        validate_game_session(session_mgr, game_mgr, request.game_id)
-        all_messages = game_mgr.get_chat_messages(request.game_id)
+        await validate_game_session(session_mgr, game_mgr, request.game_id)
+        all_messages = await game_mgr.get_chat_messages(request.game_id)
 
         chat_messages = [ChatMessage(id=msg["id"], text=msg["text"], isUser=msg["is_user"]) for msg in all_messages]
 
@@ -68,15 +100,18 @@ def validate_game_session_route(request: GameStatusRequest,
         return GameStatusResponse(isValidGame=False)
 
 @router.post("/question", response_model=GameQuestionResponse)
-def ask_question_route(request: GameQuestionRequest,
-                       session_mgr: SessionManager = Depends(get_session_manager),
-                       game_mgr: GameManager = Depends(get_game_manager),
-                       llm_service: LLMService = Depends(get_llm_service),
-                       prompt_service: PromptService = Depends(get_prompt_service)):
+async def ask_question_route(request: GameQuestionRequest,
+                             session_mgr: SessionManager = Depends(get_session_manager),
+                             game_mgr: AsyncGameManager = Depends(get_async_game_manager),
+                             character_service: AsyncCharacterService = Depends(get_async_character_service),
+                             arc_service: ArcService = Depends(get_arc_service),
+                             llm_service: LLMService = Depends(get_llm_service),
+                             prompt_service: PromptService = Depends(get_prompt_service)):
     try:
-        validate_game_session(session_mgr, game_mgr, request.game_id)
+        game = await validate_game_session(session_mgr, game_mgr, request.game_id, with_chat=True)
 
-        answer = game_service.ask_question(request.question, session_mgr, game_mgr, llm_service, prompt_service)
+        answer = await game_service.ask_question(request.question, game, session_mgr, game_mgr, character_service,
+                                                 arc_service, llm_service, prompt_service)
 
         return GameQuestionResponse(
             answer=answer,
@@ -88,13 +123,15 @@ def ask_question_route(request: GameQuestionRequest,
         raise HTTPException(status_code=500, detail="Service temporarily unavailable")
 
 @router.post("/guess", response_model=GameGuessResponse)
-def make_guess_route(request: GameGuessRequest,
-                     session_mgr: SessionManager = Depends(get_session_manager),
-                     game_mgr: GameManager = Depends(get_game_manager)):
+async def make_guess_route(request: GameGuessRequest,
+                           session_mgr: SessionManager = Depends(get_session_manager),
+                           game_mgr: AsyncGameManager = Depends(get_async_game_manager),
+                           character_service: AsyncCharacterService = Depends(get_async_character_service)):
     try:
-        validate_game_session(session_mgr, game_mgr, request.game_id)
+        game = await validate_game_session(session_mgr, game_mgr, request.game_id)
 
-        result = game_service.make_guess(request.character_name, session_mgr, game_mgr)
+        result = await game_service.make_guess(request.character_name, game, session_mgr, game_mgr,
+                                               character_service)
 
         if result["is_correct"]:
             return GameGuessResponse(
@@ -114,13 +151,14 @@ def make_guess_route(request: GameGuessRequest,
         raise HTTPException(status_code=500, detail="Service temporarily unavailable")
 
 @router.post("/reveal", response_model=GameRevealResponse)
-def reveal_character_route(request: GameRevealRequest,
-                           session_mgr: SessionManager = Depends(get_session_manager),
-                           game_mgr: GameManager = Depends(get_game_manager)):
+async def reveal_character_route(request: GameRevealRequest,
+                                 session_mgr: SessionManager = Depends(get_session_manager),
+                                 game_mgr: AsyncGameManager = Depends(get_async_game_manager),
+                                 character_service: AsyncCharacterService = Depends(get_async_character_service)):
     try:
-        validate_game_session(session_mgr, game_mgr, request.game_id)
+        game = await validate_game_session(session_mgr, game_mgr, request.game_id)
 
-        result = game_service.reveal_character(session_mgr, game_mgr)
+        result = await game_service.reveal_character(game, session_mgr, game_mgr, character_service)
 
         return GameRevealResponse(
             character=result["character"],
@@ -11,8 +11,8 @@ router = APIRouter(prefix="/api/session", tags=["session"])
 
 
 @router.post("/", response_model=SessionResponse)
-def get_session_data(request: dict, session_mgr: SessionManager = Depends(get_session_manager),
-                     arc_service: ArcService = Depends(get_arc_service)):
+async def get_session_data(request: dict, session_mgr: SessionManager = Depends(get_session_manager),
+                           arc_service: ArcService = Depends(get_arc_service)):
     arc_limit = request.get("arcLimit")
 
     # Ensure session exists (create if needed)
@@ -21,7 +21,7 @@ def get_session_data(request: dict, session_mgr: SessionManager = Depends(get_se
 
     session_mgr.update_last_activity()
 
-    all_arcs = arc_service.get_arcs_until(arc_service.get_arc_by_name("All"))
+    all_arcs = arc_service.get_all_arcs()
 
     return SessionResponse(
         message="API is running",
@@ -31,8 +31,8 @@ def get_session_data(request: dict, session_mgr: SessionManager = Depends(get_se
 
 
 @router.post("/update-arc-limit", response_model=UpdateArcLimitResponse)
-def update_arc_limit(request: UpdateArcLimitRequest, session_mgr: SessionManager = Depends(get_session_manager),
-                     arc_service: ArcService = Depends(get_arc_service)):
+async def update_arc_limit(request: UpdateArcLimitRequest, session_mgr: SessionManager = Depends(get_session_manager),
+                           arc_service: ArcService = Depends(get_arc_service)):
     try:
         # Ensure session exists (create if needed)
         if not session_mgr.has_session_data():
@@ -40,7 +40,7 @@ def update_arc_limit(request: UpdateArcLimitRequest, session_mgr: SessionManager
 
         session_mgr.set_global_arc_limit(request.arc_limit)
 
-        all_arcs = arc_service.get_arcs_until(arc_service.get_arc_by_name("All"))
+        all_arcs = arc_service.get_all_arcs()
 
         return UpdateArcLimitResponse(
             success=True,
@@ -5,3 +5,7 @@ class Arc(BaseModel):
    name: str
    chapter: int | None = None
    episode: int | None = None
+
+   class Config:
+      # Arcs are shared by the app-wide timeline
+      frozen = True
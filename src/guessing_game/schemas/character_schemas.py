@@ -29,6 +29,18 @@ class CharactersResponse(BaseModel):
     characters: list[BasicCharacter]
     count: int | None = None
     arc: str | None = None
+    catalog_version: str | None = Field(None, alias="catalogVersion")
+    # Only set when paginating
+    next_cursor: str | None = Field(None, alias="nextCursor")
+
+    class Config:
+        populate_by_name = True
+
+class CharacterSearchResponse(BaseModel):
+    query: str
+    characters: list[BasicCharacter]
+    count: int
+
 
 class ToggleIgnoreRequest(BaseModel):
     character_id: str = Field(alias="characterId")
@@ -53,4 +65,46 @@ class RateCharacterResponse(BaseModel):
     difficulty: str
 
     class Config:
-        populate_by_name = True
\ No newline at end of file
+        populate_by_name = True
+
+
+class IgnoreFlag(BaseModel):
+    character_id: str = Field(alias="characterId")
+    is_ignored: bool = Field(alias="isIgnored")
+
+    class Config:
+        populate_by_name = True
+
+
+class BulkIgnoreRequest(BaseModel):
+    characters: list[IgnoreFlag] = Field(min_length=1)
+
+
+class BulkIgnoreResponse(BaseModel):
+    success: bool
+    updated_count: int = Field(alias="updatedCount")
+    characters: list[ToggleIgnoreResponse]
+
+    class Config:
+        populate_by_name = True
+
+
+class BulkRateRequest(BaseModel):
+    characters: list[RateCharacterRequest] = Field(min_length=1)
+
+
+class BulkRateResponse(BaseModel):
+    success: bool
+    updated_count: int = Field(alias="updatedCount")
+    characters: list[RateCharacterResponse]
+
+    class Config:
+        populate_by_name = True
+
+
+class ReloadExclusionsResponse(BaseModel):
+    success: bool
+    excluded_count: int = Field(alias="excludedCount")
+
+    class Config:
+        populate_by_name = True
@@ -1,4 +1,6 @@
 # server/schemas/game_schemas.py
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
 from guessing_game.schemas.character_schemas import FullCharacter, BasicCharacter
@@ -10,6 +12,8 @@ class GameStartRequest(BaseModel):
     include_non_tv_fillers: bool = Field(alias="includeNonTVFillers")
     difficulty_level: str = Field(alias="difficultyLevel")
     include_unrated: bool = Field(alias="includeUnrated")
+    # "full" sends every BasicCharacter, "ids"/"bitmap" reference the client's cached /api/characters/until catalog
+    pool_format: Literal["full", "ids", "bitmap"] = Field("full", alias="poolFormat")
 
     class Config:
         populate_by_name = True
@@ -18,7 +22,12 @@ class GameStartRequest(BaseModel):
 class GameStartResponse(BaseModel):
     message: str
     game_id: str = Field(alias="gameId")
-    character_pool: list[BasicCharacter] = Field(alias="characterPool")
+    character_pool: list[BasicCharacter] | None = Field(None, alias="characterPool")
+    # Compact pool formats only
+    pool_format: str | None = Field(None, alias="poolFormat")
+    catalog_version: str | None = Field(None, alias="catalogVersion")
+    character_ids: list[str] | None = Field(None, alias="characterIds")
+    character_bitmap: str | None = Field(None, alias="characterBitmap")
 
     class Config:
         populate_by_name = True
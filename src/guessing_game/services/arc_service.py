@@ -1,40 +1,101 @@
 # server/services/arc_service.py
-from guessing_game.config.database import get_db_session
+from types import MappingProxyType
+
+from sqlalchemy import select
+
+from guessing_game.config.database import get_async_read_session, get_read_session
 from guessing_game.models.db_arc import DBArc
 from guessing_game.schemas.arc_schemas import Arc
 
+ALL_ARCS = Arc(name="All", chapter=None, episode=None)
+
+
 class ArcService:
+    """
+    Immutable arc timeline, loaded once from the arcs table.
+
+    Lookups by name, the arcs until each arc, the forbidden arcs after it and the prompt's spoiler string are all
+    precomputed, so none of the methods touch the database. Create one per process and share it.
+    """
+
+    def __init__(self, arcs: list[Arc] | None = None):
+        timeline = tuple(arcs) if arcs is not None else self._load_arcs()
+        self._timeline = timeline
+        self._by_name = MappingProxyType({arc.name: arc for arc in timeline})
+        self._order = MappingProxyType({arc.name: i for i, arc in enumerate(timeline)})
+
+        self._arcs_until = MappingProxyType({arc.name: self._compute_arcs_until(arc) for arc in timeline})
+        self._forbidden = MappingProxyType({arc.name: self._compute_forbidden(self._arcs_until[arc.name])
+                                            for arc in timeline})
+        self._spoiler_names = MappingProxyType({name: self._compute_spoiler_names(forbidden)
+                                                for name, forbidden in self._forbidden.items()})
+
+    @staticmethod
+    def _load_arcs() -> tuple[Arc, ...]:
+        with get_read_session() as session:
+            arc_list = session.query(DBArc).order_by(DBArc.last_chapter, DBArc.last_episode).all()
+            return tuple(db_arc.to_pydantic() for db_arc in arc_list)
+
+    @classmethod
+    async def load_async(cls) -> 'ArcService':
+        """Build the timeline through the async engine"""
+        async with get_async_read_session() as session:
+            arc_list = await session.scalars(select(DBArc).order_by(DBArc.last_chapter, DBArc.last_episode))
+            return cls([db_arc.to_pydantic() for db_arc in arc_list])
+
+    def _compute_arcs_until(self, arc: Arc) -> tuple[Arc, ...]:
+        # Same semantics as the SQL filter: an arc with a missing bound never passes that bound's comparison
+        return tuple(
+            candidate for candidate in self._timeline
+            if (arc.chapter is None or (candidate.chapter is not None and candidate.chapter <= arc.chapter))
+            and (arc.episode is None or (candidate.episode is not None and candidate.episode <= arc.episode))
+        )
+
+    def _compute_forbidden(self, arcs_until: tuple[Arc, ...]) -> tuple[Arc, ...]:
+        allowed_arc_names = {arc.name for arc in arcs_until}
+        return tuple(arc for arc in self._timeline if arc.name not in allowed_arc_names)
+
+    @staticmethod
+    def _compute_spoiler_names(forbidden_arcs: tuple[Arc, ...]) -> str | None:
+        if not forbidden_arcs:
+            return None
+        return ", ".join(arc.name for arc in forbidden_arcs) + " and anything after"
+
     def get_arc_by_name(self, arc_name: str) -> Arc:
         if arc_name == "All":
-            return Arc(name="All", chapter=None, episode=None)
+            return ALL_ARCS
+
+        arc = self._by_name.get(arc_name)
+        if arc is None:
+            raise ValueError(f"Unknown arc '{arc_name}'")
+        return arc
 
-        with get_db_session() as session:
-            db_arc = session.query(DBArc).filter(DBArc.name == arc_name).first()
-            return db_arc.to_pydantic()
+    def get_arc_index(self, arc_name: str) -> int | None:
+        """Position of the arc in the timeline"""
+        return self._order.get(arc_name)
 
     def get_all_arcs(self) -> list[Arc]:
-        with get_db_session() as session:
-            arc_list = session.query(DBArc).order_by(DBArc.last_chapter, DBArc.last_episode).all()
-            return [db_arc.to_pydantic() for db_arc in arc_list]
+        return list(self._timeline)
 
     def get_arcs_until(self, arc: Arc) -> list[Arc]:
-        with get_db_session() as session:
-            if arc.name == "All":
-                arc_list = session.query(DBArc).all()
-            else:
-                query = session.query(DBArc)
-                if arc.chapter is not None:
-                    query = query.filter(DBArc.last_chapter <= arc.chapter)
-                if arc.episode is not None:
-                    query = query.filter(DBArc.last_episode <= arc.episode)
-                arc_list = query.all()
-            return [db_arc.to_pydantic() for db_arc in arc_list]
+        if arc.name == "All":
+            return list(self._timeline)
+
+        if self._by_name.get(arc.name) == arc:
+            return list(self._arcs_until[arc.name])
+        return list(self._compute_arcs_until(arc))
 
     def get_forbidden_arcs(self, global_arc_limit: Arc) -> list[Arc]:
         """Get arcs that come after the global arc limit (forbidden/spoiler arcs)"""
-        arcs_until = self.get_arcs_until(global_arc_limit)
-        all_arcs = self.get_all_arcs()
-        allowed_arc_names = {arc.name for arc in arcs_until}
-        
-        # Return forbidden arcs as objects (arcs that come after the limit)
-        return [arc for arc in all_arcs if arc.name not in allowed_arc_names]
\ No newline at end of file
+        if global_arc_limit.name == "All":
+            return []
+
+        if self._by_name.get(global_arc_limit.name) == global_arc_limit:
+            return list(self._forbidden[global_arc_limit.name])
+        return list(self._compute_forbidden(self._compute_arcs_until(global_arc_limit)))
+
+    def get_spoiler_arc_names(self, global_arc_limit: Arc) -> str | None:
+        """The forbidden arcs as written into the game prompt, None when nothing is forbidden"""
+        if self._by_name.get(global_arc_limit.name) == global_arc_limit:
+            return self._spoiler_names[global_arc_limit.name]
+        return self._compute_spoiler_names(tuple(self.get_forbidden_arcs(global_arc_limit)))
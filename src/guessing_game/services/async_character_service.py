@@ -0,0 +1,164 @@
+# server/services/async_character_service.py
+import asyncio
+from typing import Callable, Iterator
+
+from sqlalchemy import select, update
+
+from guessing_game.config.database import get_async_db_session, get_async_read_session, refresh_read_replica_async
+from guessing_game.config.exclusions import load_excluded_character_ids
+from guessing_game.models.character_search import match_expression, search_statement
+from guessing_game.models.db_character import DBCharacter
+from guessing_game.schemas.arc_schemas import Arc
+from guessing_game.schemas.character_schemas import BasicCharacter, FullCharacter
+from guessing_game.services.character_catalog import CharacterCatalog
+from guessing_game.services.character_service import CharacterService, DIFFICULTY_LEVELS
+
+
+class AsyncCharacterService:
+    """
+    Character queries and curation for the async routes, on top of the catalog of a CharacterService.
+
+    Shares the catalog of the sync service it wraps, so both always see the same snapshot. Catalog reads are
+    in-memory and stay sync, queries and writes go through the async engine - this is the only implementation of
+    the curation writes and the name lookups. Catalog updates after a write run the sync service in a worker thread,
+    since they may reload the whole catalog.
+    """
+
+    def __init__(self, character_service: CharacterService):
+        self.character_service = character_service
+
+    @property
+    def catalog(self) -> CharacterCatalog:
+        return self.character_service.catalog
+
+    # ===== CATALOG READS =====
+    def get_catalog_version(self, arc: Arc) -> str:
+        return self.character_service.get_catalog_version(arc)
+
+    def get_characters_until(self, arc: Arc = None, include_ignored: bool = False) -> list[BasicCharacter]:
+        return self.character_service.get_characters_until(arc, include_ignored)
+
+    def get_character_rows(self, arc: Arc, fields: list[str], after_id: str | None = None, limit: int | None = None,
+                           include_ignored: bool = False) -> tuple[Iterator[dict], str | None]:
+        return self.character_service.get_character_rows(arc, fields, after_id, limit, include_ignored)
+
+    # ===== DATABASE =====
+    async def reload_excluded_characters(self) -> list[str]:
+        """Re-read the exclusion file and swap in a fresh catalog, without restarting the server"""
+        excluded_character_ids = load_excluded_character_ids()
+        async with get_async_db_session() as session:
+            await session.execute(DBCharacter.exclusion_update(excluded_character_ids))
+
+        await refresh_read_replica_async()
+        await self._commit_catalog_change(None)
+        return excluded_character_ids
+
+    async def _commit_catalog_change(self, patch: Callable[[CharacterCatalog], None] | None):
+        await asyncio.to_thread(self.character_service.commit_catalog_change, patch)
+
+    async def toggle_character_ignore(self, character_id: str) -> FullCharacter:
+        """Toggle the ignore status of a character"""
+        async with get_async_db_session() as session:
+            character = await session.get(DBCharacter, character_id)
+            if not character:
+                raise ValueError(f"Character with id '{character_id}' not found")
+
+            character.is_ignored = not character.is_ignored
+            updated = character.to_pydantic()
+
+        # Only sync the snapshot once the write has been committed
+        await refresh_read_replica_async()
+        await self._commit_catalog_change(lambda catalog: catalog.set_ignored(updated))
+        return updated
+
+    async def update_character_difficulty(self, character_id: str, difficulty: str) -> FullCharacter:
+        """
+        Update the difficulty rating of a character
+        difficulty can be: "unrated", "very easy", "easy", "medium", "hard", "really hard"
+        """
+        # Checked like a bulk request, any other value would break every later catalog load
+        self.character_service.validate_bulk_updates([(character_id, difficulty)], DIFFICULTY_LEVELS)
+        async with get_async_db_session() as session:
+            character = await session.get(DBCharacter, character_id)
+            if not character:
+                raise ValueError(f"Character with id '{character_id}' not found")
+
+            character.difficulty = difficulty
+            updated = character.to_pydantic()
+
+        await refresh_read_replica_async()
+        await self._commit_catalog_change(lambda catalog: catalog.set_difficulty(updated))
+        return updated
+
+    async def set_characters_ignored(self, flags: list[tuple[str, bool]]) -> list[BasicCharacter]:
+        """Set the ignore flag of many characters in one transaction, all or nothing"""
+        flags_by_id = self.character_service.validate_bulk_updates(flags)
+        async with get_async_db_session() as session:
+            await session.execute(update(DBCharacter), [{"id": character_id, "is_ignored": is_ignored}
+                                                        for character_id, is_ignored in flags_by_id.items()])
+
+        await refresh_read_replica_async()
+        await self._commit_catalog_change(lambda catalog: catalog.set_ignored_flags(flags_by_id))
+        return self.character_service.get_catalog_characters(flags_by_id)
+
+    async def update_character_difficulties(self, ratings: list[tuple[str, str]]) -> list[BasicCharacter]:
+        """Rate many characters in one transaction, all or nothing"""
+        difficulties = self.character_service.validate_bulk_updates(ratings, DIFFICULTY_LEVELS)
+        async with get_async_db_session() as session:
+            await session.execute(update(DBCharacter), [{"id": character_id, "difficulty": difficulty}
+                                                        for character_id, difficulty in difficulties.items()])
+
+        await refresh_read_replica_async()
+        await self._commit_catalog_change(lambda catalog: catalog.set_difficulties(difficulties))
+        return self.character_service.get_catalog_characters(difficulties)
+
+    async def get_full_character_by_id(self, character_id: str) -> FullCharacter | None:
+        async with get_async_read_session() as session:
+            character = await session.get(DBCharacter, character_id)
+            return character.to_pydantic() if character else None
+
+    async def search_characters(self, query: str, arc: Arc, limit: int,
+                                include_ignored: bool = True) -> list[BasicCharacter]:
+        """
+        Characters up to an arc whose name, alias or epithet has words starting with every typed word,
+        best match first
+        """
+        match = match_expression(query)
+        if match is None:
+            return []
+
+        catalog = self.catalog
+        mask = catalog.base_mask(arc=arc, include_ignored=include_ignored)
+        results = []
+        async with get_async_read_session() as session:
+            # Ranked candidates come back lazily, stop reading once enough of them pass the arc/exclusion mask
+            async for character_id in await session.stream_scalars(search_statement, {"match": match}):
+                position = catalog.position(character_id)
+                if position is not None and mask >> position & 1:
+                    results.append(catalog.character(position))
+                    if len(results) >= limit:
+                        break
+        return results
+
+    async def get_character_by_name(self, character_name: str) -> FullCharacter | None:
+        """Get a character by their name (case-insensitive) - returns full character for game reveals"""
+        async with get_async_read_session() as session:
+            character = None
+            position = self.catalog.position_by_name(character_name)
+            if position is not None:
+                character_id = self.catalog.ids[position]
+            else:
+                # Best indexed match on the name, alias or epithet
+                match = match_expression(character_name)
+                character_id = (await session.scalar(search_statement, {"match": match})) if match else None
+
+            if character_id is not None:
+                character = await session.get(DBCharacter, character_id)
+
+            if character is None:
+                # Substring match, for input the word-prefix index can't resolve (e.g. the middle of a word)
+                character = await session.scalar(
+                    select(DBCharacter).where(DBCharacter.name.ilike(f"%{character_name}%")).limit(1)
+                )
+
+            return character.to_pydantic() if character else None
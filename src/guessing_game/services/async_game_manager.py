@@ -0,0 +1,97 @@
+# server/services/async_game_manager.py
+import asyncio
+from datetime import datetime
+
+import redis
+import redis.asyncio
+from redis.exceptions import ConnectionError, ResponseError, TimeoutError
+
+from guessing_game.config import GAME_TTL, get_async_redis, get_redis
+from guessing_game.services.chat_history import chat_key
+from guessing_game.services.game_manager import GameMessage, GameSnapshot, LegacyKeyUpgrader, WELCOME_MESSAGE, \
+    decode_log_entry, encode_log_entry, new_game_data, queue_snapshot_reads
+
+
+class AsyncGameManager:
+    """
+    Game state in Redis for the game routes, on the shared redis.asyncio client.
+
+    A request loads its game once as a GameSnapshot and writes its changes back in one round trip. Keys stored by an
+    older version are rare, upgrading them runs LegacyKeyUpgrader on the sync client in a worker thread.
+    """
+
+    def __init__(self, redis_client: redis.asyncio.Redis | None = None, sync_redis_client: redis.Redis | None = None):
+        self.redis = redis_client or get_async_redis()
+        self.game_ttl = GAME_TTL
+        self.legacy_keys = LegacyKeyUpgrader(sync_redis_client or get_redis(), self.game_ttl)
+
+    async def _command(self, game_id: str, command, *args):
+        """Run a command on one of a game's keys, upgrading keys stored in an older layout first if needed"""
+        try:
+            return await command(*args)
+        except ResponseError as e:
+            if "WRONGTYPE" not in str(e) or not await asyncio.to_thread(self.legacy_keys.upgrade, game_id):
+                raise
+            return await command(*args)
+
+    @staticmethod
+    async def _execute(pipe) -> list:
+        """
+        Execute a pipeline and raise the first error as Redis sent it - redis.asyncio rewrites the message of a
+        failed pipeline command without keeping the original, which _command has to see
+        """
+        results = await pipe.execute(raise_on_error=False)
+        for result in results:
+            if isinstance(result, ResponseError):
+                raise result
+        return results
+
+    async def create_game(self, game_id: str, character_id: str, arc_limit: str, game_settings: dict) -> None:
+        """Store sensitive game data and the welcome message in Redis"""
+        messages_key = f"messages:{game_id}"
+        try:
+            pipe = self.redis.pipeline()
+            pipe.hset(f"game:{game_id}", mapping=new_game_data(character_id, arc_limit, game_settings))
+            pipe.expire(f"game:{game_id}", self.game_ttl)
+            pipe.rpush(messages_key, encode_log_entry(WELCOME_MESSAGE, False, False, datetime.now().timestamp()))
+            pipe.expire(messages_key, self.game_ttl)
+            await pipe.execute()
+
+        except (ConnectionError, TimeoutError) as e:
+            print(f"Redis connection error in create_game: {e}")
+            raise RuntimeError("Game service unavailable")
+
+    # ===== SNAPSHOTS =====
+    async def _fetch_snapshot(self, game_id: str, with_chat: bool) -> list:
+        pipe = self.redis.pipeline(transaction=False)
+        queue_snapshot_reads(pipe, game_id, with_chat)
+        return await self._execute(pipe)
+
+    async def load_snapshot(self, game_id: str, with_chat: bool = False) -> GameSnapshot | None:
+        """The game in one round trip, with its LLM chat history if asked for, None when the game is gone"""
+        results = await self._command(game_id, self._fetch_snapshot, game_id, with_chat)
+        if with_chat and results[3] and await asyncio.to_thread(self.legacy_keys.upgrade, game_id):
+            results[2] = await self.redis.lrange(chat_key(game_id), 0, -1)
+        return GameSnapshot.from_results(game_id, results, with_chat)
+
+    async def save_snapshot(self, snapshot: GameSnapshot):
+        """Write back the changes recorded on a snapshot in one atomic round trip"""
+        pipe = self.redis.pipeline()
+        if snapshot.queue_writes(pipe, self.game_ttl):
+            await pipe.execute()
+
+    # ===== MESSAGES =====
+    async def get_all_messages(self, game_id: str, start: int = 0, stop: int = -1) -> list[GameMessage]:
+        """
+        Messages in chronological order, optionally only the IDs from start to stop (inclusive, -1 for the last).
+        start must not be negative, it is the ID of the first message returned
+        """
+        if start < 0:
+            raise ValueError("start must be a message ID, not a negative index")
+
+        entries = await self._command(game_id, self.redis.lrange, f"messages:{game_id}", start, stop)
+        return [decode_log_entry(start + i, entry) for i, entry in enumerate(entries)]
+
+    async def get_chat_messages(self, game_id: str) -> list[GameMessage]:
+        """Get all chat messages in chronological order"""
+        return await self.get_all_messages(game_id)
@@ -0,0 +1,106 @@
+# server/services/catalog_sync.py
+import asyncio
+import secrets
+
+import redis
+import redis.asyncio
+from redis.exceptions import RedisError
+
+from guessing_game.config.database import refresh_read_replica_async
+from guessing_game.config.settings import CATALOG_SYNC_RETRY_SECONDS
+from guessing_game.services.pool_cache import PoolCache
+
+CATALOG_VERSION_KEY = "catalog:version"
+# Created together with the counter, a flushed or restarted Redis starts a new epoch instead of reusing old versions
+CATALOG_EPOCH_KEY = "catalog:epoch"
+CATALOG_CHANNEL = "catalog:invalidate"
+
+
+def new_epoch() -> str:
+    return secrets.token_hex(8)
+
+
+class CatalogSync:
+    """
+    Keeps the character catalog of every worker on the same version.
+
+    The version lives in Redis as an (epoch, counter) pair. A worker that changes characters claims the next version
+    with INCR and publishes it, the others reload their catalog from the database once the shared version differs
+    from theirs. The counter only goes up within an epoch, and losing it to a Redis reset also loses the epoch, so a
+    version is never reused for other data. Pools are cached per catalog version, so a reload also retires every
+    cached pool.
+    """
+
+    def __init__(self, redis_client: redis.Redis, async_redis_client: redis.asyncio.Redis):
+        self.redis_client = redis_client
+        self.async_redis_client = async_redis_client
+
+    def publish_change(self) -> tuple[str, int] | None:
+        """Claim the next catalog version and announce it, None when Redis can't be reached"""
+        try:
+            # One transaction, so the counter is never bumped under an epoch a concurrent reset just replaced
+            pipe = self.redis_client.pipeline()
+            pipe.set(CATALOG_EPOCH_KEY, new_epoch(), nx=True)
+            pipe.get(CATALOG_EPOCH_KEY)
+            pipe.incr(CATALOG_VERSION_KEY)
+            _, epoch, version = pipe.execute()
+            self.redis_client.publish(CATALOG_CHANNEL, version)
+            return epoch.decode(), version
+        except RedisError as e:
+            print(f"WARNING: Could not publish catalog change, other workers stay stale: {e}")
+            return None
+
+    def current_version(self) -> tuple[str, int]:
+        """
+        The current (epoch, counter) for a catalog being loaded, starting a new epoch when Redis has none.
+        ("", 0) when Redis can't be reached, which the listener replaces once it connects
+        """
+        try:
+            pipe = self.redis_client.pipeline()
+            pipe.set(CATALOG_EPOCH_KEY, new_epoch(), nx=True)
+            pipe.mget(CATALOG_EPOCH_KEY, CATALOG_VERSION_KEY)
+            _, (epoch, version) = pipe.execute()
+            return epoch.decode(), int(version or 0)
+        except RedisError as e:
+            print(f"WARNING: Could not read the catalog version, loading an unversioned catalog: {e}")
+            return "", 0
+
+    async def shared_version(self) -> tuple[str, int]:
+        """The current (epoch, counter), starting a new epoch when Redis has none"""
+        async with self.async_redis_client.pipeline() as pipe:
+            pipe.set(CATALOG_EPOCH_KEY, new_epoch(), nx=True)
+            pipe.mget(CATALOG_EPOCH_KEY, CATALOG_VERSION_KEY)
+            _, (epoch, version) = await pipe.execute()
+        return epoch, int(version or 0)
+
+    async def listen(self, character_service, pool_cache: PoolCache):
+        """Follow the invalidation channel until cancelled, reconnecting whenever Redis drops or a reload fails"""
+        while True:
+            try:
+                async with self.async_redis_client.pubsub() as pubsub:
+                    await pubsub.subscribe(CATALOG_CHANNEL)
+                    # Subscribed first, so a change made while catching up is still heard
+                    await self._catch_up(character_service, pool_cache)
+
+                    async for message in pubsub.listen():
+                        # Announcements can arrive out of order, so each one is only a cue to read the current version
+                        if message["type"] == "message":
+                            await self._catch_up(character_service, pool_cache)
+            except RedisError as e:
+                print(f"WARNING: Catalog invalidation listener lost Redis, retrying: {e}")
+                await asyncio.sleep(CATALOG_SYNC_RETRY_SECONDS)
+            except Exception as e:
+                # A failed reload (database locked, a bad row) must not end the task, nothing would restart it and
+                # this worker would serve a stale catalog. Resubscribing catches up again
+                print(f"ERROR: Catalog reload failed, retrying: {e!r}")
+                await asyncio.sleep(CATALOG_SYNC_RETRY_SECONDS)
+
+    async def _catch_up(self, character_service, pool_cache: PoolCache):
+        epoch, version = await self.shared_version()
+        # Our own changes, and anything an earlier reload already picked up, are already there. Any other version,
+        # lower ones after a Redis reset included, means the catalog may not match the database
+        if character_service.is_catalog_at(epoch, version):
+            return
+        await refresh_read_replica_async()
+        await asyncio.to_thread(character_service.sync_catalog, epoch, version)
+        pool_cache.clear()
@@ -0,0 +1,287 @@
+# server/services/character_catalog.py
+import threading
+from array import array
+from bisect import bisect_right
+from typing import Callable, Iterator
+
+from guessing_game.schemas.arc_schemas import Arc
+from guessing_game.schemas.character_schemas import BasicCharacter
+
+# Sentinel stored in the integer columns for a missing chapter/episode
+NO_VALUE = -1
+
+# Fields a catalog row can be projected to, in BasicCharacter's wire order
+CATALOG_FIELDS = ("id", "name", "chapter", "episode", "fillerStatus", "difficulty", "isIgnored", "wikiLink",
+                  "affiliations")
+
+
+class ArcEligibilityIndex:
+    """
+    Precomputed arc cutoffs over the catalog.
+
+    Rows are kept sorted by chapter and by effective episode, and every known arc stores its cutoff offset into both
+    orders plus the resulting "eligible up to this arc" bitmap, so an arc filter is a dict lookup instead of a scan.
+    """
+
+    def __init__(self, chapters: array, episodes: array, arcs: list[Arc]):
+        self.size = len(chapters)
+        self.chapter_order, self.chapter_values, self._no_chapter_mask = self._sort_column(chapters)
+        self.episode_order, self.episode_values, self._no_episode_mask = self._sort_column(episodes)
+
+        self.chapter_cutoffs: dict[str, int] = {}
+        self.episode_cutoffs: dict[str, int] = {}
+        for arc in arcs:
+            self.chapter_cutoffs[arc.name] = self._cutoff(self.chapter_values, arc.chapter)
+            self.episode_cutoffs[arc.name] = self._cutoff(self.episode_values, arc.episode)
+
+        chapter_prefixes = self._prefix_masks(self.chapter_order, self.chapter_cutoffs.values())
+        episode_prefixes = self._prefix_masks(self.episode_order, self.episode_cutoffs.values())
+
+        self._arcs = {arc.name: arc for arc in arcs}
+        self._eligible: dict[str, int] = {
+            arc.name: ((self._no_chapter_mask | chapter_prefixes[self.chapter_cutoffs[arc.name]]) &
+                       (self._no_episode_mask | episode_prefixes[self.episode_cutoffs[arc.name]]))
+            for arc in arcs
+        }
+
+    @staticmethod
+    def _sort_column(column: array) -> tuple[array, array, int]:
+        """Positions with a value sorted by that value, the sorted values, and the mask of rows with no value"""
+        order = array('i', sorted((i for i, value in enumerate(column) if value != NO_VALUE), key=column.__getitem__))
+        values = array('i', (column[i] for i in order))
+        missing = 0
+        for i, value in enumerate(column):
+            if value == NO_VALUE:
+                missing |= 1 << i
+        return order, values, missing
+
+    @staticmethod
+    def _cutoff(values: array, limit: int | None) -> int:
+        """Number of sorted rows whose value is <= limit (no limit keeps every row)"""
+        if limit is None:
+            return len(values)
+        return bisect_right(values, limit)
+
+    @staticmethod
+    def _prefix_masks(order: array, cutoffs) -> dict[int, int]:
+        """Bitmap of the first `cutoff` rows of an order, built in a single pass for all requested cutoffs"""
+        masks = {}
+        mask = 0
+        position = 0
+        for cutoff in sorted(set(cutoffs)):
+            while position < cutoff:
+                mask |= 1 << order[position]
+                position += 1
+            masks[cutoff] = mask
+        return masks
+
+    def eligible_mask(self, arc: Arc) -> int:
+        """Rows eligible up to the end of the arc (characters with no chapter/episode are always eligible)"""
+        indexed_arc = self._arcs.get(arc.name)
+        if indexed_arc is not None and indexed_arc.chapter == arc.chapter and indexed_arc.episode == arc.episode:
+            return self._eligible[arc.name]
+
+        # Arc that is not part of the timeline - fall back to the binary search cutoffs
+        chapter_cutoff = self._cutoff(self.chapter_values, arc.chapter)
+        episode_cutoff = self._cutoff(self.episode_values, arc.episode)
+        return ((self._no_chapter_mask | self._prefix_masks(self.chapter_order, [chapter_cutoff])[chapter_cutoff]) &
+                (self._no_episode_mask | self._prefix_masks(self.episode_order, [episode_cutoff])[episode_cutoff]))
+
+
+class CharacterCatalog:
+    """
+    Array-backed, in-memory snapshot of the characters table.
+
+    Every column is stored as a parallel array indexed by row position, and the filters used by the character
+    queries are kept as precomputed bitmasks (bit i set = row i matches), so a query is a handful of integer ANDs.
+    """
+
+    def __init__(self, characters: list[BasicCharacter], excluded_ids: list[str], arcs: list[Arc], version: int = 0,
+                 epoch: str = ""):
+        self._lock = threading.Lock()
+        self.size = len(characters)
+        # Bumped on every mutation so derived caches can tell when they are stale
+        self.version = version
+        # Which run of the shared version counter the version belongs to (see CatalogSync)
+        self.epoch = epoch
+
+        # Per-column arrays
+        self.ids = [char.id for char in characters]
+        self.names = [char.name for char in characters]
+        self.filler_statuses = [char.filler_status for char in characters]
+        self.difficulties = [char.difficulty for char in characters]
+        self.ignored = bytearray(char.is_ignored for char in characters)
+        self.chapters = array('i', (self._to_int(char.chapter) for char in characters))
+        self.episodes = array('i', (self._to_int(char.episode) for char in characters))
+        self.wiki_links = [char.wiki_link for char in characters]
+        self.affiliations = [char.affiliations for char in characters]
+
+        self._positions = {char_id: i for i, char_id in enumerate(self.ids)}
+        self._name_positions: dict[str, int] = {}
+        for i, name in enumerate(self.names):
+            self._name_positions.setdefault(name.lower(), i)
+        self._models = list(characters)
+
+        # Precomputed masks
+        self.all_mask = (1 << self.size) - 1
+        self._status_masks = self._build_value_masks(status.lower() for status in self.filler_statuses)
+        self._difficulty_masks = self._build_value_masks(self.difficulties)
+        self._ignored_mask = self._build_mask(i for i, flag in enumerate(self.ignored) if flag)
+        self._excluded_mask = self._build_exclusion_mask(excluded_ids)
+        self.arc_index = ArcEligibilityIndex(self.chapters, self.episodes, arcs)
+
+        # Position arrays of frequently used filters, dropped on every mutation
+        self._position_cache: dict[tuple, array] = {}
+
+    @staticmethod
+    def _to_int(value: int | None) -> int:
+        return NO_VALUE if value is None else value
+
+    @staticmethod
+    def _build_mask(positions) -> int:
+        mask = 0
+        for i in positions:
+            mask |= 1 << i
+        return mask
+
+    @staticmethod
+    def _build_value_masks(values) -> dict[str, int]:
+        masks: dict[str, int] = {}
+        for i, value in enumerate(values):
+            masks[value] = masks.get(value, 0) | (1 << i)
+        return masks
+
+    def _build_exclusion_mask(self, excluded_ids: list[str]) -> int:
+        return self._build_mask(self._positions[char_id] for char_id in excluded_ids if char_id in self._positions)
+
+    # ===== MASKS =====
+    def status_mask(self, filler_status: str) -> int:
+        """Rows whose filler status matches (case-insensitive)"""
+        return self._status_masks.get(filler_status.lower(), 0)
+
+    def difficulty_mask(self, difficulty_range: list[str], include_unrated: bool = False) -> int:
+        """Rows whose difficulty is in the range, optionally including unrated ones"""
+        mask = 0
+        for difficulty in difficulty_range:
+            mask |= self._difficulty_masks.get(difficulty, 0)
+        if include_unrated:
+            mask |= self._difficulty_masks.get("unrated", 0)
+        return mask
+
+    def arc_mask(self, arc: Arc) -> int:
+        """Rows that appear before the end of the arc (characters with no chapter/episode always match)"""
+        if arc.name == "All":
+            return self.all_mask
+
+        return self.arc_index.eligible_mask(arc)
+
+    def base_mask(self, arc: Arc | None = None, difficulty_range: list[str] | None = None,
+                  include_unrated: bool = False, include_ignored: bool = True) -> int:
+        """
+        Mirror of the old base query: exclusions are always applied, any other filter set to None is skipped
+        """
+        mask = self.all_mask & ~self._excluded_mask
+
+        if not include_ignored:
+            mask &= ~self._ignored_mask
+
+        if difficulty_range is not None:
+            mask &= self.difficulty_mask(difficulty_range, include_unrated)
+
+        if arc is not None:
+            mask &= self.arc_mask(arc)
+
+        return mask
+
+    # ===== ROWS =====
+    def characters(self, mask: int) -> list[BasicCharacter]:
+        """Materialize the rows selected by a mask, in catalog order"""
+        models = self._models
+        # bin() lists the bits most significant first, reverse it so index i is row i
+        bits = bin(mask)[:1:-1]
+        return [models[i] for i, bit in enumerate(bits) if bit == '1']
+
+    def character(self, position: int) -> BasicCharacter:
+        return self._models[position]
+
+    def position(self, character_id: str) -> int | None:
+        return self._positions.get(character_id)
+
+    def position_by_name(self, name: str) -> int | None:
+        """Position of the first row with exactly this name (case-insensitive)"""
+        return self._name_positions.get(name.lower())
+
+    def positions(self, mask: int, after: int | None = None) -> list[int]:
+        """Row positions selected by a mask, optionally only those after a given position"""
+        if after is not None:
+            mask &= ~((1 << (after + 1)) - 1)
+        bits = bin(mask)[:1:-1]
+        return [i for i, bit in enumerate(bits) if bit == '1']
+
+    def cached_positions(self, key: tuple, build_mask: Callable[[], int]) -> array:
+        """Positions of a filter's rows, computed once per filter key until the catalog changes"""
+        positions = self._position_cache.get(key)
+        if positions is None:
+            with self._lock:
+                version = self.version
+            positions = array('i', self.positions(build_mask()))
+            with self._lock:
+                # Don't cache a result a concurrent mutation may have made stale
+                if self.version == version:
+                    self._position_cache[key] = positions
+        return positions
+
+    def iter_rows(self, positions: list[int], fields: list[str]) -> Iterator[dict]:
+        """Lazily project rows to dicts holding only the requested wire fields"""
+        # Wire (camelCase) field name -> column reader, matching BasicCharacter's aliases
+        readers = {
+            "id": self.ids.__getitem__,
+            "name": self.names.__getitem__,
+            "chapter": lambda i: None if self.chapters[i] == NO_VALUE else self.chapters[i],
+            "episode": lambda i: None if self.episodes[i] == NO_VALUE else self.episodes[i],
+            "fillerStatus": self.filler_statuses.__getitem__,
+            "difficulty": self.difficulties.__getitem__,
+            "isIgnored": lambda i: bool(self.ignored[i]),
+            "wikiLink": self.wiki_links.__getitem__,
+            "affiliations": self.affiliations.__getitem__,
+        }
+        selected = [(name, readers[name]) for name in fields]
+        for i in positions:
+            yield {name: read(i) for name, read in selected}
+
+    # ===== MUTATIONS =====
+    def set_ignored(self, character: BasicCharacter):
+        """Sync the ignore flag of a single row after a database write"""
+        self.set_ignored_flags({character.id: character.is_ignored})
+
+    def set_difficulty(self, character: BasicCharacter):
+        """Sync the difficulty of a single row after a database write"""
+        self.set_difficulties({character.id: character.difficulty})
+
+    def set_ignored_flags(self, flags: dict[str, bool]):
+        """Sync the ignore flags of many rows after a database write, as a single version bump"""
+        with self._lock:
+            for character_id, is_ignored in flags.items():
+                i = self._positions[character_id]
+                self.ignored[i] = is_ignored
+                if is_ignored:
+                    self._ignored_mask |= 1 << i
+                else:
+                    self._ignored_mask &= ~(1 << i)
+                self._models[i] = self._models[i].model_copy(update={"is_ignored": is_ignored})
+            self._position_cache.clear()
+            self.version += 1
+
+    def set_difficulties(self, difficulties: dict[str, str]):
+        """Sync the difficulties of many rows after a database write, as a single version bump"""
+        with self._lock:
+            for character_id, difficulty in difficulties.items():
+                i = self._positions[character_id]
+                bit = 1 << i
+                old_difficulty = self.difficulties[i]
+                self._difficulty_masks[old_difficulty] &= ~bit
+                self._difficulty_masks[difficulty] = self._difficulty_masks.get(difficulty, 0) | bit
+                self.difficulties[i] = difficulty
+                self._models[i] = self._models[i].model_copy(update={"difficulty": difficulty})
+            self._position_cache.clear()
+            self.version += 1
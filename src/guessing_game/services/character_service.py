@@ -1,153 +1,212 @@
 # server/services/character_service.py
-from sqlalchemy import or_, func
-from guessing_game.config.database import get_db_session
-from guessing_game.config.settings import EXCLUDED_CHARACTERS_PATH
-from guessing_game.models.db_character import DBCharacter
-from guessing_game.models.db_arc import DBArc
+import threading
+from array import array
+from typing import Callable, Iterator, TypeVar
+
+from guessing_game.config.database import get_db_session, get_read_session
+from guessing_game.config.exclusions import load_excluded_character_ids
+from guessing_game.config.settings import BULK_UPDATE_LIMIT
+from guessing_game.models.db_character import DBCharacter, DifficultyEnum
 from guessing_game.schemas.character_schemas import FullCharacter, BasicCharacter
 from guessing_game.schemas.arc_schemas import Arc
+from guessing_game.services.arc_service import ArcService
+from guessing_game.services.catalog_sync import CatalogSync, new_epoch
+from guessing_game.services.character_catalog import CharacterCatalog
+from guessing_game.services.target_selector import TargetCandidates
+
+DIFFICULTY_LEVELS = frozenset(level.value for level in DifficultyEnum)
+# The value a bulk request sets on every character, e.g. a difficulty or an ignore flag
+Value = TypeVar("Value")
+
+
+def sync_excluded_characters() -> list[str]:
+    """Write the exclusion list from the text file into the is_excluded column, the catalog is loaded from it"""
+    excluded_ids = load_excluded_character_ids()
+    with get_db_session() as session:
+        session.execute(DBCharacter.exclusion_update(excluded_ids))
+    return excluded_ids
+
 
 class CharacterService:
-    def __init__(self):
-        self.excluded_character_ids = self._load_excluded_characters()
+    def __init__(self, arc_service: ArcService | None = None, catalog_sync: CatalogSync | None = None):
+        self.arc_service = arc_service or ArcService()
+        # Shares catalog versions with the other workers, when set
+        self.catalog_sync = catalog_sync
+        self._catalog_lock = threading.Lock()
+        # Loaded at the shared version, so the listener has nothing to catch up on and doesn't reload it right away
+        self.catalog = self._load_catalog(*catalog_sync.current_version()) if catalog_sync else self._load_catalog()
+
+    def _load_catalog(self, epoch: str = "", version: int = 0) -> CharacterCatalog:
+        """Load the whole characters table into an in-memory snapshot"""
+        with get_db_session() as session:
+            # Ordered, so a cursor resumes at the same place in any worker's catalog and after a reload
+            characters = [char.to_basic_pydantic() for char in session.query(DBCharacter).order_by(DBCharacter.id)]
+            excluded_ids = [char_id for (char_id,) in
+                            session.query(DBCharacter.id).filter(DBCharacter.is_excluded == True)]
+        return self.build_catalog(characters, excluded_ids, epoch, version)
 
-    def _load_excluded_characters(self) -> list[str]:
-        """Load excluded character IDs from the text file"""
-        with open(EXCLUDED_CHARACTERS_PATH, 'r', encoding='utf-8') as f:
-            return [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+    def build_catalog(self, characters: list[BasicCharacter], excluded_ids: list[str], epoch: str,
+                      version: int) -> CharacterCatalog:
+        return CharacterCatalog(characters, excluded_ids, self.arc_service.get_all_arcs(), version=version, epoch=epoch)
 
-    def _build_base_query(self, session, arc: Arc | None = None, difficulty_range: list[str] | None = None,
-                          include_unrated: bool = False, include_ignored: bool = True):
+    def commit_catalog_change(self, patch: Callable[[CharacterCatalog], None] | None):
         """
-        Build base query with common filters applied at database level
-        If a parameter is None, don't apply that filter (show everything for that criteria)
+        Bring the catalog up to date after a committed write, under a new version.
+        The patch is applied in place when the new version directly follows ours, otherwise (or without a patch)
+        the catalog is reloaded, since other workers changed characters in between or Redis lost the shared version
         """
-        query = session.query(DBCharacter)
-
-        # Filter ignored characters - None means show all (ignored and non-ignored)
-        if not include_ignored:  # Only filter if explicitly set to False
-            query = query.filter(DBCharacter.is_ignored == False)
-
-        # Filter by difficulty range - None means show all difficulties
-        if difficulty_range is not None:
-            difficulty_conditions = [DBCharacter.difficulty.in_(difficulty_range)]
-
-            if include_unrated:
-                # Also include unrated (empty/null) characters
-                difficulty_conditions.extend([
-                    DBCharacter.difficulty.is_(None),
-                    DBCharacter.difficulty == "unrated"
-                ])
-
-            # Combine all difficulty conditions with OR
-            query = query.filter(or_(*difficulty_conditions))
-
-        # Arc filtering - None means show all characters regardless of arc
-        if arc is not None and arc.name != "All":
-            # Get the actual arc from database
-            db_arc = session.query(DBArc).filter(DBArc.name == arc.name).first()
-            if not db_arc:
-                # If arc not found in DB, create a temporary one with the Pydantic values
-                db_arc = DBArc(name=arc.name, last_chapter=arc.chapter, last_episode=arc.episode)
-
-            # Apply arc filtering
-            if db_arc.last_chapter is not None:
-                query = query.filter(
-                    (DBCharacter.chapter.is_(None)) |
-                    (DBCharacter.chapter <= db_arc.last_chapter)
-                )
-
-            if db_arc.last_episode is not None:
-                query = query.filter(
-                    (DBCharacter.effective_episode.is_(None)) |
-                    (DBCharacter.effective_episode <= db_arc.last_episode)
-                )
-
-        # Apply character exclusion filter (case-insensitive)
-        if self.excluded_character_ids:
-            # Convert exclusion list to lowercase for case-insensitive comparison
-            excluded_ids_lower = [char_id.lower() for char_id in self.excluded_character_ids]
-            query = query.filter(~func.lower(DBCharacter.id).in_(excluded_ids_lower))
-
-        return query
+        shared = self.catalog_sync.publish_change() if self.catalog_sync else None
+        with self._catalog_lock:
+            epoch, version = self.catalog.epoch, self.catalog.version + 1
+            if shared is not None:
+                epoch, version = shared
+            elif self.catalog_sync is not None:
+                # Redis couldn't be reached, so no other worker has this version - an epoch of our own keeps it from
+                # passing for a shared one, and the next shared version reloads the catalog
+                epoch = f"local-{new_epoch()}"
+            if patch is not None and (epoch, version) == (self.catalog.epoch, self.catalog.version + 1):
+                patch(self.catalog)
+            elif not self.is_catalog_at(epoch, version):
+                self.catalog = self._load_catalog(epoch, version)
+
+    def sync_catalog(self, epoch: str, version: int):
+        """Reload the catalog after another worker moved the shared version to this one"""
+        with self._catalog_lock:
+            if not self.is_catalog_at(epoch, version):
+                self.catalog = self._load_catalog(epoch, version)
+
+    def is_catalog_at(self, epoch: str, version: int) -> bool:
+        """
+        Whether the catalog already has the changes of a shared version: it is that version, or a later one of the
+        same epoch (a concurrent write of ours can claim its version before we reload for this one)
+        """
+        catalog = self.catalog
+        return epoch == catalog.epoch and version <= catalog.version
+
+    @property
+    def catalog_version(self) -> str:
+        """Version of the character snapshot, changes whenever any character data changes"""
+        catalog = self.catalog
+        return f"{catalog.epoch}.{catalog.version}" if catalog.epoch else str(catalog.version)
+
+    def get_catalog_version(self, arc: Arc) -> str:
+        """Identifies the exact list get_characters_until(arc, include_ignored=True) returns"""
+        return f"{self.catalog_version}:{arc.name}"
 
     def get_characters_until(self, arc: Arc = None, include_ignored: bool = False) -> list[BasicCharacter]:
         """Get all characters up to a specific arc"""
-        with get_db_session() as session:
-            query = self._build_base_query(session, arc=arc, include_ignored=include_ignored)
-            characters = query.all()
-            return [char.to_basic_pydantic() for char in characters]
+        mask = self.catalog.base_mask(arc=arc, include_ignored=include_ignored)
+        return self.catalog.characters(mask)
+
+    def get_character_rows(self, arc: Arc, fields: list[str], after_id: str | None = None, limit: int | None = None,
+                           include_ignored: bool = False) -> tuple[Iterator[dict], str | None]:
+        """
+        Projected rows for a page of characters up to an arc, produced lazily while the catalog is scanned.
+        Also returns the ID to resume after, or None on the last page
+        """
+        catalog = self.catalog
+        after = None
+        if after_id is not None:
+            after = catalog.position(after_id)
+            if after is None:
+                raise ValueError(f"Unknown cursor position '{after_id}'")
+
+        positions = catalog.positions(catalog.base_mask(arc=arc, include_ignored=include_ignored), after=after)
+
+        next_after_id = None
+        if limit is not None and len(positions) > limit:
+            positions = positions[:limit]
+            next_after_id = catalog.ids[positions[-1]]
+
+        return catalog.iter_rows(positions, fields), next_after_id
 
     def get_canon_characters(self, arc: Arc = None, difficulty_range: list[str] = None, include_unrated: bool = False,
                              include_ignored: bool = False) -> list[BasicCharacter]:
-        """Get canon characters filtered by arc and difficulty using database-level filtering"""
-        with get_db_session() as session:
-            query = self._build_base_query(session, arc, difficulty_range, include_unrated=include_unrated,
-                                           include_ignored=include_ignored)
-            query = query.filter(DBCharacter.filler_status.ilike("canon"))
-            characters = query.all()
-            return [char.to_basic_pydantic() for char in characters]
+        """Get canon characters filtered by arc and difficulty"""
+        mask = self.catalog.base_mask(arc, difficulty_range, include_unrated=include_unrated,
+                                      include_ignored=include_ignored)
+        return self.catalog.characters(mask & self.catalog.status_mask("canon"))
 
     def get_filler_characters(self, arc: Arc = None, difficulty_range: list[str] = None, include_unrated: bool = False,
                               include_ignored: bool = False) -> list[BasicCharacter]:
-        """Get filler characters filtered by arc and difficulty using database-level filtering"""
-        with get_db_session() as session:
-            query = self._build_base_query(session, arc, difficulty_range, include_unrated=include_unrated,
-                                           include_ignored=include_ignored)
-            query = query.filter(DBCharacter.filler_status.ilike("filler"))
-            characters = query.all()
-            return [char.to_basic_pydantic() for char in characters]
+        """Get filler characters filtered by arc and difficulty"""
+        mask = self.catalog.base_mask(arc, difficulty_range, include_unrated=include_unrated,
+                                      include_ignored=include_ignored)
+        return self.catalog.characters(mask & self.catalog.status_mask("filler"))
 
     def get_non_canon_characters(self, arc: Arc = None, difficulty_range: list[str] = None,
                                  include_unrated: bool = False, include_ignored: bool = False) -> list[BasicCharacter]:
         """Get non-canon characters (everything except canon) filtered by arc and difficulty"""
-        with get_db_session() as session:
-            query = self._build_base_query(session, arc, difficulty_range, include_unrated=include_unrated,
-                                           include_ignored=include_ignored)
-            query = query.filter(~DBCharacter.filler_status.ilike("canon"))
-            characters = query.all()
-            return [char.to_basic_pydantic() for char in characters]
-
-    def toggle_character_ignore(self, character_id: str) -> FullCharacter:
-        """Toggle the ignore status of a character"""
-        with get_db_session() as session:
-            character = session.query(DBCharacter).filter(DBCharacter.id == character_id).first()
-            if not character:
-                raise ValueError(f"Character with id '{character_id}' not found")
+        mask = self.catalog.base_mask(arc, difficulty_range, include_unrated=include_unrated,
+                                      include_ignored=include_ignored)
+        return self.catalog.characters(mask & ~self.catalog.status_mask("canon"))
 
-            # Toggle the current ignore status
-            character.is_ignored = not character.is_ignored
-            return character.to_pydantic()
-
-    def update_character_difficulty(self, character_id: str, difficulty: str) -> FullCharacter:
+    def get_target_candidates(self, arc: Arc, difficulty_range: list[str], include_unrated: bool,
+                              include_fillers: bool, include_non_tv_fillers: bool) -> TargetCandidates:
         """
-        Update the difficulty rating of a character
-        difficulty can be: "unrated", "very easy", "easy", "medium", "hard", "really hard"
+        Positions of the canon and filler characters a game can pick its target from (ignored ones left out).
+        Cached per filter, so repeated game starts don't rescan the catalog
         """
-        with get_db_session() as session:
-            character = session.query(DBCharacter).filter(DBCharacter.id == character_id).first()
-            if not character:
-                raise ValueError(f"Character with id '{character_id}' not found")
+        catalog = self.catalog
+        key = (arc.name, tuple(difficulty_range), include_unrated)
+
+        def base_mask() -> int:
+            return catalog.base_mask(arc, difficulty_range, include_unrated=include_unrated, include_ignored=False)
+
+        canon = catalog.cached_positions(key + ("canon",), lambda: base_mask() & catalog.status_mask("canon"))
+
+        filler = array('i')
+        if include_fillers:
+            if include_non_tv_fillers:
+                filler = catalog.cached_positions(key + ("non-canon",),
+                                                  lambda: base_mask() & ~catalog.status_mask("canon"))
+            else:
+                filler = catalog.cached_positions(key + ("filler",),
+                                                  lambda: base_mask() & catalog.status_mask("filler"))
 
-            character.difficulty = difficulty
-            return character.to_pydantic()
+        return TargetCandidates(catalog, canon, filler)
+
+    # ===== BULK CURATION =====
+    def validate_bulk_updates(self, updates: list[tuple[str, Value]],
+                              allowed_values: frozenset[Value] | None = None) -> dict[str, Value]:
+        """
+        Check a whole bulk request before anything is written: its size, that every ID exists and appears once,
+        and that every value is allowed. Returns the updates keyed by ID, raises ValueError listing all problems
+        """
+        if len(updates) > BULK_UPDATE_LIMIT:
+            raise ValueError(f"At most {BULK_UPDATE_LIMIT} characters can be updated at once, got {len(updates)}")
+
+        validated: dict[str, Value] = {}
+        unknown, repeated, invalid = [], [], []
+        for character_id, value in updates:
+            if self.catalog.position(character_id) is None:
+                unknown.append(character_id)
+            elif character_id in validated:
+                repeated.append(character_id)
+            elif allowed_values is not None and value not in allowed_values:
+                invalid.append(f"{character_id}={value}")
+            validated[character_id] = value
+
+        problems = []
+        if unknown:
+            problems.append(f"Unknown character ids: {', '.join(unknown)}")
+        if repeated:
+            problems.append(f"Repeated character ids: {', '.join(repeated)}")
+        if invalid:
+            problems.append(f"Invalid values: {', '.join(invalid)}, choose from: {', '.join(sorted(allowed_values))}")
+        if problems:
+            raise ValueError("; ".join(problems))
+        return validated
+
+    def get_catalog_characters(self, character_ids) -> list[BasicCharacter]:
+        catalog = self.catalog
+        return [catalog.character(catalog.position(character_id)) for character_id in character_ids]
 
     def get_full_character_by_id(self, character_id: str) -> FullCharacter | None:
         """Get a character by their ID - returns full character"""
-        with get_db_session() as session:
+        with get_read_session() as session:
             character = session.query(DBCharacter).filter(DBCharacter.id == character_id).first()
             
             if character:
                 return character.to_pydantic()
             return None
-
-    def get_character_by_name(self, character_name: str) -> FullCharacter | None:
-        """Get a character by their name (case-insensitive) - returns full character for game reveals"""
-        with get_db_session() as session:
-            character = session.query(DBCharacter).filter(
-                DBCharacter.name.ilike(f"%{character_name}%")
-            ).first()
-            
-            if character:
-                return character.to_pydantic()
-            return None
\ No newline at end of file
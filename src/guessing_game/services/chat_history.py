@@ -0,0 +1,25 @@
+# server/services/chat_history.py
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
+
+from guessing_game.services import game_serializer
+
+CHAT_KEY_PREFIX = "chat:"
+# Where RedisChatMessageHistory kept a game's context before: full LangChain message dicts, newest first
+LEGACY_CHAT_KEY_PREFIX = "message_store:chat:"
+
+# A record is [type code, content], the message objects are only built when the history is read
+MESSAGE_TYPES = {"h": HumanMessage, "a": AIMessage, "s": SystemMessage}
+TYPE_CODES = {"human": "h", "ai": "a", "system": "s"}
+
+
+def chat_key(game_id: str) -> str:
+    return f"{CHAT_KEY_PREFIX}{game_id}"
+
+
+def encode_message(message: BaseMessage) -> bytes:
+    return game_serializer.dumps([TYPE_CODES[message.type], message.content])
+
+
+def decode_message(entry: bytes) -> BaseMessage:
+    code, content = game_serializer.loads(entry)
+    return MESSAGE_TYPES[code](content=content)
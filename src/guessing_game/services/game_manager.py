@@ -1,15 +1,16 @@
 # server/game_manager.py
 import json
+from dataclasses import dataclass, field
+from functools import cached_property
 from datetime import datetime
 from typing import TypedDict
 
-from redis.exceptions import ConnectionError, TimeoutError
+import redis
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, messages_from_dict
 
-from langchain_community.chat_message_histories import RedisChatMessageHistory
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-
-from guessing_game.config import GAME_TTL, REDIS_URL, get_redis
-from guessing_game.schemas.character_schemas import FullCharacter
+from guessing_game.config import GAME_TTL
+from guessing_game.services import game_serializer
+from guessing_game.services.chat_history import LEGACY_CHAT_KEY_PREFIX, chat_key, decode_message, encode_message
 
 
 class GameMessage(TypedDict):
@@ -19,164 +20,242 @@ class GameMessage(TypedDict):
     add_to_context: bool    # messages that should be included in llm context
     timestamp: float
 
-class GameManager:
-    def __init__(self):
-        self.redis = get_redis()
-        self.game_ttl = GAME_TTL
-
-    def create_game(self, game_id: str, target_character: FullCharacter, prompt: str, game_settings: dict) -> None:
-        """Store sensitive game data in Redis"""
-        try:
-            game_data = {
-                "target_character": target_character.model_dump(),
-                "system_prompt": prompt,
-                "game_settings": game_settings,
-                "questions_asked": 0,
-                "guesses_count": 0,
-                "created_at": datetime.now().isoformat()
-            }
-
-            self.redis.setex(
-                f"game:{game_id}",
-                self.game_ttl,
-                json.dumps(game_data)
-            )
-            
-            # Initialize LangChain memory for this game
-            self.get_memory(game_id)
-
-            self.add_ui_message(
-                game_id,
-                "Welcome to the One Piece Character Guessing Game! I'm thinking of a character. Try to guess who it is!",
-                False
-            )
-
-        except (ConnectionError, TimeoutError) as e:
-            print(f"Redis connection error in create_game: {e}")
-            raise RuntimeError("Game service unavailable")
-
-    def get_game_data(self, game_id: str) -> dict | None:
-        """Retrieve game data from Redis"""
-        data = self.redis.get(f"game:{game_id}")
-        return json.loads(data) if data else None
-
-    def game_exists(self, game_id: str) -> bool:
-        """Check if game exists in Redis"""
-        return self.redis.exists(f"game:{game_id}") > 0
-
-    def get_target_character(self, game_id: str) -> FullCharacter:
-        """Get the target character for a game as Character object"""
-        game_data = self.get_game_data(game_id)
-        if not game_data:
-            raise ValueError("Game not found in Redis")
-
-        # Convert dict back to Character object
-        return FullCharacter(**game_data["target_character"])
-
-    def get_game_settings(self, game_id: str) -> dict:
-        """Get game settings"""
-        game_data = self.get_game_data(game_id)
-        if not game_data:
-            raise ValueError("Game not found in Redis")
-        return game_data["game_settings"]
-
-    def get_memory(self, game_id: str) -> RedisChatMessageHistory:
-        """Get or create LangChain chat message history for a game"""
-        return RedisChatMessageHistory(
-            session_id=f"chat:{game_id}",
-            url=REDIS_URL,
-            ttl=self.game_ttl
+# Fields of the game:{id} hash - the serialized ones are written once, the counters only move through HINCRBY and
+# the rest is plain text. The target is kept as its ID and the prompt is rebuilt from it and the arc limit, games
+# created before that keep the full target_character (JSON) and their rendered system_prompt
+SERIALIZED_FIELDS = ("game_settings",)
+COUNTER_FIELDS = ("questions_asked", "guesses_count")
+WELCOME_MESSAGE = ("Welcome to the One Piece Character Guessing Game! I'm thinking of a character. "
+                   "Try to guess who it is!")
+
+
+def new_game_data(character_id: str, arc_limit: str, game_settings: dict) -> dict:
+    """Fields of a new game:{id} hash"""
+    return {
+        "character_id": character_id,
+        "arc_limit": arc_limit,
+        "game_settings": game_serializer.dumps(game_settings),
+        "questions_asked": 0,
+        "guesses_count": 0,
+        "created_at": datetime.now().isoformat()
+    }
+
+
+def encode_log_entry(text: str, is_user: bool, add_to_context: bool, timestamp: float) -> bytes:
+    # Positional, the ID is the entry's index in the messages:{id} list
+    return game_serializer.dumps([text, is_user, add_to_context, timestamp])
+
+
+def decode_log_entry(message_id: int, entry: bytes) -> GameMessage:
+    text, is_user, add_to_context, timestamp = game_serializer.loads(entry)
+    return {
+        "id": str(message_id),
+        "text": text,
+        "is_user": is_user,
+        "add_to_context": add_to_context,
+        "timestamp": timestamp
+    }
+
+
+def decode_game_data(raw: dict[bytes, bytes]) -> dict | None:
+    """A game:{id} hash as read back, None when it is gone"""
+    data = {}
+    for field, value in raw.items():
+        field = field.decode()
+        if field in SERIALIZED_FIELDS:
+            data[field] = game_serializer.loads(value)
+        elif field in COUNTER_FIELDS:
+            data[field] = int(value)
+        else:
+            data[field] = value.decode()
+
+    # A hash without the settings is the leftover of a counter bumped as the game expired
+    if "game_settings" not in data:
+        return None
+
+    if "target_character" in data:
+        data["character_id"] = json.loads(data.pop("target_character"))["id"]
+    return data
+
+
+def queue_snapshot_reads(pipe, game_id: str, with_chat: bool):
+    """Queue the reads of a GameSnapshot on a pipeline (sync or async)"""
+    pipe.hgetall(f"game:{game_id}")
+    # Not needed for the snapshot, but fails with WRONGTYPE on a legacy log, which the write back must not meet
+    pipe.llen(f"messages:{game_id}")
+    if with_chat:
+        pipe.lrange(chat_key(game_id), 0, -1)
+        pipe.exists(f"{LEGACY_CHAT_KEY_PREFIX}{game_id}")
+
+
+@dataclass
+class GameSnapshot:
+    """
+    A game as loaded once for a request. The request reads from it and records its changes on it, the manager then
+    writes them back in one round trip - counters as increments and messages as appends, so concurrent requests
+    for the same game don't overwrite each other.
+    """
+    game_id: str
+    character_id: str
+    arc_limit: str | None
+    game_settings: dict
+    questions_asked: int
+    guesses_count: int
+    chat_entries: list[bytes] | None = field(default=None, repr=False)  # only loaded when asked for
+    stored_prompt: str | None = field(default=None, repr=False)  # games created before prompts were rebuilt
+    ended: bool = False
+    _log_entries: list[bytes] = field(default_factory=list, repr=False)
+    _context_entries: list[bytes] = field(default_factory=list, repr=False)
+    _increments: dict[str, int] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_results(cls, game_id: str, results: list, with_chat: bool) -> "GameSnapshot | None":
+        """Build from the results of queue_snapshot_reads, None when the game is gone"""
+        game_data = decode_game_data(results[0])
+        if game_data is None:
+            return None
+
+        return cls(
+            game_id=game_id,
+            character_id=game_data["character_id"],
+            arc_limit=game_data.get("arc_limit"),
+            game_settings=game_data["game_settings"],
+            questions_asked=game_data["questions_asked"],
+            guesses_count=game_data["guesses_count"],
+            chat_entries=results[2] if with_chat else None,
+            stored_prompt=game_data.get("system_prompt"),
         )
 
-    def add_message(self, game_id: str, text: str, is_user: bool, add_to_context: bool):
-        """Add message to unified message storage"""
-        # Get existing messages
-        messages = self.get_all_messages(game_id)
-        
-        # Create message dict
-        message: GameMessage = {
-            "id": str(len(messages)),
-            "text": text,
-            "is_user": is_user,
-            "add_to_context": add_to_context,
-            "timestamp": datetime.now().timestamp()
-        }
-        
-        # Add to unified message list
-        messages.append(message)
-        self._store_messages(game_id, messages)
-        
-        # If it's a chat message, also add to LangChain memory
-        if add_to_context:
-            memory = self.get_memory(game_id)
-            if is_user:
-                memory.add_message(HumanMessage(content=text))
-                # Increment question counter
-                game_data = self.get_game_data(game_id)
-                if game_data:
-                    game_data["questions_asked"] += 1
-                    self.redis.setex(f"game:{game_id}", self.game_ttl, json.dumps(game_data))
-            else:
-                memory.add_message(AIMessage(content=text))
-
-    def get_all_messages(self, game_id: str) -> list[GameMessage]:
-        """Get all messages in chronological order"""
-        data = self.redis.get(f"messages:{game_id}")
-        if not data:
-            return []
-        
-        return json.loads(data)
-
-    def _store_messages(self, game_id: str, messages: list[GameMessage]):
-        """Store messages to Redis"""
-        self.redis.setex(f"messages:{game_id}", self.game_ttl, json.dumps(messages))
-
-    def add_user_question(self, game_id: str, question: str):
-        """Add user question and increment counter"""
-        self.add_message(game_id, question, True, True)
-    
-    def add_assistant_response(self, game_id: str, response: str):
-        """Add assistant response to memory"""
-        self.add_message(game_id, response, False, True)
-
-    def add_ui_message(self, game_id: str, text: str, is_user: bool):
+    @cached_property
+    def chat_history(self) -> list[BaseMessage]:
+        """LLM context of the game as loaded, decoded on first use"""
+        if self.chat_entries is None:
+            raise ValueError("Chat history was not loaded with this game")
+        return [decode_message(entry) for entry in self.chat_entries]
+
+    def _increment(self, field: str):
+        self._increments[field] = self._increments.get(field, 0) + 1
+        setattr(self, field, getattr(self, field) + 1)
+
+    def add_ui_message(self, text: str, is_user: bool):
         """Add a UI-only message (not sent to LLM)"""
-        self.add_message(game_id, text, is_user, False)
-
-    def get_system_prompt(self, game_id: str) -> str:
-        """Get the system prompt for a game"""
-        game_data = self.get_game_data(game_id)
-        if not game_data:
-            raise ValueError("Game not found in Redis")
-        return game_data["system_prompt"]
-
-    def add_guess(self, game_id: str):
-        """Add a guess to the game and increment guess counter"""
-        game_data = self.get_game_data(game_id)
-        if not game_data:
-            raise ValueError("Game not found in Redis")
-
-        # Increment guess counter
-        game_data["guesses_count"] += 1
-
-        self.redis.setex(f"game:{game_id}", self.game_ttl, json.dumps(game_data))
-
-    def get_questions_asked(self, game_id: str) -> int:
-        """Get number of questions asked"""
-        game_data = self.get_game_data(game_id)
-        return game_data["questions_asked"] if game_data else 0
-
-    def get_guess_count(self, game_id: str) -> int:
-        """Get number of guesses made"""
-        game_data = self.get_game_data(game_id)
-        return game_data["guesses_count"] if game_data else 0
-
-    def get_chat_messages(self, game_id: str) -> list[GameMessage]:
-        """Get all chat messages in chronological order"""
-        return self.get_all_messages(game_id)
-
-    def delete_game(self, game_id: str):
-        """Delete game data"""
-        self.redis.delete(f"game:{game_id}")
-        self.redis.delete(f"messages:{game_id}")
-        self.redis.delete(f"chat:{game_id}")
\ No newline at end of file
+        self._log_entries.append(encode_log_entry(text, is_user, False, datetime.now().timestamp()))
+
+    def record_turn(self, question: str, answer: str):
+        """A question and its answer: both log entries, both LLM context messages and the question counter"""
+        timestamp = datetime.now().timestamp()
+        self._log_entries += [encode_log_entry(question, True, True, timestamp),
+                              encode_log_entry(answer, False, True, timestamp)]
+        self._context_entries += [encode_message(HumanMessage(content=question)),
+                                  encode_message(AIMessage(content=answer))]
+        self._increment("questions_asked")
+
+    def record_guess(self):
+        self._increment("guesses_count")
+
+    def end(self):
+        """Delete the game on write back, dropping any other change"""
+        self.ended = True
+
+    def queue_writes(self, pipe, ttl: int) -> bool:
+        """Queue the recorded changes on a pipeline (sync or async) and forget them, False when there are none"""
+        game_key, messages_key, context_key = f"game:{self.game_id}", f"messages:{self.game_id}", chat_key(self.game_id)
+        if self.ended:
+            pipe.delete(game_key, messages_key, context_key, f"{LEGACY_CHAT_KEY_PREFIX}{self.game_id}")
+            return True
+        if not (self._log_entries or self._context_entries or self._increments):
+            return False
+
+        if self._log_entries:
+            pipe.rpush(messages_key, *self._log_entries)
+        if self._context_entries:
+            pipe.rpush(context_key, *self._context_entries)
+        for field, amount in self._increments.items():
+            pipe.hincrby(game_key, field, amount)
+        # Every key of the game lives as long as its last activity
+        for key in (game_key, messages_key, context_key):
+            pipe.expire(key, ttl)
+
+        self._log_entries, self._context_entries, self._increments = [], [], {}
+        return True
+
+
+class LegacyKeyUpgrader:
+    """
+    Rewrites the keys of games stored by older versions into the current layouts. Such games are rare and upgraded
+    once, so this stays on the sync client and AsyncGameManager runs it in a worker thread when a command on a game
+    key fails with WRONGTYPE or a legacy chat history is found.
+    """
+
+    def __init__(self, redis_client: redis.Redis, game_ttl: int = GAME_TTL):
+        self.redis = redis_client
+        self.game_ttl = game_ttl
+
+    def _upgrade_game(self, key: str) -> bool:
+        """Rewrite a game stored as one JSON string into the hash layout, keeping its TTL"""
+        if self.redis.type(key) != b"string":
+            return False
+        data = self.redis.get(key)
+        if data is None:
+            return False
+
+        game_data = json.loads(data)
+        # The rendered system_prompt stays, the arc limit it was rendered for isn't stored
+        game_data["character_id"] = game_data.pop("target_character")["id"]
+        for field in SERIALIZED_FIELDS:
+            game_data[field] = game_serializer.dumps(game_data[field])
+        ttl = self.redis.ttl(key)
+
+        pipe = self.redis.pipeline()
+        pipe.delete(key)
+        pipe.hset(key, mapping=game_data)
+        pipe.expire(key, ttl if ttl > 0 else self.game_ttl)
+        pipe.execute()
+        return True
+
+    def _upgrade_messages(self, key: str) -> bool:
+        """Rewrite a message log stored as one JSON array into the list layout, keeping its TTL"""
+        if self.redis.type(key) != b"string":
+            return False
+        data = self.redis.get(key)
+        if data is None:
+            return False
+
+        entries = [encode_log_entry(message["text"], message["is_user"], message["add_to_context"],
+                                    message["timestamp"]) for message in json.loads(data)]
+        ttl = self.redis.ttl(key)
+
+        pipe = self.redis.pipeline()
+        pipe.delete(key)
+        if entries:
+            pipe.rpush(key, *entries)
+            pipe.expire(key, ttl if ttl > 0 else self.game_ttl)
+        pipe.execute()
+        return True
+
+    def _upgrade_chat(self, game_id: str) -> bool:
+        """Move a chat history RedisChatMessageHistory stored into the compact records, keeping its TTL"""
+        legacy_key = f"{LEGACY_CHAT_KEY_PREFIX}{game_id}"
+        entries = self.redis.lrange(legacy_key, 0, -1)
+        if not entries:
+            return False
+
+        # Newest first, so pushing them to the head in this order puts them back in front of any newer records
+        records = [encode_message(message) for message in messages_from_dict([json.loads(entry) for entry in entries])]
+        ttl = self.redis.ttl(legacy_key)
+
+        pipe = self.redis.pipeline()
+        pipe.lpush(chat_key(game_id), *records)
+        pipe.expire(chat_key(game_id), ttl if ttl > 0 else self.game_ttl)
+        pipe.delete(legacy_key)
+        pipe.execute()
+        return True
+
+    def upgrade(self, game_id: str) -> bool:
+        """Rewrite every key of a game still stored in an older layout, returns whether there was any"""
+        upgraded = [
+            self._upgrade_game(f"game:{game_id}"),
+            self._upgrade_messages(f"messages:{game_id}"),
+            self._upgrade_chat(game_id),
+        ]
+        return any(upgraded)
@@ -0,0 +1,48 @@
+# server/services/game_serializer.py
+import json
+
+import msgpack
+
+from guessing_game.config.settings import GAME_SERIALIZER
+
+
+class JsonSerializer:
+    """The format game values were stored in before markers, JSON text always starts with [ or {"""
+    name = "json"
+    marker = b""
+
+    def dumps(self, value) -> bytes:
+        return json.dumps(value).encode()
+
+    def loads(self, data: bytes):
+        return json.loads(data)
+
+
+class MsgpackSerializer:
+    name = "msgpack"
+    marker = b"\x01"
+
+    def dumps(self, value) -> bytes:
+        return self.marker + msgpack.packb(value)
+
+    def loads(self, data: bytes):
+        return msgpack.unpackb(memoryview(data)[1:])
+
+
+SERIALIZERS = {serializer.name: serializer for serializer in (JsonSerializer(), MsgpackSerializer())}
+# Every value starts with the marker of the format it was written in, so keys written in any format stay readable
+_BY_MARKER = {serializer.marker: serializer for serializer in SERIALIZERS.values() if serializer.marker}
+
+if GAME_SERIALIZER not in SERIALIZERS:
+    raise ValueError(f"Unknown GAME_SERIALIZER '{GAME_SERIALIZER}', expected one of: {', '.join(SERIALIZERS)}")
+_writer = SERIALIZERS[GAME_SERIALIZER]
+
+
+def dumps(value) -> bytes:
+    """Encode a game value (plain lists, dicts, str, numbers, bool, None) in the configured format"""
+    return _writer.dumps(value)
+
+
+def loads(data: bytes):
+    """Decode a game value written in any known format"""
+    return _BY_MARKER.get(data[:1], SERIALIZERS["json"]).loads(data)
@@ -1,16 +1,21 @@
 # server/game_service.py - Pass Character objects directly
-import random
 import os
 from datetime import datetime
 
+from fastapi.concurrency import run_in_threadpool
+
+from guessing_game.schemas.character_schemas import FullCharacter
 from guessing_game.services.arc_service import ArcService
+from guessing_game.services.async_character_service import AsyncCharacterService
+from guessing_game.services.async_game_manager import AsyncGameManager
+from guessing_game.services.game_manager import GameSnapshot
 from guessing_game.services.llm_service import LLMService
 from guessing_game.services.session_manager import SessionManager
-from guessing_game.services.game_manager import GameManager
 from guessing_game.services.prompt_service import PromptService
-from guessing_game.schemas.character_schemas import BasicCharacter
 from guessing_game.schemas.game_schemas import GameStartRequest
 from guessing_game.services.character_service import CharacterService
+from guessing_game.services.pool_cache import CharacterPool, PoolCache, PoolKey
+from guessing_game.services.target_selector import choose_target
 
 
 def get_difficulty_range(difficulty_level: str) -> list[str]:
@@ -27,10 +32,10 @@ def get_difficulty_range(difficulty_level: str) -> list[str]:
     return difficulty_mapping[difficulty_level]
 
 
-def start_game(request: GameStartRequest, session_mgr: SessionManager, game_mgr: GameManager,
-               character_service: CharacterService, arc_service: ArcService, prompt_service: PromptService
-               ) -> list[BasicCharacter]:
-    """Initialize a new game session"""
+def _prepare_game(request: GameStartRequest, spoiler_arc_names: str | None, character_service: CharacterService,
+                  arc_service: ArcService, prompt_service: PromptService,
+                  pool_cache: PoolCache) -> tuple[CharacterPool, FullCharacter]:
+    """Pick the target and cache its profile - blocking work (database, files, pool serialization) for a thread"""
 
     # Extract request parameters
     selected_arc, include_unrated, difficulty_level, filler_percentage, include_non_tv_fillers = (
@@ -38,41 +43,33 @@ def start_game(request: GameStartRequest, session_mgr: SessionManager, game_mgr:
         request.filler_percentage, request.include_non_tv_fillers
     )
 
-    arc = arc_service.get_arc_by_name(selected_arc)
-    
     difficulty_range = get_difficulty_range(difficulty_level)
 
-    # Get all possible characters based on filters
-    canon_characters = character_service.get_canon_characters(arc, difficulty_range, include_unrated)
+    pool_key = PoolKey(
+        arc=selected_arc,
+        difficulty_level=difficulty_level,
+        include_unrated=include_unrated,
+        include_fillers=filler_percentage > 0,
+        include_non_tv_fillers=include_non_tv_fillers,
+        catalog_version=character_service.catalog_version,
+    )
 
-    filler_characters = []
-    if filler_percentage > 0:
-        if include_non_tv_fillers:
-            filler_characters = character_service.get_non_canon_characters(arc, difficulty_range, include_unrated)
-        else:
-            filler_characters = character_service.get_filler_characters(arc, difficulty_range, include_unrated)
+    arc = arc_service.get_arc_by_name(selected_arc)
+    candidates = character_service.get_target_candidates(arc, difficulty_range, include_unrated,
+                                                         pool_key.include_fillers, include_non_tv_fillers)
 
     # Validate we have characters available
-    if not canon_characters and not filler_characters:
+    if not candidates.count:
         raise ValueError(
             f"No characters found for arc '{selected_arc}' at difficulty {difficulty_level}")
 
-    # Choose character type based on filler percentage
-    random_num = random.random() * 100
-    choose_canon = filler_percentage < random_num
+    # Canon/filler roll, then a random offset into that group - the pool itself is only needed for the response
+    chosen_character = choose_target(candidates, filler_percentage)
 
-    if choose_canon and canon_characters:
-        chosen_character = random.choice(canon_characters)
-    elif filler_characters:
-        chosen_character = random.choice(filler_characters)
-    elif canon_characters:
-        chosen_character = random.choice(canon_characters)
-    else:
-        raise ValueError("No valid characters available for selection")
+    pool = pool_cache.get_or_build(pool_key, lambda: CharacterPool.build(candidates.characters()))
 
-    # Combine and sort all possible characters
-    all_characters = canon_characters + filler_characters
-    character_list = sorted(all_characters, key=lambda char: char.name)
+    # All possible characters, sorted by name
+    character_list = pool.characters
 
     override_character = get_character_override(character_list)
 
@@ -81,30 +78,44 @@ def start_game(request: GameStartRequest, session_mgr: SessionManager, game_mgr:
 
     full_chosen_character = character_service.get_full_character_by_id(chosen_character.id)
 
-    game_settings = {
-        "arc_selection": selected_arc,
-        "filler_percentage": filler_percentage,
-        "include_non_tv_fillers": include_non_tv_fillers,
-        "difficulty_level": difficulty_level,
-        "include_unrated": include_unrated,
-    }
+    # Not stored with the game, but building it caches the character's profile for the questions that rebuild it
+    prompt_service.create_game_prompt(full_chosen_character, spoiler_arc_names)
 
-    # Create game ID and prompt
-    game_id = f"game_{datetime.now().timestamp()}"
+    return pool, full_chosen_character
+
+
+async def start_game(request: GameStartRequest, session_mgr: SessionManager, game_mgr: AsyncGameManager,
+                     character_service: CharacterService, arc_service: ArcService, prompt_service: PromptService,
+                     pool_cache: PoolCache) -> CharacterPool:
+    """Initialize a new game session"""
 
     # Get forbidden arcs for spoiler protection
-    forbidden_arcs = arc_service.get_forbidden_arcs(session_mgr.get_global_arc_limit())
+    arc_limit = session_mgr.get_global_arc_limit()
+    spoiler_arc_names = arc_service.get_spoiler_arc_names(arc_limit)
 
-    prompt = prompt_service.create_game_prompt(full_chosen_character, forbidden_arcs)
+    pool, full_chosen_character = await run_in_threadpool(
+        _prepare_game, request, spoiler_arc_names, character_service, arc_service, prompt_service, pool_cache
+    )
 
-    # Pass Character object directly - GameManager will handle serialization
-    game_mgr.create_game(game_id, full_chosen_character, prompt, game_settings)
+    game_settings = {
+        "arc_selection": request.arc_selection,
+        "filler_percentage": request.filler_percentage,
+        "include_non_tv_fillers": request.include_non_tv_fillers,
+        "difficulty_level": request.difficulty_level,
+        "include_unrated": request.include_unrated,
+    }
+
+    # Create game ID
+    game_id = f"game_{datetime.now().timestamp()}"
+
+    # The game keeps the target's ID and the arc limit, its prompt is rebuilt from them for every question
+    await game_mgr.create_game(game_id, full_chosen_character.id, arc_limit.name, game_settings)
 
     # Store ONLY the game ID in session
     session_mgr.set_current_game_id(game_id)
 
     print(f"Game ID: {game_id}, character: {full_chosen_character.name}")
-    return character_list
+    return pool
 
 def get_character_override(character_list):
     try:
@@ -126,97 +137,97 @@ def get_character_override(character_list):
 
         return None
 
-def ask_question(question: str, session_mgr: SessionManager, game_mgr: GameManager, llm: LLMService,
-                 prompt_service: PromptService) -> str:
-    """Process a question about the character"""
+async def _get_target_character(game: GameSnapshot, character_service: AsyncCharacterService) -> FullCharacter:
+    """The game's target character, games only store its ID"""
+    character = await character_service.get_full_character_by_id(game.character_id)
+    if character is None:
+        raise ValueError("Target character not found")
+    return character
+
+
+def _get_system_prompt(game: GameSnapshot, character: FullCharacter, arc_service: ArcService,
+                       prompt_service: PromptService) -> str:
+    """The game's system prompt, rebuilt from its arc limit unless the game was stored with its prompt"""
+    if game.stored_prompt is not None:
+        return game.stored_prompt
+
+    spoiler_arc_names = arc_service.get_spoiler_arc_names(arc_service.get_arc_by_name(game.arc_limit))
+    return prompt_service.create_game_prompt(character, spoiler_arc_names)
+
+
+async def ask_question(question: str, game: GameSnapshot, session_mgr: SessionManager, game_mgr: AsyncGameManager,
+                       character_service: AsyncCharacterService, arc_service: ArcService, llm: LLMService,
+                       prompt_service: PromptService) -> str:
+    """Process a question about the character, game must be loaded with its chat history"""
     try:
         if not session_mgr.has_active_game():
             raise ValueError("No active game session")
 
-        game_id = session_mgr.get_current_game_id()
-
-        # Get target character and system prompt
-        target_character = game_mgr.get_target_character(game_id)
-        system_prompt = game_mgr.get_system_prompt(game_id)
+        character = await _get_target_character(game, character_service)
 
-        # Get relevant character context from vector database with arc restrictions
-        character_context = prompt_service.get_character_context(target_character.id, question)
+        # A cached profile makes this a join, a profile no longer cached reads the vector database (blocking)
+        system_prompt = await run_in_threadpool(_get_system_prompt, game, character, arc_service, prompt_service)
 
-        # Get conversation memory
-        memory = game_mgr.get_memory(game_id)
-        chat_history = memory.messages
+        # Get relevant character context from vector database with arc restrictions (embedding + Chroma, blocking)
+        character_context = await run_in_threadpool(prompt_service.get_character_context, game.character_id,
+                                                    question)
 
         # Build complete dynamic prompt
-        updated_prompt = prompt_service.build_dynamic_prompt(system_prompt, character_context, chat_history, question)
+        updated_prompt = prompt_service.build_dynamic_prompt(system_prompt, character_context, game.chat_history,
+                                                             question)
 
         # Use session ID for rate limiting
         session_id = id(session_mgr.request.session)  # Get unique session identifier
-        response = llm.ask_game_question(updated_prompt, user_id=str(session_id))
+        response = await run_in_threadpool(llm.ask_game_question, updated_prompt, user_id=str(session_id))
 
         print(f"User question: {question} \nLLM response: {response}")
 
         answer = response.get('answer')
 
         # Now add both question and response to memory
-        game_mgr.add_user_question(game_id, question)
-        game_mgr.add_assistant_response(game_id, answer)
-        
+        game.record_turn(question, answer)
+        await game_mgr.save_snapshot(game)
+
         return answer
 
     except Exception as e:
         raise ValueError(f"Error processing question: {str(e)}")
 
 
-def _get_game_end_data(session_mgr: SessionManager, game_mgr: GameManager) -> dict:
+def _get_game_end_data(game: GameSnapshot, character: FullCharacter) -> dict:
     """Helper function to get character and stats data when a game ends"""
-    game_id = session_mgr.get_current_game_id()
-    character = game_mgr.get_target_character(game_id)
-    questions_asked = game_mgr.get_questions_asked(game_id)
-    guesses_made = game_mgr.get_guess_count(game_id)
-    
     return {
         "character": character,
-        "questions_asked": questions_asked,
-        "guesses_made": guesses_made,
-        "game_id": game_id
+        "questions_asked": game.questions_asked,
+        "guesses_made": game.guesses_count,
     }
 
-def make_guess(character_name: str, session_mgr: SessionManager, game_mgr: GameManager) -> dict:
+async def make_guess(character_name: str, game: GameSnapshot, session_mgr: SessionManager,
+                     game_mgr: AsyncGameManager, character_service: AsyncCharacterService) -> dict:
     """Process a character guess"""
     try:
         if not session_mgr.has_active_game():
             raise ValueError("No active game session")
 
-        game_id = session_mgr.get_current_game_id()
-
-        # Get target character as Character object
-        target_character = game_mgr.get_target_character(game_id)
-        is_correct = character_name.lower() == target_character.name.lower()
+        character = await _get_target_character(game, character_service)
+        is_correct = character_name.lower() == character.name.lower()
 
         # Add guess messages to UI
-        game_mgr.add_ui_message(game_id, f"I guess it's {character_name}!", True)
+        game.add_ui_message(f"I guess it's {character_name}!", True)
 
-        # GameManager handles guess recording and counter increment
-        game_mgr.add_guess(game_id)
+        # Counts the current guess too
+        game.record_guess()
 
         if is_correct:
-            # Get data before cleaning up game
-            game_data = _get_game_end_data(session_mgr, game_mgr)
-            # Add 1 to guesses_made since we just recorded the current guess
-            game_data["guesses_made"] += 1
-            
-            game_mgr.delete_game(game_id)
+            game.end()
+            await game_mgr.save_snapshot(game)
             session_mgr.clear_current_game()
 
-            return {
-                "is_correct": True,
-                "character": game_data["character"],
-                "questions_asked": game_data["questions_asked"],
-                "guesses_made": game_data["guesses_made"]
-            }
+            return {"is_correct": True, **_get_game_end_data(game, character)}
         else:
             # Add incorrect guess response as UI message
-            game_mgr.add_ui_message(game_id, f"Sorry, that's not correct. The character is not {character_name}. Try asking more questions!", False)
+            game.add_ui_message(f"Sorry, that's not correct. The character is not {character_name}. Try asking more questions!", False)
+            await game_mgr.save_snapshot(game)
             return {
                 "is_correct": False
             }
@@ -224,24 +235,19 @@ def make_guess(character_name: str, session_mgr: SessionManager, game_mgr: GameM
     except Exception as e:
         raise ValueError(f"Error processing guess: {str(e)}")
 
-def reveal_character(session_mgr: SessionManager, game_mgr: GameManager) -> dict:
+async def reveal_character(game: GameSnapshot, session_mgr: SessionManager, game_mgr: AsyncGameManager,
+                           character_service: AsyncCharacterService) -> dict:
     """Reveal the character when user gives up"""
     try:
         if not session_mgr.has_active_game():
             raise ValueError("No active game session")
 
-        # Get data before cleaning up game
-        game_data = _get_game_end_data(session_mgr, game_mgr)
-        
-        game_mgr.delete_game(game_data["game_id"])
+        character = await _get_target_character(game, character_service)
+        game.end()
+        await game_mgr.save_snapshot(game)
         session_mgr.clear_current_game()
 
-        return {
-            "character": game_data["character"],
-            "questions_asked": game_data["questions_asked"],
-            "guesses_made": game_data["guesses_made"]
-        }
+        return _get_game_end_data(game, character)
         
     except Exception as e:
         raise ValueError(f"Error revealing character: {str(e)}")
-
@@ -0,0 +1,123 @@
+# server/services/pool_cache.py
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable
+
+from guessing_game.config.settings import POOL_CACHE_SIZE
+from guessing_game.schemas.character_schemas import BasicCharacter
+from guessing_game.services.serialization import dumps, encode_characters
+
+
+@dataclass(frozen=True)
+class PoolKey:
+    """Everything that decides which characters end up in a game's pool"""
+    arc: str
+    difficulty_level: str
+    include_unrated: bool
+    include_fillers: bool
+    include_non_tv_fillers: bool
+    catalog_version: str
+
+
+@dataclass(frozen=True)
+class CharacterPool:
+    """A resolved character pool together with its ready-to-send JSON"""
+    characters: list[BasicCharacter]  # sorted by name
+    payload: bytes = field(repr=False)
+    etag: str
+    # Compact renderings, keyed by (requested format, catalog version)
+    _compact: dict = field(default_factory=dict, repr=False, compare=False)
+
+    @classmethod
+    def build(cls, characters: list[BasicCharacter]) -> 'CharacterPool':
+        characters = sorted(characters, key=lambda char: char.name)
+        payload = encode_characters(characters)
+        # Content hash, so identical pools get the same ETag on every worker
+        etag = f'"{hashlib.sha1(payload).hexdigest()}"'
+        return cls(characters=characters, payload=payload, etag=etag)
+
+    def compact_payload(self, pool_format: str, catalog_version: str,
+                        load_catalog_ids: Callable[[], list[str]]) -> tuple[bytes, str]:
+        """
+        The pool as references into the client's cached catalog (the /api/characters/until list).
+        "ids" sends the character IDs, "bitmap" sends a base64 bitmap where bit i marks the i-th catalog entry.
+        A bitmap falls back to IDs when a pool member is missing from that catalog.
+        """
+        key = (pool_format, catalog_version)
+        cached = self._compact.get(key)
+        if cached is not None:
+            return cached
+
+        fragment = None
+        if pool_format == "bitmap":
+            pool_ids = {char.id for char in self.characters}
+            catalog_ids = load_catalog_ids()
+            bitmap = bytearray((len(catalog_ids) + 7) // 8)
+            found = 0
+            for position, char_id in enumerate(catalog_ids):
+                if char_id in pool_ids:
+                    bitmap[position >> 3] |= 1 << (position & 7)
+                    found += 1
+            if found == len(pool_ids):
+                fragment = {"poolFormat": "bitmap", "catalogVersion": catalog_version,
+                            "characterBitmap": base64.b64encode(bitmap).decode()}
+
+        if fragment is None:
+            fragment = {"poolFormat": "ids", "catalogVersion": catalog_version,
+                        "characterIds": [char.id for char in self.characters]}
+
+        payload = dumps(fragment)[1:-1]
+        compact = (payload, f'"{hashlib.sha1(payload).hexdigest()}"')
+        self._compact[key] = compact
+        return compact
+
+    def render_start_response(self, message: str, game_id: str, fragment: bytes | None = None) -> bytes:
+        """
+        GameStartResponse body with a cached pool spliced in, without re-serializing it.
+        Uses the full characterPool unless a compact fragment is given.
+        """
+        if fragment is None:
+            fragment = b'"characterPool":' + self.payload
+        head = dumps({"message": message, "gameId": game_id})
+        return head[:-1] + b',' + fragment + b'}'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Evaluate an If-None-Match header against an ETag (weak comparison, as RFC 9110 requires)"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+class PoolCache:
+    """Process-wide LRU of character pools, keyed by the pool filters and the catalog version"""
+
+    def __init__(self, max_entries: int = POOL_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[PoolKey, CharacterPool] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key: PoolKey, build: Callable[[], CharacterPool]) -> CharacterPool:
+        with self._lock:
+            pool = self._entries.get(key)
+            if pool is not None:
+                self._entries.move_to_end(key)
+                return pool
+
+        # Build outside the lock - a concurrent miss on the same key just builds the same pool twice
+        pool = build()
+
+        with self._lock:
+            self._entries[key] = pool
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return pool
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
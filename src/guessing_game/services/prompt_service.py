@@ -1,13 +1,51 @@
 # server/services/prompt_service.py
 import json
 import re
+from dataclasses import dataclass
+from functools import cache, lru_cache
+from pathlib import Path
 
 from langchain_core.messages import SystemMessage, HumanMessage
 
 from guessing_game.config import COLLECTION_NAME, get_embedding_model, get_vector_client, GAME_PROMPT_PATH
-from guessing_game.schemas.arc_schemas import Arc
+from guessing_game.config.settings import CHARACTER_PROFILE_CACHE_SIZE
 from guessing_game.schemas.character_schemas import FullCharacter
 
+SPOILER_SECTION_PATTERN = r'<spoiler_restrictions>.*?</spoiler_restrictions>\n*'
+
+
+@dataclass(frozen=True)
+class GamePromptTemplate:
+    """The game prompt template split at its placeholders, so rendering a prompt is a join"""
+    spoiler_head: str     # up to {SPOILER_ARCS}
+    spoiler_tail: str     # from {SPOILER_ARCS} up to {CHARACTER_PROFILE}
+    no_spoiler_head: str  # up to {CHARACTER_PROFILE}, with the spoiler restrictions section removed
+    tail: str             # after {CHARACTER_PROFILE}, {RELEVANT_CONTEXT} is filled in per question
+
+    @classmethod
+    def parse(cls, template: str) -> "GamePromptTemplate":
+        head, tail = template.split("{CHARACTER_PROFILE}", 1)
+        spoiler_head, spoiler_tail = head.split("{SPOILER_ARCS}", 1)
+        return cls(
+            spoiler_head=spoiler_head,
+            spoiler_tail=spoiler_tail,
+            no_spoiler_head=re.sub(SPOILER_SECTION_PATTERN, '', head, flags=re.DOTALL),
+            tail=tail,
+        )
+
+    def render(self, character_profile: str, spoiler_arc_names: str | None) -> str:
+        if spoiler_arc_names:
+            return "".join((self.spoiler_head, spoiler_arc_names, self.spoiler_tail, character_profile, self.tail))
+        # Remove the entire spoiler restrictions section if no forbidden arcs
+        return "".join((self.no_spoiler_head, character_profile, self.tail))
+
+
+@cache
+def load_game_prompt_template(path: Path) -> GamePromptTemplate:
+    """Read and split a prompt template once per process"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return GamePromptTemplate.parse(f.read())
+
 
 class PromptService:
     """Service for handling all prompt construction and template management"""
@@ -15,76 +53,78 @@ class PromptService:
     def __init__(self):
         self.template_path = GAME_PROMPT_PATH
 
-    def create_game_prompt(self, character: FullCharacter, forbidden_arcs: list[Arc]) -> str:
-        """Create the initial prompt for the LLM using the template file"""
-        # Read the prompt template
-        with open(self.template_path, 'r', encoding='utf-8') as f:
-            template = f.read()
-
-        # Handle spoiler restrictions section
-        if forbidden_arcs:
-            # Create comma-separated list of forbidden arc names
-            spoiler_arc_names = ", ".join(arc.name for arc in forbidden_arcs) + " and anything after"
-            prompt = template.replace("{SPOILER_ARCS}", spoiler_arc_names)
-        else:
-            # Remove the entire spoiler restrictions section if no forbidden arcs
-            spoiler_section_pattern = r'<spoiler_restrictions>.*?</spoiler_restrictions>\n*'
-            prompt = re.sub(spoiler_section_pattern, '', template, flags=re.DOTALL)
-
-        character_profile = self._build_character_profile(character)
-
-        # Replace character profile placeholder
-        prompt = prompt.replace("{CHARACTER_PROFILE}", character_profile)
-
-        return prompt
+    def create_game_prompt(self, character: FullCharacter, spoiler_arc_names: str | None) -> str:
+        """
+        Create the initial prompt for the LLM using the template file.
+        spoiler_arc_names is the forbidden arcs string from ArcService.get_spoiler_arc_names.
+        Cheap enough to rebuild for every question - games store the inputs, not the prompt
+        """
+        template = load_game_prompt_template(self.template_path)
+        return template.render(self._build_character_profile(character), spoiler_arc_names)
 
     def _build_character_profile(self, character: FullCharacter) -> str:
         """Build structured character profile"""
-        sections = [f"SECRET CHARACTER: {character.name}"]
+        try:
+            return self._character_profile(character.id, character.name, character.chapter, character.episode)
+        except Exception as e:
+            # Without the structured data for now, and not cached, so the next prompt asks the vector database again
+            print(f"Error getting character structured data: {e}")
+            return self._format_profile(character.name, character.chapter, character.episode, [])
+
+    @staticmethod
+    @lru_cache(maxsize=CHARACTER_PROFILE_CACHE_SIZE)
+    def _character_profile(character_id: str, name: str, chapter: int | None, episode: int | None) -> str:
+        """
+        Built once per character and process, the structured data comes from the vector database.
+        Raises when the vector database can't be read, lru_cache only keeps profiles that were built
+        """
+        return PromptService._format_profile(name, chapter, episode, PromptService._get_structured_data(character_id))
+
+    @staticmethod
+    def _format_profile(name: str, chapter: int | None, episode: int | None, structured_info: list[str]) -> str:
+        sections = [f"SECRET CHARACTER: {name}"]
 
         # Appearance info
-        if character.chapter or character.episode:
+        if chapter or episode:
             appearance_parts = []
-            if character.chapter:
-                appearance_parts.append(f"Chapter: {character.chapter}")
-            if character.episode:
-                appearance_parts.append(f"Episode: {character.episode}")
+            if chapter:
+                appearance_parts.append(f"Chapter: {chapter}")
+            if episode:
+                appearance_parts.append(f"Episode: {episode}")
             sections.append("First appearance: " + ", ".join(appearance_parts))
 
         # Structured data
-        structured_info = self._get_structured_data(character.id)
         if structured_info:
             sections.append("[STRUCTURED DATA]")
             sections.extend(structured_info)
 
         return "\n".join(sections)
 
-    def _get_structured_data(self, character_id: str) -> list[str]:
-        """Get structured data for character from vector database"""
+    @staticmethod
+    def _get_structured_data(character_id: str) -> list[str]:
+        """Get structured data for character from vector database, raises when it can't be read"""
         client = get_vector_client()
         collection = client.get_collection(COLLECTION_NAME)
 
-        try:
-            target_results_data = collection.get(
-                where={"character_id": character_id},
-                include=['metadatas']
-            )
+        target_results_data = collection.get(
+            where={"character_id": character_id},
+            include=['metadatas']
+        )
 
-            # Extract and process structured data from target character
-            if target_results_data['metadatas'] and len(target_results_data['metadatas']) > 0:
-                structured_data_json = target_results_data['metadatas'][0].get('structured_data', '{}')
-                try:
-                    structured_data = json.loads(structured_data_json) if structured_data_json else {}
-                    if structured_data:
-                        structured_info = []
-                        for key, value in structured_data.items():
-                            if value:
-                                structured_info.append(f"{key}: {value}")
-                        return structured_info
-                except json.JSONDecodeError as e:
-                    print(f"JSON decode error: {e}")
-        except Exception as e:
-            print(f"Error getting character structured data: {e}")
+        # Extract and process structured data from target character
+        if target_results_data['metadatas'] and len(target_results_data['metadatas']) > 0:
+            structured_data_json = target_results_data['metadatas'][0].get('structured_data', '{}')
+            try:
+                structured_data = json.loads(structured_data_json) if structured_data_json else {}
+                if structured_data:
+                    structured_info = []
+                    for key, value in structured_data.items():
+                        if value:
+                            structured_info.append(f"{key}: {value}")
+                    return structured_info
+            except json.JSONDecodeError as e:
+                # Stored that way, asking again gives the same answer
+                print(f"JSON decode error: {e}")
 
         return []
 
@@ -0,0 +1,32 @@
+# server/services/serialization.py
+import orjson
+
+from guessing_game.schemas.character_schemas import BasicCharacter
+
+
+def dumps(obj) -> bytes:
+    """Encode plain Python data (dicts, lists, str, int, bool, None) straight to compact JSON bytes"""
+    return orjson.dumps(obj)
+
+
+def basic_character_row(char: BasicCharacter) -> dict:
+    """
+    BasicCharacter as its camelCase wire dict, read from attributes instead of going through model_dump.
+    Must stay in sync with BasicCharacter's field aliases and order.
+    """
+    return {
+        "id": char.id,
+        "name": char.name,
+        "chapter": char.chapter,
+        "episode": char.episode,
+        "fillerStatus": char.filler_status,
+        "difficulty": char.difficulty,
+        "isIgnored": char.is_ignored,
+        "wikiLink": char.wiki_link,
+        "affiliations": char.affiliations,
+    }
+
+
+def encode_characters(characters: list[BasicCharacter]) -> bytes:
+    """JSON array of BasicCharacter wire dicts, without re-validating the models"""
+    return orjson.dumps([basic_character_row(char) for char in characters])
@@ -7,8 +7,9 @@ from guessing_game.schemas.arc_schemas import Arc
 
 
 class SessionManager:
-    def __init__(self, request: Request):
+    def __init__(self, request: Request, arc_service: ArcService):
         self.request = request
+        self.arc_service = arc_service
 
     def has_session_data(self) -> bool:
         """Check if session has been initialized with our app database"""
@@ -28,7 +29,7 @@ class SessionManager:
     # ===== GLOBAL SPOILER SETTINGS =====
     def get_global_arc_limit(self) -> Arc:
         """Get user's global spoiler arc limit"""
-        return ArcService().get_arc_by_name(self.request.session.get("global_arc_limit", "All"))
+        return self.arc_service.get_arc_by_name(self.request.session.get("global_arc_limit", "All"))
 
     def set_global_arc_limit(self, arc: str):
         """Set user's global spoiler arc limit"""
@@ -0,0 +1,43 @@
+# server/services/target_selector.py
+import random
+from array import array
+from dataclasses import dataclass
+
+from guessing_game.schemas.character_schemas import BasicCharacter
+from guessing_game.services.character_catalog import CharacterCatalog
+
+
+@dataclass(frozen=True)
+class TargetCandidates:
+    """Catalog positions a game's target can be drawn from, split for the canon/filler roll"""
+    catalog: CharacterCatalog
+    canon: array
+    filler: array
+
+    @property
+    def count(self) -> int:
+        return len(self.canon) + len(self.filler)
+
+    def characters(self) -> list[BasicCharacter]:
+        """Every candidate, canon first, in catalog order"""
+        catalog = self.catalog
+        return [catalog.character(position) for position in self.canon + self.filler]
+
+
+def choose_target(candidates: TargetCandidates, filler_percentage: int) -> BasicCharacter:
+    """
+    Roll canon vs filler first, then pick a uniformly random offset into that group's positions.
+    Falls back to the other group when the rolled one is empty
+    """
+    choose_canon = filler_percentage < random.random() * 100
+
+    if choose_canon and candidates.canon:
+        group = candidates.canon
+    elif candidates.filler:
+        group = candidates.filler
+    elif candidates.canon:
+        group = candidates.canon
+    else:
+        raise ValueError("No valid characters available for selection")
+
+    return candidates.catalog.character(group[random.randrange(len(group))])
@@ -0,0 +1,63 @@
+# tests/conftest.py
+import fakeredis
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.middleware.sessions import SessionMiddleware
+
+# The benchmarks' scratch copy of app.db (scripts/benchmarks is on the pytest pythonpath), before anything from
+# guessing_game
+import _scratch_db
+
+from guessing_game.config.database import engine, read_engine
+from guessing_game.config.migrations import run_migrations
+from guessing_game.routes.characters import router as characters_router
+from guessing_game.services.arc_service import ArcService
+from guessing_game.services.async_character_service import AsyncCharacterService
+from guessing_game.services.catalog_sync import CatalogSync
+from guessing_game.services.character_service import CharacterService, sync_excluded_characters
+from guessing_game.services.pool_cache import PoolCache
+
+
+def pytest_sessionfinish(session, exitstatus):
+    engine.dispose()
+    read_engine.dispose()
+    _scratch_db.remove()
+
+
+@pytest.fixture(scope="session")
+def arc_service() -> ArcService:
+    run_migrations()
+    sync_excluded_characters()
+    return ArcService()
+
+
+@pytest.fixture
+def redis_server() -> fakeredis.FakeServer:
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def catalog_sync(redis_server) -> CatalogSync:
+    # Same clients as the app: binary for the writers, decoding for the listener
+    return CatalogSync(fakeredis.FakeRedis(server=redis_server),
+                       fakeredis.aioredis.FakeRedis(server=redis_server, decode_responses=True))
+
+
+@pytest.fixture
+def character_service(arc_service, catalog_sync) -> CharacterService:
+    return CharacterService(arc_service, catalog_sync)
+
+
+@pytest.fixture
+def client(arc_service, character_service) -> TestClient:
+    """The character routes on the app state the lifespan would set up"""
+    app = FastAPI()
+    app.add_middleware(SessionMiddleware, secret_key="test")
+    app.include_router(characters_router)
+    app.state.arc_service = arc_service
+    app.state.repository = character_service
+    app.state.async_repository = AsyncCharacterService(character_service)
+    app.state.pool_cache = PoolCache()
+    with TestClient(app) as test_client:
+        yield test_client
@@ -0,0 +1,133 @@
+# tests/test_async_game_manager.py
+import json
+
+import fakeredis
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, message_to_dict
+
+from guessing_game.services.async_game_manager import AsyncGameManager
+from guessing_game.services.chat_history import LEGACY_CHAT_KEY_PREFIX
+from guessing_game.services.game_manager import WELCOME_MESSAGE
+
+GAME_ID = "test-game"
+GAME_SETTINGS = {"arc_selection": "All", "filler_percentage": 0, "include_non_tv_fillers": False,
+                 "difficulty_level": "medium", "include_unrated": False}
+
+
+@pytest.fixture
+def sync_redis(redis_server) -> fakeredis.FakeRedis:
+    return fakeredis.FakeRedis(server=redis_server)
+
+
+@pytest.fixture
+def game_mgr(redis_server, sync_redis) -> AsyncGameManager:
+    return AsyncGameManager(fakeredis.aioredis.FakeRedis(server=redis_server), sync_redis)
+
+
+async def test_snapshot_changes_are_written_back(game_mgr, sync_redis):
+    await game_mgr.create_game(GAME_ID, "char-1", "All", GAME_SETTINGS)
+
+    game = await game_mgr.load_snapshot(GAME_ID, with_chat=True)
+    game.record_turn("Is it a pirate?", "Yes.")
+    game.record_guess()
+    game.add_ui_message("I guess it's Luffy!", True)
+    await game_mgr.save_snapshot(game)
+
+    game = await game_mgr.load_snapshot(GAME_ID, with_chat=True)
+    assert (game.character_id, game.arc_limit, game.game_settings) == ("char-1", "All", GAME_SETTINGS)
+    assert (game.questions_asked, game.guesses_count) == (1, 1)
+    assert game.chat_history == [HumanMessage(content="Is it a pirate?"), AIMessage(content="Yes.")]
+    messages = await game_mgr.get_all_messages(GAME_ID)
+    assert [message["text"] for message in messages] == [WELCOME_MESSAGE, "Is it a pirate?", "Yes.",
+                                                          "I guess it's Luffy!"]
+    assert [message["id"] for message in messages] == ["0", "1", "2", "3"]
+    for key in (f"game:{GAME_ID}", f"messages:{GAME_ID}", f"chat:{GAME_ID}"):
+        assert sync_redis.ttl(key) > 0
+
+
+async def test_unchanged_snapshot_writes_nothing(game_mgr, sync_redis):
+    await game_mgr.create_game(GAME_ID, "char-1", "All", GAME_SETTINGS)
+    sync_redis.persist(f"game:{GAME_ID}")
+
+    await game_mgr.save_snapshot(await game_mgr.load_snapshot(GAME_ID))
+
+    assert sync_redis.ttl(f"game:{GAME_ID}") == -1
+
+
+async def test_ended_game_is_deleted(game_mgr, sync_redis):
+    await game_mgr.create_game(GAME_ID, "char-1", "All", GAME_SETTINGS)
+    sync_redis.rpush(f"{LEGACY_CHAT_KEY_PREFIX}{GAME_ID}", b"{}")
+
+    game = await game_mgr.load_snapshot(GAME_ID)
+    game.record_turn("Is it a pirate?", "Yes.")
+    game.end()
+    await game_mgr.save_snapshot(game)
+
+    assert await game_mgr.load_snapshot(GAME_ID) is None
+    assert sync_redis.keys("*") == []
+
+
+async def test_concurrent_snapshots_keep_both_changes(game_mgr):
+    await game_mgr.create_game(GAME_ID, "char-1", "All", GAME_SETTINGS)
+    first = await game_mgr.load_snapshot(GAME_ID)
+    second = await game_mgr.load_snapshot(GAME_ID)
+
+    first.record_turn("Is it a pirate?", "Yes.")
+    second.record_turn("Is it a marine?", "No.")
+    second.record_guess()
+    await game_mgr.save_snapshot(first)
+    await game_mgr.save_snapshot(second)
+
+    game = await game_mgr.load_snapshot(GAME_ID, with_chat=True)
+    assert (game.questions_asked, game.guesses_count) == (2, 1)
+    assert len(game.chat_history) == 4
+    assert len(await game_mgr.get_all_messages(GAME_ID)) == 5
+
+
+async def test_legacy_string_game_is_upgraded(game_mgr, sync_redis):
+    sync_redis.set(f"game:{GAME_ID}", json.dumps({
+        "target_character": {"id": "char-1", "name": "Monkey D. Luffy"},
+        "system_prompt": "You are thinking of Monkey D. Luffy.",
+        "game_settings": GAME_SETTINGS,
+        "questions_asked": 3,
+        "guesses_count": 1,
+        "created_at": "2025-01-01T00:00:00",
+    }), ex=600)
+
+    game = await game_mgr.load_snapshot(GAME_ID)
+
+    assert (game.character_id, game.arc_limit, game.game_settings) == ("char-1", None, GAME_SETTINGS)
+    assert game.stored_prompt == "You are thinking of Monkey D. Luffy."
+    assert (game.questions_asked, game.guesses_count) == (3, 1)
+    assert sync_redis.type(f"game:{GAME_ID}") == b"hash"
+    assert 0 < sync_redis.ttl(f"game:{GAME_ID}") <= 600
+
+
+async def test_legacy_message_array_is_upgraded(game_mgr, sync_redis):
+    await game_mgr.create_game(GAME_ID, "char-1", "All", GAME_SETTINGS)
+    sync_redis.set(f"messages:{GAME_ID}", json.dumps([
+        {"id": "0", "text": WELCOME_MESSAGE, "is_user": False, "add_to_context": False, "timestamp": 1.0},
+        {"id": "1", "text": "Is it a pirate?", "is_user": True, "add_to_context": True, "timestamp": 2.0},
+    ]), ex=600)
+
+    messages = await game_mgr.get_all_messages(GAME_ID)
+
+    assert messages[1] == {"id": "1", "text": "Is it a pirate?", "is_user": True, "add_to_context": True,
+                           "timestamp": 2.0}
+    assert sync_redis.type(f"messages:{GAME_ID}") == b"list"
+    assert 0 < sync_redis.ttl(f"messages:{GAME_ID}") <= 600
+
+
+async def test_legacy_chat_history_is_moved(game_mgr, sync_redis):
+    await game_mgr.create_game(GAME_ID, "char-1", "All", GAME_SETTINGS)
+    legacy_key = f"{LEGACY_CHAT_KEY_PREFIX}{GAME_ID}"
+    # RedisChatMessageHistory pushed to the head, newest first
+    for message in (HumanMessage(content="Is it a pirate?"), AIMessage(content="Yes.")):
+        sync_redis.lpush(legacy_key, json.dumps(message_to_dict(message)))
+    sync_redis.expire(legacy_key, 600)
+
+    game = await game_mgr.load_snapshot(GAME_ID, with_chat=True)
+
+    assert game.chat_history == [HumanMessage(content="Is it a pirate?"), AIMessage(content="Yes.")]
+    assert not sync_redis.exists(legacy_key)
+    assert 0 < sync_redis.ttl(f"chat:{GAME_ID}") <= 600
@@ -0,0 +1,88 @@
+# tests/test_bulk_updates.py
+import pytest
+
+from guessing_game.services import character_service as character_service_module
+
+
+@pytest.fixture
+def character_ids(character_service) -> list[str]:
+    return character_service.catalog.ids[:3]
+
+
+def assert_unchanged(character_service, character_ids: list[str], before: list):
+    assert [character_service.get_full_character_by_id(character_id) for character_id in character_ids] == before
+    assert character_service.catalog.version == 0
+
+
+def test_unknown_ids_reject_the_whole_request(client, character_service, character_ids):
+    before = [character_service.get_full_character_by_id(character_id) for character_id in character_ids]
+    flags = [{"characterId": character_id, "isIgnored": True} for character_id in character_ids]
+
+    response = client.post("/api/characters/bulk-ignore",
+                           json={"characters": flags + [{"characterId": "no-such-character", "isIgnored": True}]})
+
+    assert response.status_code == 400
+    assert "Unknown character ids: no-such-character" in response.json()["detail"]
+    assert_unchanged(character_service, character_ids, before)
+
+
+def test_repeated_ids_reject_the_whole_request(client, character_service, character_ids):
+    before = [character_service.get_full_character_by_id(character_id) for character_id in character_ids]
+    ratings = [{"characterId": character_id, "difficulty": "easy"} for character_id in character_ids]
+
+    response = client.post("/api/characters/bulk-rate", json={"characters": ratings + ratings[:1]})
+
+    assert response.status_code == 400
+    assert f"Repeated character ids: {character_ids[0]}" in response.json()["detail"]
+    assert_unchanged(character_service, character_ids, before)
+
+
+def test_invalid_values_reject_the_whole_request(client, character_service, character_ids):
+    before = [character_service.get_full_character_by_id(character_id) for character_id in character_ids]
+    ratings = [{"characterId": character_ids[0], "difficulty": "easy"},
+               {"characterId": character_ids[1], "difficulty": "impossible"}]
+
+    response = client.post("/api/characters/bulk-rate", json={"characters": ratings})
+
+    assert response.status_code == 400
+    assert f"Invalid values: {character_ids[1]}=impossible" in response.json()["detail"]
+    assert_unchanged(character_service, character_ids, before)
+
+
+def test_all_problems_are_reported_together(character_service, character_ids):
+    updates = [(character_ids[0], "easy"), (character_ids[0], "easy"), ("no-such-character", "easy"),
+               (character_ids[1], "impossible")]
+
+    with pytest.raises(ValueError) as error:
+        character_service.validate_bulk_updates(updates, frozenset({"easy"}))
+
+    assert str(error.value).count(";") == 2
+
+
+def test_requests_over_the_limit_are_rejected(client, character_service, character_ids, monkeypatch):
+    monkeypatch.setattr(character_service_module, "BULK_UPDATE_LIMIT", 2)
+    before = [character_service.get_full_character_by_id(character_id) for character_id in character_ids]
+    flags = [{"characterId": character_id, "isIgnored": True} for character_id in character_ids]
+
+    response = client.post("/api/characters/bulk-ignore", json={"characters": flags})
+
+    assert response.status_code == 400
+    assert "At most 2 characters" in response.json()["detail"]
+    assert_unchanged(character_service, character_ids, before)
+
+
+def test_valid_request_is_validated_as_a_whole(character_service, character_ids):
+    updates = [(character_id, True) for character_id in character_ids]
+
+    assert character_service.validate_bulk_updates(updates) == dict(updates)
+
+
+def test_single_rating_is_validated_like_a_bulk_one(client, character_service, character_ids):
+    before = [character_service.get_full_character_by_id(character_id) for character_id in character_ids]
+
+    response = client.post("/api/characters/rate-character",
+                           json={"characterId": character_ids[0], "difficulty": "impossible"})
+
+    assert response.status_code == 400
+    assert f"Invalid values: {character_ids[0]}=impossible" in response.json()["detail"]
+    assert_unchanged(character_service, character_ids, before)
@@ -0,0 +1,133 @@
+# tests/test_catalog_sync.py
+import asyncio
+import sqlite3
+
+from guessing_game.services import catalog_sync as catalog_sync_module
+from guessing_game.services.catalog_sync import CATALOG_VERSION_KEY
+from guessing_game.services.character_service import CharacterService
+from guessing_game.services.pool_cache import PoolCache
+
+
+def flip_first_ignore_flag(catalog):
+    catalog.set_ignored_flags({catalog.ids[0]: not catalog.ignored[0]})
+
+
+def test_next_version_is_patched_in_place(character_service):
+    character_service.commit_catalog_change(None)
+    catalog = character_service.catalog
+    epoch = catalog.epoch
+
+    character_service.commit_catalog_change(flip_first_ignore_flag)
+
+    assert character_service.catalog is catalog
+    assert (catalog.epoch, catalog.version) == (epoch, 2)
+
+
+def test_skipped_version_reloads(character_service, redis_server, catalog_sync):
+    character_service.commit_catalog_change(None)
+    catalog = character_service.catalog
+    # Another worker changed characters in between
+    catalog_sync.redis_client.incr(CATALOG_VERSION_KEY)
+
+    character_service.commit_catalog_change(flip_first_ignore_flag)
+
+    assert character_service.catalog is not catalog
+    assert character_service.catalog.version == 3
+
+
+def test_redis_reset_reloads_under_new_epoch(character_service, redis_server, catalog_sync):
+    for _ in range(5):
+        character_service.commit_catalog_change(None)
+    old_version = character_service.catalog_version
+    catalog = character_service.catalog
+
+    catalog_sync.redis_client.flushall()
+    character_service.commit_catalog_change(flip_first_ignore_flag)
+
+    # The counter restarted below ours, the catalog follows it instead of keeping its own version
+    assert character_service.catalog is not catalog
+    assert character_service.catalog.version == 1
+    assert character_service.catalog_version != old_version
+
+
+def test_unpublished_change_is_replaced_by_next_shared_version(character_service, redis_server, catalog_sync):
+    character_service.commit_catalog_change(None)
+    shared_epoch = character_service.catalog.epoch
+
+    redis_server.connected = False
+    character_service.commit_catalog_change(flip_first_ignore_flag)
+    local = character_service.catalog
+    assert local.epoch != shared_epoch
+
+    redis_server.connected = True
+    # Another worker claims version 2, the same number as our unpublished change
+    catalog_sync.redis_client.incr(CATALOG_VERSION_KEY)
+    character_service.sync_catalog(shared_epoch, 2)
+
+    assert character_service.catalog is not local
+    assert (character_service.catalog.epoch, character_service.catalog.version) == (shared_epoch, 2)
+
+
+async def test_catch_up_follows_lower_shared_version(character_service, catalog_sync):
+    for _ in range(3):
+        character_service.commit_catalog_change(None)
+    pool_cache = PoolCache()
+
+    await catalog_sync._catch_up(character_service, pool_cache)
+    current = character_service.catalog
+    assert current.version == 3
+
+    catalog_sync.redis_client.flushall()
+    await catalog_sync._catch_up(character_service, pool_cache)
+
+    assert character_service.catalog is not current
+    assert character_service.catalog.version == 0
+    assert character_service.catalog.epoch != current.epoch
+
+
+async def test_catch_up_keeps_current_catalog(character_service, catalog_sync):
+    character_service.commit_catalog_change(None)
+    catalog = character_service.catalog
+
+    await catalog_sync._catch_up(character_service, PoolCache())
+
+    assert character_service.catalog is catalog
+
+
+async def test_catalog_loads_at_shared_version(arc_service, character_service, catalog_sync):
+    for _ in range(2):
+        character_service.commit_catalog_change(None)
+
+    # A worker forked from a master that loaded the catalog now
+    preloaded = CharacterService(arc_service, catalog_sync)
+    catalog = preloaded.catalog
+    await catalog_sync._catch_up(preloaded, PoolCache())
+
+    assert preloaded.catalog is catalog
+    assert preloaded.catalog_version == character_service.catalog_version
+
+
+async def test_listener_survives_failed_reload(character_service, catalog_sync, monkeypatch):
+    monkeypatch.setattr(catalog_sync_module, "CATALOG_SYNC_RETRY_SECONDS", 0)
+    catalog_sync.redis_client.incr(CATALOG_VERSION_KEY)
+    sync_catalog = character_service.sync_catalog
+    attempts = []
+
+    def fail_once(epoch: str, version: int):
+        attempts.append(version)
+        if len(attempts) == 1:
+            raise sqlite3.OperationalError("database is locked")
+        sync_catalog(epoch, version)
+
+    monkeypatch.setattr(character_service, "sync_catalog", fail_once)
+    listener = asyncio.create_task(catalog_sync.listen(character_service, PoolCache()))
+    try:
+        for _ in range(200):
+            if character_service.catalog.version == 1:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        listener.cancel()
+
+    assert len(attempts) == 2
+    assert character_service.catalog.version == 1
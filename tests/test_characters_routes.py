@@ -0,0 +1,46 @@
+# tests/test_characters_routes.py
+import base64
+import json
+
+
+def test_until_pages_match_in_both_formats(client):
+    page = client.get("/api/characters/until", params={"fields": "id,name", "limit": 50}).json()
+    ndjson = client.get("/api/characters/until", params={"fields": "id,name", "limit": 50, "format": "ndjson"})
+
+    assert page["count"] == 50
+    assert [json.loads(line) for line in ndjson.text.splitlines()] == page["characters"]
+    assert ndjson.headers["X-Next-Cursor"] == page["nextCursor"]
+    assert ndjson.headers["X-Catalog-Version"] == page["catalogVersion"]
+
+
+def test_search_finds_character_by_name_prefix(client):
+    characters = client.get("/api/characters/search", params={"q": "luff"}).json()["characters"]
+
+    assert "Monkey D. Luffy" in [character["name"] for character in characters]
+
+
+def test_cursor_resumes_after_catalog_reload(client, character_service):
+    everything = client.get("/api/characters/until", params={"fields": "id"}).json()["characters"]
+    page = client.get("/api/characters/until", params={"fields": "id", "limit": 100}).json()
+    first_version = page["catalogVersion"]
+    paged = page["characters"]
+
+    # Another worker's change, the catalog is loaded again between the pages
+    character_service.sync_catalog("other-epoch", 1)
+    while page["nextCursor"] is not None:
+        page = client.get("/api/characters/until",
+                          params={"fields": "id", "limit": 100, "cursor": page["nextCursor"]}).json()
+        paged += page["characters"]
+
+    assert page["catalogVersion"] != first_version
+    assert paged == everything
+    assert [character["id"] for character in paged] == sorted(character["id"] for character in paged)
+
+
+def test_unknown_cursor_is_rejected(client):
+    cursor = base64.urlsafe_b64encode(b"no-such-character").decode()
+
+    response = client.get("/api/characters/until", params={"cursor": cursor})
+
+    assert response.status_code == 400
+    assert "no-such-character" in response.json()["detail"]
@@ -0,0 +1,65 @@
+# tests/test_migrations.py
+import pytest
+from sqlalchemy import event, text
+
+from guessing_game.config.database import engine
+from guessing_game.config.migrations import run_migrations
+from guessing_game.models.character_search import CHARACTER_SEARCH_TABLE, match_expression, search_statement
+
+
+@pytest.fixture
+def statements(arc_service) -> list[str]:
+    """SQL run on the writer engine during the test, after the session's database was migrated"""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(" ".join(statement.split()).upper())
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def writes(statements: list[str]) -> list[str]:
+    return [statement for statement in statements
+            if statement.startswith(("INSERT", "UPDATE", "DELETE", "CREATE", "ALTER", "ANALYZE"))]
+
+
+def search(name: str) -> list[str]:
+    with engine.connect() as connection:
+        return list(connection.execute(search_statement, {"match": match_expression(name)}).scalars())
+
+
+def test_current_database_is_only_read(statements):
+    run_migrations()
+
+    assert any(statement.startswith("SELECT") for statement in statements)
+    assert writes(statements) == []
+
+
+def test_renamed_character_is_reindexed(statements):
+    with engine.begin() as connection:
+        character_id, name = connection.execute(text("SELECT id, name FROM characters LIMIT 1")).first()
+        connection.execute(text("UPDATE characters SET name = 'Zzyzx Renamed' WHERE id = :id"), {"id": character_id})
+    try:
+        run_migrations()
+
+        assert search("zzyzx") == [character_id]
+        assert "ANALYZE CHARACTERS" in writes(statements)
+    finally:
+        with engine.begin() as connection:
+            connection.execute(text("UPDATE characters SET name = :name WHERE id = :id"),
+                               {"name": name, "id": character_id})
+        run_migrations()
+
+
+def test_missing_index_rows_are_rebuilt(statements):
+    with engine.begin() as connection:
+        connection.execute(text(f"DELETE FROM {CHARACTER_SEARCH_TABLE} WHERE rowid IN "
+                                f"(SELECT rowid FROM {CHARACTER_SEARCH_TABLE} LIMIT 10)"))
+
+    run_migrations()
+
+    with engine.connect() as connection:
+        indexed = connection.execute(text(f"SELECT COUNT(*) FROM {CHARACTER_SEARCH_TABLE}")).scalar()
+        assert indexed == connection.execute(text("SELECT COUNT(*) FROM characters")).scalar()
@@ -0,0 +1,46 @@
+# tests/test_prompt_service.py
+import pytest
+
+from guessing_game.schemas.character_schemas import FullCharacter
+from guessing_game.services.prompt_service import PromptService
+
+CHARACTER = FullCharacter(id="test-character", name="Test Character", chapter=1, episode=1, filler_status="Canon",
+                          difficulty="easy")
+
+
+@pytest.fixture
+def structured_data(monkeypatch) -> list:
+    """Answers of the vector database lookups, an exception is raised instead of returned"""
+    answers = []
+
+    def get_structured_data(character_id: str) -> list[str]:
+        answer = answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    PromptService._character_profile.cache_clear()
+    monkeypatch.setattr(PromptService, "_get_structured_data", staticmethod(get_structured_data))
+    yield answers
+    PromptService._character_profile.cache_clear()
+
+
+def test_profile_after_vector_database_error_is_not_cached(structured_data):
+    structured_data += [RuntimeError("vector database unavailable"), ["Crew: Test Pirates"]]
+    prompt_service = PromptService()
+
+    degraded = prompt_service._build_character_profile(CHARACTER)
+    recovered = prompt_service._build_character_profile(CHARACTER)
+
+    assert degraded.startswith("SECRET CHARACTER: Test Character") and "[STRUCTURED DATA]" not in degraded
+    assert "Crew: Test Pirates" in recovered
+
+
+def test_profile_is_built_once(structured_data):
+    structured_data += [["Crew: Test Pirates"]]
+    prompt_service = PromptService()
+
+    first = prompt_service._build_character_profile(CHARACTER)
+
+    # A second lookup would find no answer left
+    assert prompt_service._build_character_profile(CHARACTER) == first
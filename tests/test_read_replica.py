@@ -0,0 +1,44 @@
+# tests/test_read_replica.py
+from contextlib import closing
+
+import pytest
+from sqlalchemy import text
+
+from guessing_game.config import database
+from guessing_game.config.database import engine
+
+
+@pytest.fixture
+def memory_replica(arc_service, monkeypatch):
+    monkeypatch.setattr(database, "SQLITE_MEMORY_REPLICA", True)
+    yield
+    database.dispose_read_engine()
+
+
+def first_name(connection) -> str:
+    return connection.execute("SELECT name FROM characters ORDER BY id LIMIT 1").fetchone()[0]
+
+
+def test_replicas_are_copied_from_one_source(memory_replica):
+    with closing(database._connect_read()) as first:
+        source = database._replica_source
+        with closing(database._connect_read()) as second:
+            assert database._replica_source is source
+            assert first_name(first) == first_name(second)
+
+
+async def test_refresh_makes_writes_visible(memory_replica):
+    with closing(database._connect_read()) as before:
+        name = first_name(before)
+    with engine.begin() as connection:
+        connection.execute(text("UPDATE characters SET name = 'Zzyzx Renamed' "
+                                "WHERE id = (SELECT id FROM characters ORDER BY id LIMIT 1)"))
+    try:
+        await database.refresh_read_replica_async()
+
+        with closing(database._connect_read()) as after:
+            assert first_name(after) == "Zzyzx Renamed"
+    finally:
+        with engine.begin() as connection:
+            connection.execute(text("UPDATE characters SET name = :name "
+                                    "WHERE id = (SELECT id FROM characters ORDER BY id LIMIT 1)"), {"name": name})